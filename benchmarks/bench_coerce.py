@@ -0,0 +1,78 @@
+"""Micro-benchmark of coercions with and without a CoercionCache.
+
+The built in options coerce faster than a cache lookup so they do not use a
+cache. An option which parses timestamps shows the kind of coercion which
+does benefit. Run from the repository root:
+
+    python benchmarks/bench_coerce.py
+"""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from confpy.core import option  # noqa: E402
+from confpy.options import boolopt  # noqa: E402
+from confpy.options import numopt  # noqa: E402
+from confpy.options import stropt  # noqa: E402
+
+NUMBER = 200000
+
+
+class TimestampOption(option.Option):
+
+    """An option which parses ISO 8601 timestamps."""
+
+    __slots__ = ()
+
+    def coerce(self, value):
+        """Convert a string into a datetime."""
+        if isinstance(value, datetime.datetime):
+
+            return value
+
+        return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+
+
+def main():
+    """Time repeated coercions of one raw string per option type."""
+    cases = (
+        (boolopt.BoolOption(), "yes"),
+        (numopt.IntegerOption(), "10"),
+        (stropt.PatternOption(pattern=r"[a-z]+(\.[a-z]+)*$"), "abc.def"),
+        (TimestampOption(), "2020-01-02T03:04:05"),
+    )
+    for opt, value in cases:
+
+        timings = []
+        for cache in (None, option.CoercionCache()):
+
+            type(opt).coercion_cache = cache
+            seconds = min(
+                timeit.repeat(
+                    lambda: opt.cached_coerce(value),
+                    number=NUMBER,
+                    repeat=5,
+                )
+            )
+            timings.append(seconds / NUMBER * 1e6)
+
+        type(opt).coercion_cache = None
+        print(
+            "{0:<16} {1:6.2f} us uncached {2:6.2f} us cached".format(
+                type(opt).__name__, *timings
+            )
+        )
+
+
+if __name__ == "__main__":
+
+    main()
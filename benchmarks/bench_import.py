@@ -0,0 +1,137 @@
+"""Benchmark of the time taken to import the confpy API and load a file.
+
+Each measurement starts a new interpreter so that nothing is cached in
+sys.modules. The time of an interpreter which imports nothing is subtracted.
+The fastest and the median of the runs are reported. The median varies with
+the load of the machine so compare trees on the same machine in one session.
+
+Run from the repository root:
+
+    python benchmarks/bench_import.py [tree]
+
+The optional tree is the path of another checkout to measure, such as an
+older revision created with 'git worktree add', so that both are measured by
+the same script.
+"""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEAT = 30
+HEAVY = ("argparse", "configparser", "ConfigParser", "jinja2", "json")
+
+# Registers the namespace used by the configuration files.
+SCHEMA = (
+    "import confpy.api as api; "
+    "api.Configuration(bench=api.Namespace(number=api.IntegerOption())); "
+)
+FILES = {
+    "conf.ini": "[bench]\nnumber = 1\n",
+    "conf.json": '{"bench": {"number": 1}}',
+}
+
+
+def run(statement, root=ROOT):
+    """Run a statement in a new interpreter and get its output."""
+    with open(os.devnull, "w") as devnull:
+
+        return subprocess.check_output(
+            [sys.executable, "-c", statement], cwd=root, stderr=devnull
+        ).decode("utf8")
+
+
+def measure(statement, root=ROOT):
+    """Get the fastest and the median wall time of running a statement."""
+    timings = sorted(
+        timeit.repeat(
+            lambda: run(statement, root),
+            setup="pass",
+            number=1,
+            repeat=REPEAT,
+        )
+    )
+    return timings[0], timings[len(timings) // 2]
+
+
+def main():
+    """Time interpreter startup with and without using the API."""
+    root = os.path.abspath(sys.argv[1]) if len(sys.argv) > 1 else ROOT
+    directory = tempfile.mkdtemp()
+    try:
+
+        statements = [
+            "import confpy.api",
+            "import confpy.api, confpy.example",
+            "import confpy.api; confpy.api.parse_options([])",
+        ]
+        for name, content in sorted(FILES.items()):
+
+            path = os.path.join(directory, name)
+            with open(path, "w") as config_file:
+
+                config_file.write(content)
+
+            statements.append(
+                "{0}api.parse_options([{1!r}])".format(SCHEMA, str(path))
+            )
+
+        print(
+            "{0} {1}, {2}".format(
+                platform.python_implementation(),
+                platform.python_version(),
+                root,
+            )
+        )
+        baseline = measure("pass", root)
+        for statement in statements:
+
+            label = statement.replace(SCHEMA, "<schema>; ")
+            label = label.replace(directory + os.sep, "")
+            try:
+
+                timings = measure(statement, root)
+
+            except subprocess.CalledProcessError:
+
+                print("{0:<52} failed".format(label))
+                continue
+
+            fastest, median = (
+                seconds - base for seconds, base in zip(timings, baseline)
+            )
+            print(
+                "{0:<52} {1:7.2f} ms min {2:7.2f} ms median".format(
+                    label, fastest * 1e3, median * 1e3
+                )
+            )
+
+    finally:
+
+        shutil.rmtree(directory)
+
+    loaded = run(
+        "import sys, confpy.api; "
+        "print(' '.join(m for m in {0!r} if m in sys.modules))".format(HEAVY),
+        root,
+    )
+    print(
+        "Modules loaded by 'import confpy.api': {0}".format(
+            loaded.strip() or "none"
+        )
+    )
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,133 @@
+"""Benchmark comparing JsonFile with JsonStreamFile on a large file.
+
+Each generated file contains one small registered namespace and about the
+given number of megabytes of unregistered values, either in many namespaces
+or in a single namespace, which the streaming loader skips. Run from the
+repository root:
+
+    python benchmarks/bench_json.py [megabytes]
+
+The wall time is the best of several loads and the peak is the largest
+amount of memory allocated by Python while loading, measured separately
+with tracemalloc.
+"""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from confpy.core import config  # noqa: E402
+from confpy.core import namespace  # noqa: E402
+from confpy.loaders import base  # noqa: E402
+from confpy.loaders import json as json_loader  # noqa: E402
+from confpy.options import numopt  # noqa: E402
+from confpy.options import stropt  # noqa: E402
+
+REPEAT = 5
+
+
+def write_file(path, megabytes, sections):
+    """Write a JSON file of roughly the given size.
+
+    Args:
+        path (str): The path to write.
+        megabytes (int): The approximate size of the file.
+        sections (bool): Whether the unregistered values are split into many
+            namespaces or are all in a single large namespace.
+    """
+    section = dict(
+        ("option_{0}".format(idx), ["value {0}".format(idx)] * 10)
+        for idx in range(100)
+    )
+    count = megabytes * 1024 * 1024 // len(json.dumps(section))
+    if sections:
+
+        document = dict(
+            ("unused_{0}".format(idx), section) for idx in range(count)
+        )
+
+    else:
+
+        document = {
+            "unused": dict(
+                ("option_{0}".format(idx), section) for idx in range(count)
+            )
+        }
+
+    document["bench_json"] = {"number": 1, "letter": "a"}
+    with open(path, "w") as json_file:
+
+        json.dump(document, json_file)
+
+
+def load(loader, path):
+    """Load the file without strict checks of unregistered namespaces."""
+    base.PARSED_FILES.clear()
+    return loader(path=path, strict=False).config
+
+
+def peak(loader, path):
+    """Get the peak memory allocated while loading the file."""
+    tracemalloc.start()
+    try:
+
+        load(loader, path)
+        return tracemalloc.get_traced_memory()[1]
+
+    finally:
+
+        tracemalloc.stop()
+
+
+def main():
+    """Time both loaders and print the wall time and peak memory."""
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    config.Configuration(
+        bench_json=namespace.Namespace(
+            number=numopt.IntegerOption(), letter=stropt.StringOption()
+        )
+    )
+    directory = tempfile.mkdtemp()
+    try:
+
+        path = os.path.join(directory, "conf.json")
+        for name, sections in (("many", True), ("one", False)):
+
+            write_file(path, megabytes, sections)
+            print(
+                "{0} unregistered namespace(s), {1:.1f} MB".format(
+                    name, os.path.getsize(path) / 1e6
+                )
+            )
+            for loader in (json_loader.JsonFile, json_loader.JsonStreamFile):
+
+                seconds = min(
+                    timeit.repeat(
+                        lambda: load(loader, path), number=1, repeat=REPEAT
+                    )
+                )
+                print(
+                    "  {0:<16} {1:8.3f} s {2:8.1f} MB peak".format(
+                        loader.__name__, seconds, peak(loader, path) / 1e6
+                    )
+                )
+
+    finally:
+
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,61 @@
+"""Micro-benchmark comparing Namespace reads with FrozenNamespace reads.
+
+Run from the repository root:
+
+    python benchmarks/bench_namespace.py
+"""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from confpy.core import namespace  # noqa: E402
+from confpy.options import numopt  # noqa: E402
+
+OPTIONS = 100
+NUMBER = 1000000
+
+
+def build_namespace():
+    """Get a namespace with a number of set integer options."""
+    ns = namespace.Namespace(
+        **dict(
+            ("option_{0}".format(idx), numopt.IntegerOption(default=idx))
+            for idx in range(OPTIONS)
+        )
+    )
+    ns.option_50 = "50"
+    return ns
+
+
+def main():
+    """Time attribute reads through both access paths."""
+    setups = (
+        ("Namespace", "target = build_namespace()"),
+        ("FrozenNamespace", "target = build_namespace().freeze()"),
+    )
+    for name, setup in setups:
+
+        seconds = min(
+            timeit.repeat(
+                "target.option_50",
+                setup="from __main__ import build_namespace; " + setup,
+                number=NUMBER,
+                repeat=5,
+            )
+        )
+        print(
+            "{0:<16} {1:8.1f} ns/read".format(name, seconds / NUMBER * 1e9)
+        )
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,305 @@
+"""Configuration loading for asyncio applications.
+
+The functions and sources in this module return asyncio futures which may be
+awaited from a coroutine or passed to 'run_until_complete'. Paths are
+expanded, files are read and parsed, and values are applied in an executor so
+that a slow disk or network filesystem never blocks the event loop. This
+module requires Python 3.4 or newer but uses no syntax which is unavailable
+in other supported versions.
+
+Sources are pluggable. Any object with a 'load' method which accepts the
+event loop and returns an awaitable of a confpy.loaders.base.ConfigurationFile
+may be given to 'parse_options' alongside file paths. MappingSource is a base
+class for sources, such as remote services, which produce a dictionary.
+"""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+import functools
+
+from . import parser
+from . import resolver
+from .core import config as conf
+from .loaders import base
+from .loaders import mapping
+
+
+def _then(loop, future, callback):
+    """Get a future of the result of a callback applied to another future.
+
+    Args:
+        loop: The event loop which runs the futures.
+        future: The awaitable whose result is passed to the callback.
+        callback (callable): Called with the result of 'future'. If it
+            returns an asyncio.Future the result is the outcome of that
+            future instead.
+
+    Returns:
+        asyncio.Future: Resolved with the value returned by the callback or
+            the exception raised by either the future or the callback.
+    """
+    future = asyncio.ensure_future(future, loop=loop)
+    result = asyncio.Future(loop=loop)
+    # The future which is awaited at the moment so it can be cancelled.
+    waiting = [future]
+
+    def _settle(completed):
+        if result.cancelled():
+
+            return
+
+        if completed.cancelled():
+
+            result.cancel()
+
+        elif completed.exception() is not None:
+
+            result.set_exception(completed.exception())
+
+        else:
+
+            result.set_result(completed.result())
+
+    def _done(completed):
+        if result.cancelled():
+
+            return
+
+        if completed.cancelled() or completed.exception() is not None:
+
+            _settle(completed)
+            return
+
+        try:
+
+            value = callback(completed.result())
+
+        except Exception as error:  # pylint: disable=broad-except
+
+            result.set_exception(error)
+            return
+
+        if isinstance(value, asyncio.Future):
+
+            waiting[0] = value
+            value.add_done_callback(_settle)
+            return
+
+        result.set_result(value)
+
+    def _cancel(outer):
+        if outer.cancelled():
+
+            waiting[0].cancel()
+
+    future.add_done_callback(_done)
+    result.add_done_callback(_cancel)
+    return result
+
+
+def _read(path, strict):
+    """Get the loader of a file with its content read and parsed."""
+    loader = parser.configfile_from_path(path, strict)
+    parsed = base.PARSED_FILES.parse(loader)
+    loader._parsed = parsed  # pylint: disable=protected-access
+    return loader
+
+
+def _paths(source):
+    """Get the list of file paths a path, directory, or pattern expands to."""
+    return list(parser.expand_paths((source,)))
+
+
+class FileSource(object):
+
+    """An asynchronous source which reads a file in an executor."""
+
+    def __init__(self, path, strict=True, executor=None):
+        """Initialize the source with a file path.
+
+        Args:
+            path (str): The file path which identifies the configuration file.
+            strict (bool): Whether or not to parse the file in strict mode.
+            executor (concurrent.futures.Executor): The executor used to read
+                and parse the file. The default executor of the loop is used
+                if not given.
+        """
+        self._path = path
+        self._strict = strict
+        self._executor = executor
+
+    @property
+    def path(self):
+        """Get the file path given at initialization."""
+        return self._path
+
+    def load(self, loop):
+        """Read and parse the file without blocking the loop.
+
+        Args:
+            loop: The event loop which runs the read.
+
+        Returns:
+            asyncio.Future: Resolved with a ConfigurationFile whose content is
+                parsed and cached. The future raises UnrecognizedFileExtension
+                if there is no loader for the path.
+
+        The loader is chosen, which may read the start of the file, and the
+        file is read and parsed in the executor.
+        """
+        return loop.run_in_executor(
+            self._executor, _read, self._path, self._strict
+        )
+
+
+class MappingSource(object):
+
+    """An asynchronous source of namespace dictionaries.
+
+    Subclasses override 'fetch' to produce the values. The default returns the
+    values given at initialization.
+    """
+
+    def __init__(self, values=None, name="<mapping>", strict=True):
+        """Initialize the source.
+
+        Args:
+            values (dict): A mapping of namespace name to a mapping of option
+                name to raw value.
+            name (str): A name which identifies the source.
+            strict (bool): Whether or not unregistered values raise exceptions.
+        """
+        self._values = values or {}
+        self._name = name
+        self._strict = strict
+
+    def fetch(self, loop):
+        """Get the values of the source.
+
+        Args:
+            loop: The event loop which runs the fetch.
+
+        Returns:
+            awaitable: Resolved with a mapping of namespace name to a mapping
+                of option name to raw value.
+        """
+        future = asyncio.Future(loop=loop)
+        future.set_result(self._values)
+        return future
+
+    def load(self, loop):
+        """Fetch the values and wrap them in a loader.
+
+        Args:
+            loop: The event loop which runs the fetch.
+
+        Returns:
+            asyncio.Future: Resolved with a loaders.mapping.MappingFile.
+        """
+        return _then(
+            loop,
+            self.fetch(loop),
+            functools.partial(
+                mapping.MappingFile, path=self._name, strict=self._strict
+            ),
+        )
+
+
+def load(sources, strict=True, executor=None, loop=None):
+    """Load many sources at the same time.
+
+    Args:
+        sources (iter): File paths, directories, glob patterns, and objects
+            with a 'load' method such as FileSource.
+        strict (bool): Whether or not to parse files in strict mode.
+        executor (concurrent.futures.Executor): The executor used to read and
+            parse files. The default executor of the loop is used if not given.
+        loop: The event loop. The current event loop is used if not given.
+
+    Returns:
+        asyncio.Future: Resolved with a list of ConfigurationFile objects in
+            the order of the sources.
+
+    Directories and glob patterns are expanded in the executor and the files
+    they contain are then read at the same time.
+    """
+    loop = loop or asyncio.get_event_loop()
+
+    def _load_paths(paths):
+        if not paths:
+
+            return []
+
+        return asyncio.gather(
+            *[FileSource(path, strict, executor).load(loop) for path in paths]
+        )
+
+    pending = []
+    for source in sources:
+
+        if hasattr(source, "load"):
+
+            pending.append(_then(loop, source.load(loop), lambda one: [one]))
+            continue
+
+        pending.append(
+            _then(
+                loop,
+                loop.run_in_executor(executor, _paths, source),
+                _load_paths,
+            )
+        )
+
+    result = asyncio.Future(loop=loop)
+    if not pending:
+
+        result.set_result([])
+        return result
+
+    return _then(
+        loop,
+        asyncio.gather(*pending),
+        lambda groups: [loader for group in groups for loader in group],
+    )
+
+
+def parse_options(
+    sources, env_prefix="CONFPY", strict=True, executor=None, loop=None
+):
+    """Parse configuration options without blocking the event loop.
+
+    Args:
+        sources (iter): File paths, directories, glob patterns, and objects
+            with a 'load' method. These are read at the same time and applied
+            in order with values in later sources overwriting values in
+            earlier sources.
+        env_prefix (str): The static prefix prepended to all options when set
+            as environment variables. The default is CONFPY.
+        strict (bool): Whether or not to parse files in strict mode.
+        executor (concurrent.futures.Executor): The executor used to read and
+            parse files. The default executor of the loop is used if not given.
+        loop: The event loop. The current event loop is used if not given.
+
+    Returns:
+        asyncio.Future: Resolved with the loaded configuration object.
+
+    The future raises the same exceptions as parser.parse_options. Values
+    are applied, and Python files executed, in the executor. The loop only
+    schedules the work.
+    """
+    loop = loop or asyncio.get_event_loop()
+
+    def _resolve(loaders):
+        return resolver.Resolver(conf.Configuration(), env_prefix).resolve(
+            loaders
+        )
+
+    return _then(
+        loop,
+        load(sources, strict=strict, executor=executor, loop=loop),
+        lambda loaders: loop.run_in_executor(executor, _resolve, loaders),
+    )
@@ -0,0 +1,260 @@
+"""On-disk snapshots of values loaded from configuration files."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+
+from .core import compat
+from .core import namespace as ns
+from .loaders import base
+
+
+MAGIC = b"CONFPYSNAP"
+FORMAT_VERSION = 1
+
+
+def schema_key(config):
+    """Get a digest of the namespaces, options, and option types.
+
+    Args:
+        config (confpy.core.config.Configuration): The configuration object.
+
+    Returns:
+        str: A hex digest which changes whenever the schema changes. See
+            Configuration.fingerprint.
+    """
+    return config.fingerprint()
+
+
+class SnapshotCache(object):
+
+    """A directory of snapshots of the values loaded from files.
+
+    A snapshot records the option values set by loading a list of files
+    along with the fingerprint of every file and the schema key computed
+    before the files were loaded. When the files, the schema, and the
+    interpreter are unchanged the snapshot is applied instead of reading,
+    parsing, compiling, and executing the files. Values which were set by
+    other means, such as environment variables, are not recorded.
+
+    Snapshots are only an optimization. A snapshot which cannot be read,
+    decoded, or applied and a directory which cannot be written are ignored.
+
+    Snapshots are encoded with 'marshal' so the values of any option which
+    produces a non-builtin type cannot be stored. Python files are not
+    executed when a snapshot is applied so they must not rely on side-effects
+    other than setting option values.
+    """
+
+    def __init__(self, directory):
+        """Initialize the cache with a directory.
+
+        Args:
+            directory (str): The directory which contains snapshot files. It
+                is created if it does not exist.
+        """
+        self._directory = directory
+
+    @property
+    def directory(self):
+        """Get the directory which contains snapshot files."""
+        return self._directory
+
+    def path(self, paths, strict=True):
+        """Get the snapshot file path for a set of configuration files.
+
+        Args:
+            paths (iter of str): The configuration file paths in order.
+            strict (bool): Whether or not the files are parsed in strict mode.
+
+        Returns:
+            str: The path of the snapshot file.
+        """
+        key = "\n".join(os.path.abspath(path) for path in paths)
+        key = "{0}\n{1}".format(key, bool(strict)).encode("utf8")
+        return os.path.join(
+            self._directory,
+            "{0}.snapshot".format(hashlib.sha1(key).hexdigest()),
+        )
+
+    @staticmethod
+    def _header():
+        """Get the values which must match for a snapshot to be readable."""
+        return (FORMAT_VERSION, tuple(sys.version_info[:2]), marshal.version)
+
+    @staticmethod
+    def _fingerprints(paths):
+        """Get the absolute path and fingerprint of each file."""
+        return tuple(
+            (os.path.abspath(path), base.fingerprint(path)) for path in paths
+        )
+
+    def restore(self, config, paths, strict=True):
+        """Apply a snapshot to a configuration if it is still valid.
+
+        Args:
+            config (confpy.core.config.Configuration): The configuration object
+                to apply values to.
+            paths (iter of str): The configuration file paths in order.
+            strict (bool): Whether or not the files are parsed in strict mode.
+
+        Returns:
+            bool: True if a valid snapshot was applied. False otherwise.
+
+        The snapshot is compared with the schema key of the configuration
+        before any files are loaded. Options generated by an AutoNamespace
+        while loading are generated again when the snapshot is applied. A
+        snapshot which contains any other option that is not registered, such
+        as one registered by a Python file, is not applied.
+        """
+        paths = tuple(paths)
+        try:
+
+            with open(self.path(paths, strict), "rb") as snapshot_file:
+
+                content = snapshot_file.read()
+
+        except (IOError, OSError):
+
+            return False
+
+        if not content.startswith(MAGIC):
+
+            return False
+
+        try:
+
+            header, fingerprints, schema, values = marshal.loads(
+                content[len(MAGIC):]
+            )
+
+            sections = [
+                (config.get(section_name), list(compat.iteritems(options)))
+                for section_name, options in compat.iteritems(values)
+            ]
+
+        except (EOFError, ValueError, TypeError, AttributeError):
+
+            return False
+
+        if (
+            header != self._header()
+            or fingerprints != self._fingerprints(paths)
+            or schema != schema_key(config)
+            or any(section is None for section, _ in sections)
+        ):
+
+            return False
+
+        # Options registered by Python files while loading do not exist until
+        # the files are executed again.
+        for section, options in sections:
+
+            if isinstance(section, ns.AutoNamespace):
+
+                continue
+
+            for option_name, _ in options:
+
+                # pylint: disable=protected-access
+                if option_name not in section._options:
+
+                    return False
+
+        try:
+
+            for section, options in sections:
+
+                for option_name, value in options:
+
+                    section.set(option_name, value)
+
+        except (TypeError, ValueError):
+
+            return False
+
+        return True
+
+    def store(self, values, paths, strict=True, schema=None):
+        """Write a snapshot of the values loaded from files.
+
+        Args:
+            values (dict): A mapping of (namespace, option) to the value set
+                by the files such as the one returned by Resolver.loaded.
+            paths (iter of str): The configuration file paths in order.
+            strict (bool): Whether or not the files are parsed in strict mode.
+            schema (str): The schema key of the configuration computed before
+                the files were loaded. See schema_key.
+
+        Returns:
+            bool: True if the snapshot was written. False if any file is
+                missing, a value cannot be encoded, or the snapshot cannot be
+                written.
+        """
+        paths = tuple(paths)
+        fingerprints = self._fingerprints(paths)
+        if any(signature is None for _, signature in fingerprints):
+
+            return False
+
+        sections = {}
+        for (section_name, option_name), value in compat.iteritems(values):
+
+            if value is not None:
+
+                sections.setdefault(section_name, {})[option_name] = value
+
+        try:
+
+            content = MAGIC + marshal.dumps(
+                (self._header(), fingerprints, schema, sections)
+            )
+
+        except ValueError:
+
+            return False
+
+        try:
+
+            if not os.path.isdir(self._directory):
+
+                os.makedirs(self._directory)
+
+            handle, temp_path = tempfile.mkstemp(dir=self._directory)
+
+        except (IOError, OSError):
+
+            return False
+
+        # Write to a temporary file and rename it into place so that readers
+        # never observe a partially written snapshot.
+        try:
+
+            with os.fdopen(handle, "wb") as snapshot_file:
+
+                snapshot_file.write(content)
+
+            getattr(os, "replace", os.rename)(
+                temp_path, self.path(paths, strict)
+            )
+
+        except (IOError, OSError):
+
+            try:
+
+                os.remove(temp_path)
+
+            except OSError:
+
+                pass
+
+            return False
+
+        return True
@@ -9,6 +9,7 @@ import argparse
 import sys
 
 from .core import config
+from .loaders import binary
 from .loaders import pyfile
 from . import example
 
@@ -50,3 +51,30 @@ def generate_example():
     cfg = config.Configuration()
 
     print(example.generate_example(cfg, ext=args.format))
+
+
+def convert():
+    """Convert configuration files to the binary format.
+
+    Each file is read with the loader for its extension and written next to
+    it with the '.cfgb' extension unless an output path is given. The path of
+    each written file is printed.
+    """
+    cmd_args = sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Confpy binary converter.")
+    parser.add_argument(
+        "source", nargs="+", help="An INI or JSON file to convert."
+    )
+    parser.add_argument(
+        "--output",
+        help="The path to write. Only valid with a single source file.",
+    )
+
+    args = parser.parse_args(cmd_args)
+    if args.output and len(args.source) > 1:
+
+        parser.error("--output requires a single source file.")
+
+    for source in args.source:
+
+        print(binary.convert(source, args.output))
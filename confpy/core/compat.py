@@ -16,6 +16,7 @@ except ImportError:
     import builtins
 
 import itertools
+import sys
 
 
 if hasattr(builtins, "xrange"):
@@ -68,23 +69,26 @@ def iteritems(dictionary):
     return dictionary.items()
 
 
-try:
+def __getattr__(name):
+    """Import the ConfigParser shim from core.iniparser when first used.
 
-    from ConfigParser import SafeConfigParser as _ConfigParser
+    The shim is only needed to parse INI files so it is not imported along
+    with this module. Module level __getattr__ requires Python 3.7. Older
+    versions import the shim along with this module.
+    """
+    if name == "ConfigParser":
 
-except ImportError:
+        from . import iniparser
+
+        return iniparser.ConfigParser
+
+    raise AttributeError(
+        "module {0!r} has no attribute {1!r}".format(__name__, name)
+    )
 
-    from configparser import ConfigParser as _ConfigParser
 
+if sys.version_info < (3, 7):
 
-class ConfigParser(_ConfigParser, object):
-    # pylint:disable=too-many-ancestors
-    # pylint:disable=too-many-public-methods
-    """Compatibility shim for the deprecated readfp handling."""
+    from . import iniparser
 
-    def read_file(self, file_):
-        """Add a check for read_file and use it if it exists."""
-        parent = super(ConfigParser, self)
-        if hasattr(parent, "read_file"):
-            return parent.read_file(file_)
-        return super(ConfigParser, self).readfp(file_)
+    ConfigParser = iniparser.ConfigParser
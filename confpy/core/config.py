@@ -5,6 +5,9 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import itertools
+
+from .. import exc
 from . import compat
 from . import namespace as ns
 
@@ -18,6 +21,10 @@ class Configuration(object):
     this behaviour. However, if a subclass wishes to maintain a dictionary
     separate from this parent it should overwrite the '_NAMESPACES' attribute
     with a new class dictionary.
+
+    The schema and value versions are the largest generation of any
+    registered namespace. Registering a namespace marks a schema change on it
+    so both versions only ever increase.
     """
 
     _NAMESPACES = {}
@@ -70,6 +77,94 @@ class Configuration(object):
             raise TypeError("Namespaces must be of type Namespace.")
 
         self._NAMESPACES[name] = namespace
+        namespace._schema_changed()  # pylint: disable=protected-access
+
+    @property
+    def schema_version(self):
+        """Get the generation of the last change to the schema."""
+        return max(
+            itertools.chain(
+                (0,),
+                (
+                    namespace.schema_version
+                    for namespace in self._NAMESPACES.values()
+                ),
+            )
+        )
+
+    @property
+    def value_version(self):
+        """Get the generation of the last change to an option value."""
+        return max(
+            itertools.chain(
+                (0,),
+                (
+                    namespace.value_version
+                    for namespace in self._NAMESPACES.values()
+                ),
+            )
+        )
+
+    def fingerprint(self):
+        """Get a stable digest of the namespace, option, and type names.
+
+        Returns:
+            str: A hex digest which is the same in every process for the same
+                schema and changes whenever the schema changes.
+        """
+        import hashlib
+
+        digest = hashlib.sha1()
+        for name, namespace in sorted(
+            compat.iteritems(self._NAMESPACES), key=lambda item: item[0]
+        ):
+
+            digest.update(
+                "{0}:{1}\n".format(name, namespace.fingerprint()).encode(
+                    "utf8"
+                )
+            )
+
+        return digest.hexdigest()
+
+    def validate_all(self):
+        """Coerce every deferred value and check every required option.
+
+        Returns:
+            Configuration: This configuration object.
+
+        Raises:
+            MissingRequiredOption: If a required option is not set.
+            TypeError: If a deferred value is not a string or appropriate
+                native type.
+            ValueError: If a deferred value cannot be coerced.
+
+        Values loaded lazily are otherwise only coerced when first read. Call
+        this after loading to fail fast on any invalid value, for example in
+        a test suite or a deployment check.
+        """
+        for section_name, section in self:
+
+            for option_name, option in section:
+
+                option.materialize()
+                if option.required and option.value is None:
+
+                    raise exc.MissingRequiredOption(
+                        "Option {0} in namespace {1} is required.".format(
+                            option_name, section_name
+                        )
+                    )
+
+        return self
+
+    def freeze(self):
+        """Get an immutable copy of the currently resolved option values.
+
+        Returns:
+            FrozenConfiguration: The resolved values of every namespace.
+        """
+        return FrozenConfiguration(self)
 
     def namespaces(self):
         """Get an iterable of two-tuples containing name and namespace.
@@ -96,3 +191,124 @@ class Configuration(object):
             raise AttributeError("Namespace {0} does not exist.".format(name))
 
         return attr
+
+
+class FrozenConfiguration(object):
+
+    """An immutable copy of the resolved values in a Configuration.
+
+    Each namespace is frozen into a namespace.FrozenNamespace and stored as a
+    regular instance attribute so that 'frozen.section.option' costs two
+    attribute lookups.
+
+    Frozen configurations never change after creation so they can be shared
+    between threads without locking. Use 'evolve' to create a new version
+    which shares every unchanged namespace with this one.
+    """
+
+    def __init__(self, config):
+        """Freeze every namespace registered with a configuration.
+
+        Args:
+            config (Configuration): The configuration to copy values from.
+        """
+        for name, namespace in config.namespaces():
+
+            self.__dict__[name] = namespace.freeze()
+
+        super(FrozenConfiguration, self).__init__()
+
+    @classmethod
+    def from_namespaces(cls, namespaces):
+        """Create a frozen configuration from frozen namespaces.
+
+        Args:
+            namespaces (dict): A mapping of name to FrozenNamespace.
+
+        Returns:
+            FrozenConfiguration: The frozen configuration.
+        """
+        frozen = cls.__new__(cls)
+        frozen.__dict__.update(namespaces)
+        return frozen
+
+    def get(self, name, default=None):
+        """Fetch a frozen namespace.
+
+        Args:
+            name (str): The name of the section/namespace.
+            default: The value to return if the name is missing.
+
+        Returns:
+            namespace.FrozenNamespace: The frozen namespace.
+        """
+        return self.__dict__.get(name, default)
+
+    def namespaces(self):
+        """Get an iterable of two-tuples containing name and namespace."""
+        return iter(compat.iteritems(self.__dict__))
+
+    def evolve(self, changes):
+        """Get a copy of the configuration with some values replaced.
+
+        Args:
+            changes (dict): A mapping of namespace name to a mapping of option
+                name to the new value.
+
+        Returns:
+            FrozenConfiguration: A new frozen configuration. Only namespaces
+                with changed values are copied. All others are shared with
+                this configuration.
+
+        Raises:
+            NamespaceNotRegistered: If a namespace is not in the configuration.
+        """
+        namespaces = dict(self.__dict__)
+        for name, values in compat.iteritems(changes):
+
+            if name not in namespaces:
+
+                raise exc.NamespaceNotRegistered(
+                    "The namespace {0} is not registered.".format(name)
+                )
+
+            namespaces[name] = namespaces[name].evolve(values)
+
+        return type(self).from_namespaces(namespaces)
+
+    def __iter__(self):
+        """Proxy iter attempts to the 'namespaces' method."""
+        return self.namespaces()
+
+    def __eq__(self, other):
+        """Compare the namespaces of two frozen configurations."""
+        if not isinstance(other, FrozenConfiguration):
+
+            return NotImplemented
+
+        return self.__dict__ == other.__dict__
+
+    def __ne__(self, other):
+        """Invert the result of '__eq__'."""
+        result = self.__eq__(other)
+        if result is NotImplemented:
+
+            return result
+
+        return not result
+
+    def __hash__(self):
+        """Hash the namespaces of the configuration."""
+        return hash(frozenset(compat.iteritems(self.__dict__)))
+
+    def __setattr__(self, name, value):
+        """Reject all attribute sets."""
+        raise AttributeError(
+            "Cannot set {0} on a frozen configuration.".format(name)
+        )
+
+    def __delattr__(self, name):
+        """Reject all attribute deletes."""
+        raise AttributeError(
+            "Cannot delete {0} from a frozen configuration.".format(name)
+        )
@@ -0,0 +1,20 @@
+"""A process wide counter for versioning schema and value changes."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import itertools
+
+
+_COUNTER = itertools.count(1)
+
+
+def next_generation():
+    """Get a generation number which is larger than every previous one.
+
+    A single counter is shared by every Namespace so the largest generation of
+    a group of namespaces changes whenever any one of them changes.
+    """
+    return next(_COUNTER)
@@ -0,0 +1,27 @@
+"""ConfigParser compatibility shim used to parse INI files."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+try:
+
+    from ConfigParser import SafeConfigParser as _ConfigParser
+
+except ImportError:
+
+    from configparser import ConfigParser as _ConfigParser
+
+
+class ConfigParser(_ConfigParser, object):
+    # pylint:disable=too-many-ancestors
+    # pylint:disable=too-many-public-methods
+    """Compatibility shim for the deprecated readfp handling."""
+
+    def read_file(self, file_):
+        """Add a check for read_file and use it if it exists."""
+        parent = super(ConfigParser, self)
+        if hasattr(parent, "read_file"):
+            return parent.read_file(file_)
+        return super(ConfigParser, self).readfp(file_)
@@ -6,6 +6,7 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 from . import compat
+from . import generation
 
 # Renaming option to opt to allow option as a variable name.
 from . import option as opt
@@ -13,7 +14,13 @@ from . import option as opt
 
 class Namespace(object):
 
-    """A collection of configuration options."""
+    """A collection of configuration options.
+
+    Every namespace records the generation of its last schema change, such as
+    registering an option, and of its last value change made through 'set' or
+    attribute assignment. Generations come from a process wide counter so
+    caches can key on them to detect changes without walking the options.
+    """
 
     def __init__(self, description=None, **options):
         """Initialize the Namespace with options
@@ -28,6 +35,9 @@ class Namespace(object):
             TypeError: If an entry is not an Option object.
         """
         self.__doc__ = description
+        self._schema_version = generation.next_generation()
+        self._value_version = self._schema_version
+        self._fingerprint = None
         self._options = {}
         for name, option in compat.iteritems(options):
 
@@ -40,6 +50,54 @@ class Namespace(object):
         """Get the description of what the namespace contains."""
         return self.__doc__
 
+    @property
+    def schema_version(self):
+        """Get the generation of the last change to the options."""
+        return self._schema_version
+
+    @property
+    def value_version(self):
+        """Get the generation of the last change to an option value.
+
+        Values written to an Option object directly are not tracked.
+        """
+        return self._value_version
+
+    def _schema_changed(self):
+        """Record a change to the options."""
+        self.__dict__["_schema_version"] = generation.next_generation()
+
+    def fingerprint(self):
+        """Get a stable digest of the option names and types.
+
+        Returns:
+            str: A hex digest which is the same in every process for the same
+                options. It is cached until the schema version changes.
+        """
+        cached = self._fingerprint
+        if cached is not None and cached[0] == self._schema_version:
+
+            return cached[1]
+
+        import hashlib
+
+        digest = hashlib.sha1()
+        for name, option in sorted(
+            compat.iteritems(self._options), key=lambda item: item[0]
+        ):
+
+            digest.update(
+                "{0}:{1}.{2}\n".format(
+                    name, type(option).__module__, type(option).__name__
+                ).encode("utf8")
+            )
+
+        self.__dict__["_fingerprint"] = (
+            self._schema_version,
+            digest.hexdigest(),
+        )
+        return self._fingerprint[1]
+
     def get(self, name, default=None):
         """Fetch an option from the dictionary.
 
@@ -77,8 +135,42 @@ class Namespace(object):
 
             raise AttributeError("Option {0} does not exist.".format(name))
 
+        self.__dict__["_value_version"] = generation.next_generation()
         return self._options[name].__set__(self, value)
 
+    def defer(self, name, value):
+        """Set a raw option value which is coerced when first read.
+
+        Args:
+            name (str): The name of the option.
+            value: The raw value to set the option to.
+
+        Raises:
+            AttributeError: If the name is not registered.
+        """
+        if name not in self._options:
+
+            raise AttributeError("Option {0} does not exist.".format(name))
+
+        self.__dict__["_value_version"] = generation.next_generation()
+        self._options[name].defer(value)
+
+    def reset(self, name):
+        """Return an option to the state it had before any value was set.
+
+        Args:
+            name (str): The name of the option.
+
+        Raises:
+            AttributeError: If the name is not registered.
+        """
+        if name not in self._options:
+
+            raise AttributeError("Option {0} does not exist.".format(name))
+
+        self.__dict__["_value_version"] = generation.next_generation()
+        self._options[name].reset()
+
     def register(self, name, option):
         """Register a new option with the namespace.
 
@@ -99,6 +191,15 @@ class Namespace(object):
             raise TypeError("Options must be of type Option.")
 
         self._options[name] = option
+        self._schema_changed()
+
+    def freeze(self):
+        """Get an immutable copy of the currently resolved option values.
+
+        Returns:
+            FrozenNamespace: The resolved values stored as plain attributes.
+        """
+        return FrozenNamespace(self)
 
     def options(self):
         """Get an iterable of two-tuples containing name and option.
@@ -125,14 +226,11 @@ class Namespace(object):
 
             return self.register(name, value)
 
-        if not hasattr(self, name):
-
-            return object.__setattr__(self, name, value)
-
         # The options dictionary may not be set yet if this is getting called
-        # from the init method. Check for the attribute before accessing it to
-        # avoid infinite recursion.
-        if hasattr(self, "_options") and name in self._options:
+        # from the init method. Look it up in the instance dictionary rather
+        # than with 'hasattr' which would recurse before it is set and would
+        # read, and coerce, any deferred value after.
+        if "_options" in self.__dict__ and name in self._options:
 
             return self.set(name, value)
 
@@ -191,8 +289,25 @@ class AutoNamespace(Namespace):
 
             self.register(name, self._generator())
 
+        self.__dict__["_value_version"] = generation.next_generation()
         return self._options[name].__set__(self, value)
 
+    def defer(self, name, value):
+        """Set a raw option value which is coerced when first read.
+
+        Args:
+            name (str): The name of the option.
+            value: The raw value to set the option to.
+
+        If the name is not registered a new option will be created using the
+        option generator.
+        """
+        if name not in self._options:
+
+            self.register(name, self._generator())
+
+        super(AutoNamespace, self).defer(name, value)
+
     def __setattr__(self, name, value):
         """Proxy attribute sets to the 'register' method if needed.
 
@@ -205,14 +320,11 @@ class AutoNamespace(Namespace):
 
             return self.register(name, value)
 
-        if not hasattr(self, name):
-
-            return object.__setattr__(self, name, value)
-
-        # The options dictionary may not be set yet if this is getting called
-        # from the init method. Check for the attribute before accessing it to
-        # avoid infinite recursion.
-        if hasattr(self, "_options") and hasattr(self, "_generator"):
+        # Once initialized every name is an option which 'set' generates if
+        # needed. Look up the attributes in the instance dictionary rather
+        # than with 'hasattr' which would generate an option, or read and
+        # coerce a deferred value.
+        if "_options" in self.__dict__ and "_generator" in self.__dict__:
 
             return self.set(name, value)
 
@@ -234,5 +346,157 @@ class AutoNamespace(Namespace):
         if name not in self._options:
 
             self._options[name] = self._generator()
+            self._schema_changed()
 
         return self.get(name)
+
+
+class FrozenNamespace(object):
+
+    """An immutable copy of the resolved option values in a Namespace.
+
+    Values are resolved once and stored as regular instance attributes. Reads
+    are a single attribute lookup rather than a trip through '__getattr__',
+    'get', and the option descriptor. Changes made to the source Namespace
+    after freezing are not reflected.
+
+    Options named like an attribute of the class, such as 'get' or 'options',
+    are not stored as attributes so they do not shadow the methods. Read them
+    with 'get' the same as with a Namespace.
+
+    Frozen namespaces compare equal when they hold the same values and are
+    hashable as long as every value is hashable.
+    """
+
+    def __init__(self, namespace):
+        """Resolve and store the values of a namespace.
+
+        Args:
+            namespace (Namespace): The namespace to copy values from.
+
+        Raises:
+            AttributeError: If a required option has no value.
+        """
+        self._store(
+            dict(
+                (name, option.__get__(namespace))
+                for name, option in namespace.options()
+            ),
+            namespace.description,
+        )
+        super(FrozenNamespace, self).__init__()
+
+    def _store(self, values, description):
+        """Set the values and description of a new frozen namespace."""
+        state = self.__dict__
+        cls = type(self)
+        for name, value in compat.iteritems(values):
+
+            if name != "_values" and not hasattr(cls, name):
+
+                state[name] = value
+
+        state["_values"] = values
+        state["__doc__"] = description
+
+    @classmethod
+    def from_values(cls, values, description=None):
+        """Create a frozen namespace from values which are already resolved.
+
+        Args:
+            values (dict): A mapping of option name to value.
+            description (str, optional): A human readable description of what
+                the namespace contains.
+
+        Returns:
+            FrozenNamespace: The frozen namespace.
+        """
+        frozen = cls.__new__(cls)
+        frozen._store(dict(values), description)
+        return frozen
+
+    @property
+    def description(self):
+        """Get the description of what the namespace contains."""
+        return self.__doc__
+
+    def get(self, name, default=None):
+        """Fetch an option value.
+
+        Args:
+            name (str): The name of the option.
+            default: The value to return if the name is missing.
+
+        Returns:
+            any: The value stored for the option.
+        """
+        return self._values.get(name, default)
+
+    def options(self):
+        """Get an iterable of two-tuples containing name and value."""
+        return compat.iteritems(self._values)
+
+    def evolve(self, values):
+        """Get a copy of the namespace with some values replaced.
+
+        Args:
+            values (dict): A mapping of option name to the new value.
+
+        Returns:
+            FrozenNamespace: A new frozen namespace. This namespace is
+                returned unchanged if no value differs.
+        """
+        current = self._values
+        if all(
+            name in current and current[name] == value
+            for name, value in compat.iteritems(values)
+        ):
+
+            return self
+
+        merged = dict(current)
+        merged.update(values)
+        frozen = type(self).__new__(type(self))
+        frozen._store(merged, self.__doc__)
+        return frozen
+
+    def __iter__(self):
+        """Proxy iter attempts to the 'options' method."""
+        return iter(self.options())
+
+    def __eq__(self, other):
+        """Compare the description and values of two frozen namespaces."""
+        if not isinstance(other, FrozenNamespace):
+
+            return NotImplemented
+
+        return (
+            self.__doc__ == other.__doc__ and self._values == other._values
+        )
+
+    def __ne__(self, other):
+        """Invert the result of '__eq__'."""
+        result = self.__eq__(other)
+        if result is NotImplemented:
+
+            return result
+
+        return not result
+
+    def __hash__(self):
+        """Hash the description and values of the namespace."""
+        return hash(
+            (self.__doc__, frozenset(compat.iteritems(self._values)))
+        )
+
+    def __setattr__(self, name, value):
+        """Reject all attribute sets."""
+        raise AttributeError(
+            "Cannot set {0} on a frozen namespace.".format(name)
+        )
+
+    def __delattr__(self, name):
+        """Reject all attribute deletes."""
+        raise AttributeError(
+            "Cannot delete {0} from a frozen namespace.".format(name)
+        )
@@ -5,10 +5,161 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import collections
+import threading
+
+from . import compat
+from .. import instrument
+
+
+class CoercionCache(object):
+
+    """A bounded, least recently used cache of coerced option values.
+
+    Entries are keyed by the value returned from Option.coercion_key which, by
+    default, is the option instance and the raw string. Only successful
+    coercions are stored. Cached values are shared so options should only opt
+    into a cache if they produce immutable values.
+
+    A lookup costs more than the coercion of any of the built in options so
+    none of them use a cache. Opt in for options whose
+    coercion is expensive such as parsing dates. See
+    benchmarks/bench_coerce.py.
+    """
+
+    def __init__(self, maxsize=4096):
+        """Initialize an empty cache.
+
+        Args:
+            maxsize (int): The number of entries to keep before discarding
+                the least recently used entry.
+        """
+        self._maxsize = maxsize
+        self._values = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self):
+        """Get the maximum number of entries stored."""
+        return self._maxsize
+
+    @property
+    def hits(self):
+        """Get the number of lookups served from the cache."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Get the number of lookups which required a coercion."""
+        return self._misses
+
+    def coerce(self, key, func, value):
+        """Get a cached value or coerce and store it.
+
+        Args:
+            key: A hashable key which identifies the coercion.
+            func (callable): The coercion to run on a cache miss.
+            value: The raw value to pass to 'func'.
+
+        Returns:
+            object: The coerced value.
+
+        Raises:
+            TypeError: If the coercion raises a TypeError.
+            ValueError: If the coercion raises a ValueError.
+        """
+        with self._lock:
+
+            try:
+
+                result = self._values.pop(key)
+
+            except KeyError:
+
+                self._misses += 1
+
+            else:
+
+                self._hits += 1
+                self._values[key] = result
+                return result
+
+        result = func(value)
+        with self._lock:
+
+            self._values[key] = result
+            if len(self._values) > self._maxsize:
+
+                self._values.popitem(last=False)
+
+        return result
+
+    def clear(self):
+        """Remove all entries and reset the hit and miss counters."""
+        with self._lock:
+
+            self._values.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self):
+        """Get the number of cached entries."""
+        return len(self._values)
+
+
+COERCION_CACHE = CoercionCache()
+
+
+class _Nothing(object):
+
+    """The pending value of an option with no raw value awaiting coercion.
+
+    Copies and unpickled instances are the same object so identity checks
+    keep working for copied options.
+    """
+
+    __slots__ = ()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return "_NOTHING"
+
+    def __repr__(self):
+        return "NOTHING"
+
+
+_NOTHING = _Nothing()
+
 
 class Option(object):
 
-    """Base class for all validated options."""
+    """Base class for all validated options.
+
+    Options define '__slots__' rather than carrying an instance dictionary.
+    Large schemas, especially those generated by an AutoNamespace, can contain
+    many thousands of options so the per-instance overhead adds up. Subclasses
+    should declare '__slots__' for any additional attributes they store.
+    """
+
+    __slots__ = (
+        "_description",
+        "_default",
+        "_value",
+        "_required",
+        "_pending",
+    )
+
+    # Subclasses with an expensive coercion may set this to a CoercionCache,
+    # such as COERCION_CACHE, in order to reuse the results of coercing
+    # identical raw strings.
+    coercion_cache = None
 
     def __init__(self, description=None, default=None, required=False):
         """Initialize the option with some basic metadata.
@@ -19,15 +170,16 @@ class Option(object):
             default (optional): The default value to use if unset.
             required (bool, optional): Whether or not the value must be set.
         """
-        self.__doc__ = description
+        self._description = description
         self._default = default
         self._value = default
         self._required = bool(required)
+        self._pending = _NOTHING
 
     @property
     def description(self):
         """Get the human description of the options."""
-        return self.__doc__
+        return self._description
 
     @property
     def default(self):
@@ -39,12 +191,27 @@ class Option(object):
         """Get whether or not the value is required."""
         return self._required
 
+    @property
+    def pending(self):
+        """Get whether or not a deferred raw value has not been coerced."""
+        return self._pending is not _NOTHING
+
     @property
     def value(self):
         """Get the current value of the option.
 
-        If the value is unset the default value will be used instead.
+        If the value is unset the default value will be used instead. A
+        deferred raw value is coerced on the first read.
+
+        Raises:
+            TypeError: If a deferred value is not a string or appropriate
+                native type.
+            ValueError: If a deferred value cannot be coerced.
         """
+        if self._pending is not _NOTHING:
+
+            self.materialize()
+
         return self._value if self._value is not None else self._default
 
     @value.setter
@@ -57,7 +224,91 @@ class Option(object):
             TypeError: If the value is not a string or appropriate native type.
             ValueError: If the value is a string but cannot be coerced.
         """
-        self._value = self.coerce(val)
+        self._value = self.cached_coerce(val)
+        self._pending = _NOTHING
+
+    def defer(self, val):
+        """Store a raw value which is coerced the first time it is read.
+
+        Args:
+            val: The raw value to set the option to.
+
+        Coercion errors are raised by the first read or by 'materialize'
+        rather than here. A value set later replaces the deferred value.
+        """
+        self._pending = val
+
+    def materialize(self):
+        """Coerce and store a deferred raw value if there is one.
+
+        Raises:
+            TypeError: If the value is not a string or appropriate native type.
+            ValueError: If the value cannot be coerced.
+
+        The raw value stays deferred if coercion fails so every read raises.
+        """
+        pending = self._pending
+        if pending is not _NOTHING:
+
+            self._value = self.cached_coerce(pending)
+            self._pending = _NOTHING
+
+    def reset(self):
+        """Return the option to the state it had before any value was set."""
+        self._value = self._default
+        self._pending = _NOTHING
+
+    def coercion_key(self, value):
+        """Get the key used to cache the coercion of a raw string.
+
+        The default key includes the option instance so that a coercion which
+        depends on instance state is never reused by another instance.
+        Subclasses may return a key which includes the type and the relevant
+        state instead so that equal options share entries.
+
+        Args:
+            value (str): The raw string value being coerced.
+
+        Returns:
+            tuple: A hashable key for the coercion cache.
+        """
+        return (self, value)
+
+    def cached_coerce(self, value):
+        """Coerce a value through the coercion cache if one is configured.
+
+        Only string values are cached. Any other value is passed directly to
+        the 'coerce' method.
+
+        Args:
+            value: The value to coerce.
+
+        Raises:
+            TypeError: If the value is not string or appropriate native type.
+            ValueError: If the value cannot be converted.
+
+        Returns:
+            object: Some Python value.
+        """
+        hook = instrument.ACTIVE
+        if hook is not None:
+
+            start = instrument.clock()
+
+        cache = self.coercion_cache
+        if cache is None or not isinstance(value, compat.basestring):
+
+            result = self.coerce(value)
+
+        else:
+
+            result = cache.coerce(self.coercion_key(value), self.coerce, value)
+
+        if hook is not None:
+
+            hook.coercion(self, value, instrument.clock() - start)
+
+        return result
 
     def coerce(self, value):
         """Convert a string to the appropriate Python value.
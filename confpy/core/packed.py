@@ -0,0 +1,166 @@
+"""A compact binary layout for namespaces of option values.
+
+The layout is a header, a table of namespaces, and a payload:
+
+    header:  magic (4 bytes), version (uint16), namespace count (uint32)
+    table:   for each namespace, the name length (uint16), the UTF-8 name,
+             and the offset and length (uint32, uint32) of its payload
+    payload: for each namespace, the 'marshal' encoding of its data
+
+All integers are little endian. Offsets are relative to the start of the
+buffer. Reading the table does not decode any namespace so a single namespace
+can be located and decoded without touching the rest of the buffer.
+"""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import marshal
+import struct
+
+from . import compat
+
+
+MAGIC = b"CPYP"
+VERSION = 1
+HEADER = struct.Struct(str("<4sHI"))
+NAME = struct.Struct(str("<H"))
+SPAN = struct.Struct(str("<II"))
+
+
+def pack(namespaces):
+    """Encode a mapping of namespace name to data.
+
+    Args:
+        namespaces (dict): A mapping of namespace name to any value which can
+            be encoded with 'marshal'.
+
+    Returns:
+        bytes: The encoded buffer.
+
+    Raises:
+        ValueError: If a value cannot be encoded.
+    """
+    names = sorted(namespaces)
+    encoded_names = [name.encode("utf8") for name in names]
+    payloads = [marshal.dumps(namespaces[name]) for name in names]
+    offset = HEADER.size + sum(
+        NAME.size + len(name) + SPAN.size for name in encoded_names
+    )
+    parts = [HEADER.pack(MAGIC, VERSION, len(names))]
+    for name, payload in compat.zip(encoded_names, payloads):
+
+        parts.append(NAME.pack(len(name)))
+        parts.append(name)
+        parts.append(SPAN.pack(offset, len(payload)))
+        offset += len(payload)
+
+    parts.extend(payloads)
+    return b"".join(parts)
+
+
+def decode(data):
+    """Decode the data of a namespace copied with PackedNamespaces.raw.
+
+    Args:
+        data (bytes): The encoded data of a namespace.
+
+    Returns:
+        object: The decoded data.
+
+    Raises:
+        ValueError: If the data is not a valid encoding.
+    """
+    return marshal.loads(data)
+
+
+class PackedNamespaces(object):
+
+    """A read-only view of a buffer created by 'pack'.
+
+    The buffer may be any object which supports slicing to bytes such as
+    bytes, mmap.mmap, or a memoryview. Only the table is read on creation.
+    The buffer must not change while it is in use. Copy a buffer which is
+    written concurrently, such as a shared memory segment, to bytes first.
+    """
+
+    def __init__(self, buffer, offset=0):
+        """Read the namespace table of a buffer.
+
+        Args:
+            buffer: The buffer which contains the packed data.
+            offset (int): The position of the packed data within the buffer.
+
+        Raises:
+            ValueError: If the buffer does not contain packed data.
+        """
+        magic, version, count = HEADER.unpack_from(buffer, offset)
+        if magic != MAGIC or version != VERSION:
+
+            raise ValueError("The buffer does not contain packed namespaces.")
+
+        self._buffer = buffer
+        self._offset = offset
+        self._spans = {}
+        position = offset + HEADER.size
+        for _ in compat.range(count):
+
+            (length,) = NAME.unpack_from(buffer, position)
+            position += NAME.size
+            name = bytes(buffer[position:position + length]).decode("utf8")
+            position += length
+            self._spans[name] = SPAN.unpack_from(buffer, position)
+            position += SPAN.size
+
+    def names(self):
+        """Get an iterable of the namespace names in the buffer."""
+        return iter(self._spans)
+
+    def raw(self, name, default=None):
+        """Copy the encoded data of a single namespace without decoding it.
+
+        Args:
+            name (str): The name of the namespace.
+            default: The value to return if the name is missing.
+
+        Returns:
+            bytes: The encoded data of the namespace. See 'decode'.
+        """
+        span = self._spans.get(name)
+        if span is None:
+
+            return default
+
+        start = self._offset + span[0]
+        return bytes(self._buffer[start:start + span[1]])
+
+    def get(self, name, default=None):
+        """Decode the data of a single namespace.
+
+        Args:
+            name (str): The name of the namespace.
+            default: The value to return if the name is missing.
+
+        Returns:
+            object: The decoded data of the namespace.
+        """
+        data = self.raw(name)
+        if data is None:
+
+            return default
+
+        return decode(data)
+
+    def items(self):
+        """Get an iterable of two-tuples containing name and decoded data."""
+        return ((name, self.get(name)) for name in self._spans)
+
+    def __contains__(self, name):
+        """Check if a namespace is in the buffer."""
+        return name in self._spans
+
+    def __len__(self):
+        """Get the number of namespaces in the buffer."""
+        return len(self._spans)
@@ -0,0 +1,106 @@
+"""Versioned, immutable snapshots of configuration values."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import threading
+
+from .. import exc
+from . import compat
+
+
+class Publisher(object):
+
+    """Publish new versions of a frozen configuration to readers.
+
+    Readers use the 'current' property and never lock. The value returned is
+    a config.FrozenConfiguration which never changes. Writers call 'publish'
+    which coerces the new values with the options registered in the
+    Configuration, copies only the namespaces which changed, and replaces the
+    current snapshot with a single reference assignment. Writers are
+    serialized with a lock so that concurrent publishes are not lost.
+
+    The options in the Configuration are only used to coerce values and are
+    not modified.
+    """
+
+    def __init__(self, config):
+        """Initialize the publisher with the current values of a config.
+
+        Args:
+            config (confpy.core.config.Configuration): The configuration which
+                defines the options.
+        """
+        self._config = config
+        self._lock = threading.Lock()
+        self._current = config.freeze()
+        self._version = 0
+
+    @property
+    def current(self):
+        """Get the most recently published config.FrozenConfiguration."""
+        return self._current
+
+    @property
+    def version(self):
+        """Get the number of publishes which changed a value."""
+        return self._version
+
+    def _coerce(self, changes):
+        """Coerce raw values with the registered options."""
+        coerced = {}
+        for section_name, values in compat.iteritems(changes):
+
+            section = self._config.get(section_name)
+            if section is None:
+
+                raise exc.NamespaceNotRegistered(
+                    "The namespace {0} is not registered.".format(section_name)
+                )
+
+            options = dict(section.options())
+            coerced[section_name] = {}
+            for option_name, value in compat.iteritems(values):
+
+                if option_name not in options:
+
+                    raise exc.OptionNotRegistered(
+                        "The option {0} is not registered.".format(option_name)
+                    )
+
+                coerced[section_name][option_name] = options[
+                    option_name
+                ].cached_coerce(value)
+
+        return coerced
+
+    def publish(self, changes):
+        """Publish a new snapshot with some values replaced.
+
+        Args:
+            changes (dict): A mapping of namespace name to a mapping of option
+                name to the new raw or native value.
+
+        Returns:
+            config.FrozenConfiguration: The new current snapshot.
+
+        Raises:
+            NamespaceNotRegistered: If a namespace is not registered.
+            OptionNotRegistered: If an option is not registered.
+            TypeError: If a value is not a string or appropriate native type.
+            ValueError: If a value is a string but cannot be coerced.
+
+        The current snapshot is unchanged if an exception is raised.
+        """
+        coerced = self._coerce(changes)
+        with self._lock:
+
+            new = self._current.evolve(coerced)
+            if new != self._current:
+
+                self._current = new
+                self._version += 1
+
+            return self._current
@@ -0,0 +1,233 @@
+"""Differences between two loads of raw configuration values."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+
+from . import exc
+from .core import compat
+
+
+class _Missing(object):
+
+    """The value of a key which is not set by a load."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __bool__(self):
+        return False
+
+    __nonzero__ = __bool__
+
+
+MISSING = _Missing()
+
+
+Change = collections.namedtuple(
+    "Change", ("namespace", "option", "old", "new")
+)
+
+
+class ChangeSet(object):
+
+    """The raw values which differ between two loads.
+
+    Each Change holds the namespace, option, and the old and new raw values.
+    A value of MISSING means the option is not set by that load. Changes are
+    ordered by namespace and option.
+    """
+
+    def __init__(self, changes=()):
+        """Initialize the set with changes.
+
+        Args:
+            changes (iter of Change): The changes in any order.
+        """
+        self._changes = tuple(
+            sorted(changes, key=lambda change: change[:2])
+        )
+
+    @property
+    def added(self):
+        """Get the changes for options which were not set before."""
+        return tuple(c for c in self._changes if c.old is MISSING)
+
+    @property
+    def removed(self):
+        """Get the changes for options which are no longer set."""
+        return tuple(c for c in self._changes if c.new is MISSING)
+
+    @property
+    def modified(self):
+        """Get the changes for options which are set to a different value."""
+        return tuple(
+            c
+            for c in self._changes
+            if c.old is not MISSING and c.new is not MISSING
+        )
+
+    def keys(self):
+        """Get the (namespace, option) pairs which changed."""
+        return [(change.namespace, change.option) for change in self._changes]
+
+    def namespaces(self):
+        """Get the set of namespace names which contain a change."""
+        return set(change.namespace for change in self._changes)
+
+    def for_namespace(self, name):
+        """Get the changes within a single namespace."""
+        return tuple(c for c in self._changes if c.namespace == name)
+
+    def __iter__(self):
+        """Iterate over the changes in order."""
+        return iter(self._changes)
+
+    def __len__(self):
+        """Get the number of changes."""
+        return len(self._changes)
+
+    def __bool__(self):
+        """Check if anything changed."""
+        return bool(self._changes)
+
+    __nonzero__ = __bool__
+
+    def __eq__(self, other):
+        """Compare the changes of two sets."""
+        if not isinstance(other, ChangeSet):
+
+            return NotImplemented
+
+        return self._changes == other._changes
+
+    def __ne__(self, other):
+        """Compare the changes of two sets."""
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self):
+        return "ChangeSet({0!r})".format(list(self._changes))
+
+
+def diff(old, new):
+    """Compare two maps of raw values.
+
+    Args:
+        old (dict): A mapping of (namespace, option) to raw value from the
+            previous load.
+        new (dict): A mapping of (namespace, option) to raw value from the
+            current load.
+
+    Returns:
+        ChangeSet: A change for every key whose value differs or which is only
+            in one of the maps.
+    """
+    changes = []
+    for key, value in compat.iteritems(new):
+
+        previous = old.get(key, MISSING)
+        if previous is MISSING or previous != value:
+
+            changes.append(Change(key[0], key[1], previous, value))
+
+    for key, value in compat.iteritems(old):
+
+        if key not in new:
+
+            changes.append(Change(key[0], key[1], value, MISSING))
+
+    return ChangeSet(changes)
+
+
+def coerce(changes, entries):
+    """Coerce the new values of a change set.
+
+    Args:
+        changes (ChangeSet): The changes to coerce.
+        entries (dict): A mapping of (namespace, option) to resolver.Entry.
+
+    Returns:
+        dict: A mapping of (namespace, option) to the coerced new value for
+            every change which is not a removal.
+
+    Raises:
+        TypeError: If a value is not a string or appropriate native type.
+        ValueError: If a value cannot be coerced.
+    """
+    values = {}
+    for change in changes:
+
+        if change.new is not MISSING:
+
+            entry = entries[(change.namespace, change.option)]
+            values[(change.namespace, change.option)] = (
+                entry.option.cached_coerce(change.new)
+            )
+
+    return values
+
+
+def apply(changes, entries, restore=None):
+    """Apply only the changed values to their options.
+
+    Args:
+        changes (ChangeSet): The changes to apply.
+        entries (dict): A mapping of (namespace, option) to resolver.Entry.
+        restore (dict): An optional mapping of (namespace, option) to the
+            value a removed option returns to. None resets the option.
+
+    Returns:
+        ChangeSet: The changes which were applied.
+
+    Raises:
+        MissingRequiredOption: If a removal would leave a required option
+            without a value.
+        TypeError: If a value is not a string or appropriate native type.
+        ValueError: If a value cannot be coerced.
+
+    Every new value is coerced and every removal is checked before any option
+    is modified so options are unchanged if an exception is raised. Removed
+    options which are not in 'restore' are reset to their default.
+    """
+    restore = restore or {}
+    values = coerce(changes, entries)
+    for change in changes.removed:
+
+        entry = entries[(change.namespace, change.option)]
+        if (
+            entry.option.required
+            and entry.option.default is None
+            and restore.get((change.namespace, change.option)) is None
+        ):
+
+            raise exc.MissingRequiredOption(
+                "Option {0} in namespace {1} is required.".format(
+                    change.option, change.namespace
+                )
+            )
+
+    for change in changes:
+
+        entry = entries[(change.namespace, change.option)]
+        if change.new is MISSING:
+
+            value = restore.get((change.namespace, change.option))
+            if value is None:
+
+                entry.section.reset(entry.option_name)
+                continue
+
+            entry.section.set(entry.option_name, value)
+            continue
+
+        entry.section.set(
+            entry.option_name, values[(change.namespace, change.option)]
+        )
+
+    return changes
@@ -7,26 +7,68 @@ from __future__ import unicode_literals
 
 import sys
 
-try:
+_ENV = None
 
-    import jinja2
 
-except ImportError as exc:
+def environment():
+    """Get the jinja2 environment which renders the example templates.
 
-    raise exc
+    jinja2 is imported the first time an example is generated rather than
+    when this module is imported.
 
-except Exception as exc:
+    Returns:
+        jinja2.Environment: The environment with the package templates.
+
+    Raises:
+        ImportError: If jinja2 is not installed or cannot be imported.
+    """
+    global _ENV  # pylint: disable=global-statement
+    if _ENV is not None:
+
+        return _ENV
+
+    try:
+
+        import jinja2
+
+    except ImportError as exc:
+
+        raise exc
+
+    except Exception as exc:
 
-    if sys.version_info[0] == 3 and sys.version_info[1] == 2:
+        if sys.version_info[0] == 3 and sys.version_info[1] == 2:
 
-        raise ImportError(
-            "Example generator cannot be imported in Python 3.2.X."
-        )
+            raise ImportError(
+                "Example generator cannot be imported in Python 3.2.X."
+            )
 
-    raise exc
+        raise exc
 
+    _ENV = jinja2.Environment(
+        loader=jinja2.PackageLoader("confpy", "templates")
+    )
+    return _ENV
 
-ENV = jinja2.Environment(loader=jinja2.PackageLoader("confpy", "templates"))
+
+def __getattr__(name):
+    """Create the jinja2 environment, named ENV, when it is first used.
+
+    Module level __getattr__ requires Python 3.7. Older versions create the
+    environment when this module is imported.
+    """
+    if name == "ENV":
+
+        return environment()
+
+    raise AttributeError(
+        "module {0!r} has no attribute {1!r}".format(__name__, name)
+    )
+
+
+if sys.version_info < (3, 7):
+
+    ENV = environment()
 
 
 def generate_example_ini(config):
@@ -65,7 +107,10 @@ def generate_example(config, ext="json"):
 
     Returns:
         str: The text of the example file.
+
+    Raises:
+        ImportError: If jinja2 is not installed or cannot be imported.
     """
     template_name = "example.{0}".format(ext.lower())
-    template = ENV.get_template(template_name)
+    template = environment().get_template(template_name)
     return template.render(config=config)
@@ -24,3 +24,13 @@ class OptionNotRegistered(AttributeError):
 class UnrecognizedFileExtension(ValueError):
 
     """Represents a file extension that cannot be parsed."""
+
+
+class RemoteSourceError(IOError):
+
+    """Represents a failure to fetch values from a remote source."""
+
+
+class PublishStalled(RuntimeError):
+
+    """Represents a shared snapshot whose publish did not complete in time."""
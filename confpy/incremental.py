@@ -0,0 +1,181 @@
+"""Incremental loading of conf.d style configuration fragments."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+import os
+import threading
+
+from . import diff
+from . import exc
+from . import parser
+from . import resolver
+from .core import compat
+from .core import config as conf
+from .loaders import base
+from .loaders import pyfile
+
+
+class IncrementalLoader(object):
+
+    """Load configuration fragments and re-apply only what changed.
+
+    Sources may be files, directories, or glob patterns and are expanded with
+    parser.expand_paths on every load. The raw values of each fragment are
+    kept along with its fingerprint. On later loads only fragments which are
+    new or whose fingerprint changed are read and parsed again. The raw values
+    of all fragments are then merged in order and only the options whose
+    merged value changed are coerced and set on the live Configuration. See
+    diff.apply. Options which are no longer set by any fragment return to the
+    value they had before a fragment first set them, which includes a value
+    set by a Python fragment, the same as with reload.Reloader.
+
+    Python fragments are executed for their side-effects when first found
+    and again whenever their fingerprint changes. Their values are set
+    directly rather than through diff.apply so a value a re-executed Python
+    fragment sets replaces the value of a later, unchanged fragment, and an
+    assignment removed from a Python fragment does not reset its option.
+    """
+
+    def __init__(
+        self,
+        sources,
+        env_prefix="CONFPY",
+        strict=True,
+        env=None,
+        arguments=None,
+    ):
+        """Initialize the loader without loading anything.
+
+        Args:
+            sources (iter of str): File paths, directories, and glob patterns.
+                The expanded files are processed in order with values in later
+                files overwriting values in earlier files.
+            env_prefix (str): The static prefix prepended to all options when
+                set as environment variables. The default is CONFPY.
+            strict (bool): Whether or not to parse the files in strict mode.
+            env (dict): Optional dictionary which contains environment
+                variables. The default is os.environ if no value is given.
+            arguments (iter of str): An iterable of strings which contains the
+                CLI arguments passed. If nothing is give then sys.argv is used.
+        """
+        self._sources = tuple(sources)
+        self._strict = strict
+        self._env = env
+        self._arguments = arguments
+        self._config = conf.Configuration()
+        self._table = resolver.Resolver(self._config, env_prefix)
+        self._fragments = {}
+        self._merged = {}
+        self._baseline = {}
+        self._overrides = {}
+        self._entries = None
+        self._lock = threading.Lock()
+
+    @property
+    def config(self):
+        """Get the configuration object values are applied to."""
+        return self._config
+
+    @property
+    def paths(self):
+        """Get the absolute fragment paths found by the last load."""
+        return list(self._fragments)
+
+    def _collect(self, path):
+        """Read, parse, and collect the raw values of a fragment."""
+        source = parser.configfile_from_path(path, self._strict)
+        if isinstance(source, pyfile.PythonFile):
+
+            source.config  # pylint: disable=pointless-statement
+            return {}
+
+        return self._table.collect(source)
+
+    def load(self):
+        """Load new and changed fragments and apply the values which changed.
+
+        Returns:
+            diff.ChangeSet: The raw values which changed and were applied.
+
+        Raises:
+            MissingRequiredOption: If a required option is not set.
+            NamespaceNotRegistered: If a fragment contains a namespace which
+                is not defined.
+            OptionNotRegistered: If a fragment contains an option which is not
+                defined but resides under a valid namespace.
+            UnrecognizedFileExtension: If there is no loader for a path.
+
+        The configuration is unchanged if an exception is raised while
+        reading the fragments or coercing values.
+        """
+        with self._lock:
+
+            fragments = collections.OrderedDict()
+            merged = {}
+            for path in parser.expand_paths(self._sources):
+
+                path = os.path.abspath(path)
+                signature = base.fingerprint(path)
+                fragment = self._fragments.get(path)
+                if fragment is None or fragment[0] != signature:
+
+                    fragment = (signature, self._collect(path))
+
+                fragments[path] = fragment
+                merged.update(fragment[1])
+
+            # Fragments may generate new options within an AutoNamespace which
+            # need their environment and CLI values looked up.
+            if len(self._table.entries) != self._entries:
+
+                self._overrides = self._table.overrides(
+                    self._env, self._arguments
+                )
+                self._entries = len(self._table.entries)
+
+            merged.update(self._overrides)
+            changes = diff.diff(self._merged, merged)
+            baseline = dict(self._baseline)
+            for change in changes.added:
+
+                entry = self._table.table[(change.namespace, change.option)]
+                baseline[(change.namespace, change.option)] = (
+                    entry.option.value
+                )
+
+            self._check(merged, baseline)
+            changes = diff.apply(changes, self._table.table, baseline)
+            for change in changes.removed:
+
+                baseline.pop((change.namespace, change.option), None)
+
+            self._baseline = baseline
+            self._fragments = fragments
+            self._merged = merged
+
+        return changes
+
+    def _check(self, merged, baseline):
+        """Raise if a required option would be left without a value."""
+        for key, entry in compat.iteritems(self._table.table):
+
+            if (
+                entry.option.required
+                and key not in merged
+                and entry.option.default is None
+                and (
+                    baseline.get(key) is None
+                    if key in self._merged
+                    else entry.option.value is None
+                )
+            ):
+
+                raise exc.MissingRequiredOption(
+                    "Option {0} in namespace {1} is required.".format(
+                        entry.option_name, entry.section_name
+                    )
+                )
@@ -0,0 +1,266 @@
+"""Measurements of where the time to load configuration is spent.
+
+Instrumented code checks the module level ACTIVE hook before measuring
+anything. When no hook is installed that check is the only cost so the
+instrumentation may stay in place in production. Install a Profiler to
+record measurements for a block of code:
+
+    with instrument.Profiler() as profiler:
+
+        parser.parse_options(files)
+
+    report = profiler.report()
+
+Hooks receive measurements from every thread of the process. Work done in
+other processes, such as files parsed by a process pool, is not measured.
+"""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+import functools
+import heapq
+import itertools
+import threading
+import time
+
+# The hook which receives measurements or None if instrumentation is off.
+# Always read this through the module so that installs are observed.
+ACTIVE = None
+
+clock = getattr(time, "perf_counter", time.time)
+
+
+class Hook(object):
+
+    """Base class for receivers of measurements.
+
+    Every method does nothing by default. Subclasses override the methods for
+    the measurements they need.
+    """
+
+    def stage(self, name, seconds):
+        """Record the wall time of a stage such as 'env' or 'cli'.
+
+        Stages nest. The time of 'parse_options' includes the time of every
+        stage it runs.
+        """
+
+    def file(self, loader, stage, seconds, size=None):
+        """Record the wall time of reading, parsing, or executing a file.
+
+        Args:
+            loader (confpy.loaders.base.ConfigurationFile): The loader of the
+                file.
+            stage (str): One of 'read', 'parse', or 'exec'. The time of
+                'parse' includes reading the file if it is first read while
+                parsing.
+            seconds (float): The wall time.
+            size (int): The length of the content for the 'read' stage.
+        """
+
+    def coercion(self, option, value, seconds):
+        """Record the wall time of coercing a raw value."""
+
+    def count(self, name, number):
+        """Record a number of items such as options set by a load."""
+
+
+def install(hook):
+    """Set the active hook.
+
+    Args:
+        hook (Hook): The hook which receives measurements or None to turn
+            instrumentation off.
+
+    Returns:
+        Hook: The hook which was active before.
+    """
+    global ACTIVE  # pylint: disable=global-statement
+    previous, ACTIVE = ACTIVE, hook
+    return previous
+
+
+def timed(stage):
+    """Decorate a function so that each call is recorded as a stage.
+
+    Args:
+        stage (str): The name of the stage.
+
+    Returns:
+        callable: A decorator.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            hook = ACTIVE
+            if hook is None:
+
+                return func(*args, **kwargs)
+
+            start = clock()
+            try:
+
+                return func(*args, **kwargs)
+
+            finally:
+
+                hook.stage(stage, clock() - start)
+
+        return wrapper
+
+    return decorator
+
+
+class Profiler(Hook):
+
+    """A hook which aggregates measurements into a report.
+
+    Use an instance as a context manager to install it for a block of code.
+    The hook which was active before is restored when the block exits.
+    """
+
+    def __init__(self, slowest=10):
+        """Initialize an empty profiler.
+
+        Args:
+            slowest (int): The number of slowest coercions to keep.
+        """
+        self._slowest = slowest
+        self._stages = collections.OrderedDict()
+        self._files = collections.OrderedDict()
+        self._counts = collections.OrderedDict()
+        self._coercions = []
+        self._coerced = [0, 0.0]
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._previous = []
+
+    def __enter__(self):
+        """Install the profiler as the active hook."""
+        self._previous.append(install(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Restore the hook which was active before."""
+        install(self._previous.pop())
+
+    def _add_stage(self, name, seconds):
+        """Add the time of a stage. The lock must be held."""
+        totals = self._stages.setdefault(name, [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+
+    def stage(self, name, seconds):
+        """Record the wall time of a stage."""
+        with self._lock:
+
+            self._add_stage(name, seconds)
+
+    def file(self, loader, stage, seconds, size=None):
+        """Record the wall time of a file stage and add it to the stage."""
+        with self._lock:
+
+            self._add_stage(stage, seconds)
+            entry = self._files.setdefault(
+                loader.path, {"loader": type(loader).__name__}
+            )
+            entry[stage] = entry.get(stage, 0.0) + seconds
+            if size is not None:
+
+                entry["size"] = entry.get("size", 0) + size
+
+    def coercion(self, option, value, seconds):
+        """Record the wall time of a coercion and keep the slowest."""
+        with self._lock:
+
+            self._add_stage("coerce", seconds)
+            self._coerced[0] += 1
+            self._coerced[1] += seconds
+            item = (seconds, next(self._order), option, value)
+            if len(self._coercions) < self._slowest:
+
+                heapq.heappush(self._coercions, item)
+
+            elif self._coercions and item[0] > self._coercions[0][0]:
+
+                heapq.heapreplace(self._coercions, item)
+
+    def count(self, name, number):
+        """Add to a named count."""
+        with self._lock:
+
+            self._counts[name] = self._counts.get(name, 0) + number
+
+    @staticmethod
+    def _names():
+        """Get a mapping of option id to 'namespace.option' names."""
+        # Imported here because the options of the core modules import this
+        # module.
+        from .core import config
+
+        return dict(
+            (id(option), "{0}.{1}".format(section_name, option_name))
+            for section_name, section in config.Configuration()
+            for option_name, option in section
+        )
+
+    def report(self):
+        """Get the measurements as a dictionary of plain values.
+
+        Returns:
+            dict: A structure which may be encoded as JSON:
+
+                stages: A mapping of stage name to the number of 'calls' and
+                    the total 'seconds'.
+                files: A mapping of file path to the 'loader' name, the
+                    'size' of the content, and the 'read', 'parse', and 'exec'
+                    seconds which were measured. The 'parse' time excludes
+                    the 'read' time.
+                counts: A mapping of count name to total.
+                coercions: The number of coercions 'count', their total
+                    'seconds', and the 'slowest' as a list of the option
+                    'name' or None, option 'type', raw 'value', and 'seconds'.
+        """
+        with self._lock:
+
+            stages = dict(
+                (name, {"calls": calls, "seconds": seconds})
+                for name, (calls, seconds) in self._stages.items()
+            )
+            files = dict(
+                (path, dict(entry)) for path, entry in self._files.items()
+            )
+            counts = dict(self._counts)
+            coerced = list(self._coerced)
+            slowest = sorted(self._coercions, reverse=True)
+
+        for entry in files.values():
+
+            if "parse" in entry and "read" in entry:
+
+                entry["parse"] = max(entry["parse"] - entry["read"], 0.0)
+
+        names = self._names() if slowest else {}
+        return {
+            "stages": stages,
+            "files": files,
+            "counts": counts,
+            "coercions": {
+                "count": coerced[0],
+                "seconds": coerced[1],
+                "slowest": [
+                    {
+                        "name": names.get(id(option)),
+                        "type": type(option).__name__,
+                        "value": repr(value),
+                        "seconds": seconds,
+                    }
+                    for seconds, _, option, value in slowest
+                ],
+            },
+        }
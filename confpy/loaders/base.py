@@ -5,27 +5,312 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import collections
 import os
+import threading
 
 from .. import exc
+from .. import instrument
 from ..core import compat
 from ..core import config
 
 
+def fingerprint(path):
+    """Get a value which changes whenever the file at a path is modified.
+
+    Args:
+        path (str): The file path to inspect.
+
+    Returns:
+        tuple or None: The modification time, size, and inode of the file or
+            None if the file cannot be found.
+    """
+    try:
+
+        stat = os.stat(path)
+
+    except OSError:
+
+        return None
+
+    mtime = getattr(stat, "st_mtime_ns", stat.st_mtime)
+    return (mtime, stat.st_size, stat.st_ino)
+
+
+def _parse(loader):
+    """Parse the content of a loader and report the time to the hook."""
+    hook = instrument.ACTIVE
+    if hook is None:
+
+        return loader._parse()  # pylint: disable=protected-access
+
+    start = instrument.clock()
+    parsed = loader._parse()  # pylint: disable=protected-access
+    hook.file(loader, "parse", instrument.clock() - start)
+    return parsed
+
+
+class ParsedFileCache(object):
+
+    """A process-wide cache of parsed configuration files.
+
+    Entries are keyed by loader type and absolute path. Each entry records the
+    fingerprint of the file when it was parsed and is only reused while the
+    file on disk still has that fingerprint. An entry whose file changed is
+    replaced when the file is parsed again.
+
+    The cache is bounded by a number of entries and by the total size of the
+    cached files on disk. The least recently used entries are evicted first
+    and a file larger than the size bound is never cached, so large files do
+    not stay in memory after they are loaded. A bound of zero disables the
+    cache.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=8 * 1024 * 1024):
+        """Initialize an empty cache.
+
+        Args:
+            max_entries (int): The maximum number of cached files.
+            max_bytes (int): The maximum total size of the cached files.
+        """
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def resize(self, max_entries=None, max_bytes=None):
+        """Change the bounds of the cache and evict entries beyond them.
+
+        Args:
+            max_entries (int): The new maximum number of cached files or None
+                to keep the current bound.
+            max_bytes (int): The new maximum total size of the cached files or
+                None to keep the current bound.
+        """
+        with self._lock:
+
+            if max_entries is not None:
+
+                self._max_entries = max_entries
+
+            if max_bytes is not None:
+
+                self._max_bytes = max_bytes
+
+            self._evict()
+
+    def _evict(self):
+        """Remove the oldest entries beyond the bounds. Hold the lock."""
+        while self._entries and (
+            len(self._entries) > self._max_entries
+            or self._size > self._max_bytes
+        ):
+
+            _, (signature, _) = self._entries.popitem(last=False)
+            self._size -= signature[1]
+
+    def fetch(self, loader):
+        """Get the fingerprint and parsed content of a loader's file.
+
+        Args:
+            loader (ConfigurationFile): The loader whose content is needed.
+
+        Returns:
+            tuple: The fingerprint of the file before it was read, or None if
+                it cannot be found, and the value returned by the loader's
+                '_parse' method.
+
+        Files which cannot be found are parsed without caching.
+        """
+        path = loader.abspath
+        signature = fingerprint(path)
+        if signature is None:
+
+            return None, _parse(loader)
+
+        key = (type(loader), path)
+        with self._lock:
+
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+
+                if entry[0] == signature:
+
+                    self._entries[key] = entry
+                    return entry
+
+                self._size -= entry[0][1]
+
+        # The fingerprint is taken before reading so that a file modified
+        # while being parsed is stored under the old fingerprint and parsed
+        # again on the next lookup.
+        parsed = _parse(loader)
+        self.add(loader, signature, parsed)
+        return signature, parsed
+
+    def parse(self, loader):
+        """Get the parsed content of a loader from the cache or the file.
+
+        Args:
+            loader (ConfigurationFile): The loader whose content is needed.
+
+        Returns:
+            object: The value returned by the loader's '_parse' method.
+        """
+        return self.fetch(loader)[1]
+
+    def add(self, loader, signature, parsed):
+        """Record the parsed content of a loader's file.
+
+        Args:
+            loader (ConfigurationFile): The loader which parsed the file.
+            signature (tuple): The fingerprint of the file before it was read.
+                Nothing is recorded if it is None or the file is larger than
+                the size bound.
+            parsed (object): The value returned by the loader's '_parse'.
+        """
+        if signature is None:
+
+            return
+
+        key = (type(loader), loader.abspath)
+        with self._lock:
+
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+
+                self._size -= entry[0][1]
+
+            if signature[1] > self._max_bytes or self._max_entries <= 0:
+
+                return
+
+            self._entries[key] = (signature, parsed)
+            self._size += signature[1]
+            self._evict()
+
+    def discard(self, path):
+        """Remove all entries for a file path."""
+        path = os.path.abspath(path)
+        with self._lock:
+
+            for key in [key for key in self._entries if key[1] == path]:
+
+                self._size -= self._entries.pop(key)[0][1]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        """Get the number of cached entries."""
+        return len(self._entries)
+
+
+PARSED_FILES = ParsedFileCache()
+
+
+def _fetch(loader):
+    """Parse a loader's file in an executor worker."""
+    return PARSED_FILES.fetch(loader)
+
+
+def preload(loaders, executor=None):
+    """Parse the files of many loaders at the same time.
+
+    Args:
+        loaders (iter of ConfigurationFile): The loaders to parse.
+        executor (concurrent.futures.Executor): An optional executor used to
+            read and parse the files. A ThreadPoolExecutor overlaps file I/O.
+            A ProcessPoolExecutor also parses in parallel but requires the
+            loaders and their parsed values to be picklable.
+
+    Returns:
+        list of ConfigurationFile: The loaders in their original order. Each
+            has its parsed content cached if an executor is given. Otherwise
+            the loaders are unchanged and parse lazily.
+
+    Loaders whose parsed content cannot leave the process, such as Python
+    files, are parsed by the caller.
+    """
+    loaders = list(loaders)
+    if executor is None:
+
+        return loaders
+
+    # pylint: disable=protected-access
+    remote = [loader for loader in loaders if loader.transferable]
+    for loader, (signature, parsed) in compat.zip(
+        remote, executor.map(_fetch, remote)
+    ):
+
+        PARSED_FILES.add(loader, signature, parsed)
+        loader._parsed = parsed
+
+    for loader in loaders:
+
+        if loader._parsed is None:
+
+            loader._parsed = PARSED_FILES.parse(loader)
+
+    return loaders
+
+
 class ConfigurationFile(object):
 
-    """Base class for configuration file parsers."""
+    """Base class for configuration file parsers.
+
+    Subclasses implement '_parse' to convert the file content into a parsed
+    representation. Parsed values are shared across loader instances through
+    PARSED_FILES and must not be modified.
+    """
 
-    def __init__(self, path, strict=True):
+    # Whether or not the parsed content can be pickled and sent between
+    # processes.
+    transferable = True
+    # Loaders with a higher priority are preferred when several which can be
+    # imported are registered for the same extension.
+    priority = 0
+
+    def __init__(self, path, strict=True, lazy=False):
         self._path = path
         self._content = None
+        self._parsed = None
         self._strict = strict
+        self._lazy = lazy
+
+    @classmethod
+    def sniff(cls, head):
+        """Check if the start of a file looks like this format.
+
+        Args:
+            head (bytes): The first bytes of the file.
+
+        Returns:
+            bool: True if the file should be read with this loader when its
+                extension is not recognized.
+        """
+        return False
 
     @property
     def path(self):
         """Get the file path given at initialization."""
         return self._path
 
+    @property
+    def strict(self):
+        """Get whether or not unregistered values raise exceptions."""
+        return self._strict
+
+    @property
+    def lazy(self):
+        """Get whether or not values are coerced when first read."""
+        return self._lazy
+
     @property
     def abspath(self):
         """Get the absolute path to the file."""
@@ -37,45 +322,133 @@ class ConfigurationFile(object):
 
         This property is cached. The file is only read once.
         """
-        if not self._content:
+        if self._content is None:
+
+            hook = instrument.ACTIVE
+            if hook is None:
 
-            self._content = self._read()
+                self._content = self._read()
+
+            else:
+
+                start = instrument.clock()
+                self._content = self._read()
+                hook.file(
+                    self,
+                    "read",
+                    instrument.clock() - start,
+                    len(self._content),
+                )
 
         return self._content
 
+    @property
+    def parsed(self):
+        """Get the parsed representation of the content.
+
+        This property is cached and only parses the content once. Unchanged
+        files are also only parsed once per process.
+        """
+        if self._parsed is None:
+
+            self._parsed = PARSED_FILES.parse(self)
+
+        return self._parsed
+
+    def registered(self, conf):
+        """Get a filter which checks if a namespace is registered.
+
+        Args:
+            conf (confpy.core.config.Configuration): The configuration which
+                contains the registered namespaces.
+
+        Returns:
+            callable: A filter for the 'events' method. It returns False for
+                unregistered namespaces when not in strict mode.
+
+        Raises:
+            NamespaceNotRegistered: From the filter if the namespace is not
+                registered and the file is strict.
+        """
+
+        def _registered(namespace):
+            if conf.get(namespace) is not None:
+
+                return True
+
+            if not self._strict:
+
+                return False
+
+            raise exc.NamespaceNotRegistered(
+                "The namespace {0} is not registered.".format(namespace)
+            )
+
+        return _registered
+
     @property
     def config(self):
-        """Get a Configuration object from the file contents."""
+        """Get a Configuration object from the file contents.
+
+        Values of a lazy loader are deferred and coerced when first read. See
+        Configuration.validate_all.
+        """
         conf = config.Configuration()
-        for namespace in self.namespaces:
+        for namespace, item, value in self.events(self.registered(conf)):
+
+            name = conf.get(namespace)
+            if self._lazy:
 
-            if not hasattr(conf, namespace):
+                # Checking the option with 'hasattr' would coerce any value
+                # deferred by an earlier file.
+                try:
+
+                    name.defer(item, value)
+                    continue
+
+                except AttributeError:
+
+                    registered = False
+
+            else:
+
+                registered = hasattr(name, item)
+
+            if not registered:
 
                 if not self._strict:
 
                     continue
 
-                raise exc.NamespaceNotRegistered(
-                    "The namespace {0} is not registered.".format(namespace)
+                raise exc.OptionNotRegistered(
+                    "The option {0} is not registered.".format(item)
                 )
 
-            name = getattr(conf, namespace)
+            setattr(name, item, value)
 
-            for item, value in compat.iteritems(self.items(namespace)):
+        return conf
 
-                if not hasattr(name, item):
+    def events(self, wanted=None):
+        """Get an iterable of the values within the config.
 
-                    if not self._strict:
+        Args:
+            wanted (callable): An optional filter which is called with each
+                namespace name. Namespaces for which it returns False are
+                skipped.
 
-                        continue
+        Returns:
+            iterable: Three-tuples of namespace, option, and raw value in the
+                order they should be applied.
+        """
+        for namespace in self.namespaces:
 
-                    raise exc.OptionNotRegistered(
-                        "The option {0} is not registered.".format(item)
-                    )
+            if wanted is not None and not wanted(namespace):
 
-                setattr(name, item, value)
+                continue
 
-        return conf
+            for item, value in compat.iteritems(self.items(namespace)):
+
+                yield namespace, item, value
 
     @property
     def namespaces(self):
@@ -86,6 +459,10 @@ class ConfigurationFile(object):
         """Get a dictionary of entries under a given namespace."""
         raise NotImplementedError()
 
+    def _parse(self):
+        """Parse the content and return the parsed representation."""
+        raise NotImplementedError()
+
     def _read(self):
         """Open the file and return its contents."""
         with open(self.path, "r") as file_handle:
@@ -0,0 +1,149 @@
+"""Loader, writer, and converter for binary configuration files.
+
+Binary files use the layout of confpy.core.packed: a header, a table of
+namespace names with the offset and length of each namespace, and a payload
+of 'marshal' encoded option values. The table is read when a file is parsed
+and a namespace is only decoded when its values are requested so loading a
+file which mostly contains unregistered namespaces does not decode them.
+
+Values are stored as the raw values of the source, such as strings from INI
+files or native values from JSON files, and are coerced by options when
+loaded. The 'marshal' format is specific to the major Python version so files
+should be written by the same major version which reads them.
+"""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import struct
+import tempfile
+
+from . import base
+from .. import parser
+from ..core import compat
+from ..core import packed
+
+
+EXTENSION = "cfgb"
+
+
+class BinaryFile(base.ConfigurationFile):
+
+    """Configuration file parser for binary files written by 'write'."""
+
+    @classmethod
+    def sniff(cls, head):
+        """Check if the file starts with the packed header."""
+        return head[:len(packed.MAGIC)] == packed.MAGIC
+
+    def _read(self):
+        """Open the file and return its bytes."""
+        with open(self.path, "rb") as file_handle:
+
+            return file_handle.read()
+
+    def _parse(self):
+        """Get the table of namespaces without decoding any of them.
+
+        Raises:
+            ValueError: If the file is not a binary configuration file.
+        """
+        try:
+
+            return packed.PackedNamespaces(self.content)
+
+        except struct.error:
+
+            raise ValueError(
+                "The file {0} is truncated or not a binary "
+                "configuration file.".format(self.path)
+            )
+
+    @property
+    def namespaces(self):
+        """Get an iterable of str representing namespaces within the config."""
+        return self.parsed.names()
+
+    def items(self, namespace):
+        """Decode and get the dictionary of entries under a namespace."""
+        return self.parsed.get(namespace, {})
+
+
+def write(path, namespaces):
+    """Write namespaces of raw option values to a binary file.
+
+    Args:
+        path (str): The file path to write.
+        namespaces (dict): A mapping of namespace name to a mapping of option
+            name to raw value.
+
+    Raises:
+        ValueError: If a value cannot be encoded with 'marshal'.
+
+    The file is written to a temporary file and renamed into place so that
+    readers never observe a partially written file.
+    """
+    content = packed.pack(
+        dict(
+            (name, dict(options))
+            for name, options in compat.iteritems(namespaces)
+        )
+    )
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(dir=directory)
+    try:
+
+        with os.fdopen(handle, "wb") as binary_file:
+
+            binary_file.write(content)
+
+        getattr(os, "replace", os.rename)(temp_path, path)
+
+    except (IOError, OSError):
+
+        os.remove(temp_path)
+        raise
+
+
+def read(source):
+    """Get the raw option values of every namespace in a configuration file.
+
+    Args:
+        source (confpy.loaders.base.ConfigurationFile): The loader of the file.
+
+    Returns:
+        dict: A mapping of namespace name to a mapping of option name to raw
+            value. Namespaces do not need to be registered. Python files have
+            no static values and produce an empty mapping.
+    """
+    return dict(
+        (namespace, dict(source.items(namespace)))
+        for namespace in source.namespaces
+    )
+
+
+def convert(source, destination=None):
+    """Convert a text configuration file to a binary file.
+
+    Args:
+        source (str): The path of an INI, JSON, or other file which has a
+            loader in parser.FILE_TYPES.
+        destination (str): The path to write. The default is the source path
+            with the extension replaced by '.cfgb'.
+
+    Returns:
+        str: The path which was written.
+
+    Raises:
+        UnrecognizedFileExtension: If there is no loader for the source.
+        ValueError: If a value cannot be encoded with 'marshal'.
+    """
+    if destination is None:
+
+        destination = "{0}.{1}".format(os.path.splitext(source)[0], EXTENSION)
+
+    write(destination, read(parser.configfile_from_path(source)))
+    return destination
@@ -0,0 +1,25 @@
+"""Loader for JSON format files backed by orjson.
+
+Importing this module raises ImportError if orjson is not installed. It is
+registered as an optional, higher priority JSON loader in parser.FILE_TYPES.
+"""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import orjson
+
+from . import json
+
+
+class OrjsonFile(json.JsonFile):
+
+    """Configuration file parser for JSON files which uses orjson."""
+
+    priority = 10
+
+    def _parse(self):
+        """Get the JSON dictionary object which represents the content."""
+        return orjson.loads(self.content)
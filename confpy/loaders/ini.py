@@ -5,32 +5,33 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import collections
 import io
+import mmap
+import os
+import re
 
 from . import base
-from ..core.compat import ConfigParser
+from ..core import iniparser
 
 
-class IniFile(base.ConfigurationFile):
-
-    """Configuration file parser for INI style files."""
+HEADER = re.compile(br"\A(?:[ \t]*(?:[#;][^\n]*)?\r?\n)*[ \t]*\[[^\]\n]+\]")
 
-    def __init__(self, *args, **kwargs):
-        super(IniFile, self).__init__(*args, **kwargs)
-        self._parsed = None
 
-    @property
-    def parsed(self):
-        """Get the ConfigParser object which represents the content.
+class IniFile(base.ConfigurationFile):
 
-        This property is cached and only parses the content once.
-        """
-        if not self._parsed:
+    """Configuration file parser for INI style files."""
 
-            self._parsed = ConfigParser()
-            self._parsed.read_file(io.StringIO(self.content))
+    @classmethod
+    def sniff(cls, head):
+        """Check if the first line which is not a comment is a section."""
+        return HEADER.match(head) is not None
 
-        return self._parsed
+    def _parse(self):
+        """Get the ConfigParser object which represents the content."""
+        parsed = iniparser.ConfigParser()
+        parsed.read_file(io.StringIO(self.content))
+        return parsed
 
     @property
     def namespaces(self):
@@ -40,3 +41,115 @@ class IniFile(base.ConfigurationFile):
     def items(self, namespace):
         """Get a dictionary of entries under a given namespace."""
         return dict(self.parsed.items(namespace))
+
+
+# Headers are matched as ConfigParser matches them: the name extends to the
+# last ']' on the line and any text after it, such as a comment, is ignored.
+SECTION = re.compile(br"^\[(.+)\].*$", re.MULTILINE)
+DEFAULT = "DEFAULT"
+
+
+def index(buffer):
+    """Find the byte range of every section in an INI buffer.
+
+    Args:
+        buffer: A bytes-like object, such as mmap.mmap, with the INI content.
+
+    Returns:
+        collections.OrderedDict: A mapping of section name to a list of
+            (start, end) spans in the order the sections appear. A section
+            may appear more than once.
+    """
+    sections = collections.OrderedDict()
+    previous = None
+    for match in SECTION.finditer(buffer):
+
+        if previous is not None:
+
+            sections[previous[0]][-1] = (previous[1], match.start())
+
+        name = match.group(1).decode("utf8")
+        sections.setdefault(name, []).append(None)
+        previous = (name, match.start())
+
+    if previous is not None:
+
+        sections[previous[0]][-1] = (previous[1], len(buffer))
+
+    return sections
+
+
+class IniMapFile(IniFile):
+
+    """Configuration file parser which lazily parses INI sections.
+
+    The file is memory mapped and scanned once for section headers. Only the
+    sections which are requested, along with the DEFAULT section, are decoded
+    and parsed. Use this loader for large shared files which mostly contain
+    sections the process does not use. For example:
+
+        parser.FILE_TYPES["ini"] = ini.IniMapFile
+
+    Any text before the first section header is ignored rather than rejected.
+    The 'parsed', 'namespaces', and 'items' members still parse the whole
+    file for compatibility with other consumers.
+    """
+
+    def events(self, wanted=None):
+        """Get an iterable of the values within the config.
+
+        Args:
+            wanted (callable): An optional filter which is called with each
+                namespace name. Sections for which it returns False are
+                skipped without being parsed.
+
+        Returns:
+            iterable: Three-tuples of namespace, option, and raw value in the
+                order the sections appear in the file.
+        """
+        if self._parsed is not None:
+
+            for event in super(IniMapFile, self).events(wanted):
+
+                yield event
+
+            return
+
+        with open(self.path, "rb") as file_handle:
+
+            if not os.fstat(file_handle.fileno()).st_size:
+
+                return
+
+            buffer = mmap.mmap(
+                file_handle.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        try:
+
+            sections = index(buffer)
+            defaults = self._text(buffer, sections.pop(DEFAULT, ()))
+            for name, spans in sections.items():
+
+                if wanted is not None and not wanted(name):
+
+                    continue
+
+                parsed = iniparser.ConfigParser()
+                parsed.read_file(
+                    io.StringIO(defaults + self._text(buffer, spans))
+                )
+                for item, value in parsed.items(name):
+
+                    yield name, item, value
+
+        finally:
+
+            buffer.close()
+
+    @staticmethod
+    def _text(buffer, spans):
+        """Decode the given spans of a buffer."""
+        return "".join(
+            buffer[start:end].decode("utf8") + "\n" for start, end in spans
+        )
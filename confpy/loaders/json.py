@@ -5,7 +5,9 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import io
 import json
+import re
 
 from . import base
 
@@ -14,21 +16,14 @@ class JsonFile(base.ConfigurationFile):
 
     """Configuration file parser for JSON style files."""
 
-    def __init__(self, *args, **kwargs):
-        super(JsonFile, self).__init__(*args, **kwargs)
-        self._parsed = None
+    @classmethod
+    def sniff(cls, head):
+        """Check if the file starts with a JSON object."""
+        return head.lstrip()[:1] == b"{"
 
-    @property
-    def parsed(self):
-        """Get the JSON dictionary object which represents the content.
-
-        This property is cached and only parses the content once.
-        """
-        if not self._parsed:
-
-            self._parsed = json.loads(self.content)
-
-        return self._parsed
+    def _parse(self):
+        """Get the JSON dictionary object which represents the content."""
+        return json.loads(self.content)
 
     @property
     def namespaces(self):
@@ -37,4 +32,309 @@ class JsonFile(base.ConfigurationFile):
 
     def items(self, namespace):
         """Get a dictionary of entries under a given namespace."""
-        return self.parsed.copy().get(namespace, {})
+        return self.parsed.get(namespace, {})
+
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+# A run of text without brackets in which every string is complete.
+FILLER = re.compile(
+    r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.DOTALL
+)
+STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+SCALAR_END = re.compile(r"[,}\] \t\n\r]")
+
+
+class JsonStream(object):
+
+    """An incremental reader of JSON text from a file handle.
+
+    Text is read in chunks and only the portion of the document which has
+    not been consumed is kept in memory. Values may be skipped without being
+    decoded or kept in memory which only requires finding the end of the
+    value.
+    """
+
+    def __init__(self, handle, chunk_size=65536):
+        """Initialize the stream with a handle.
+
+        Args:
+            handle: A file-like object opened in text mode.
+            chunk_size (int): The smallest number of characters to read at a
+                time.
+        """
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._position = 0
+
+    def _fill(self, keep=None):
+        """Read more text and discard the text before a position.
+
+        Args:
+            keep (int): The position of the first character which must be
+                kept. The default is the current position. The current
+                position is shifted along with the text and may become
+                negative if it is before 'keep'.
+
+        Returns:
+            int or None: The number of characters removed from the front of
+                the buffer or None at the end of the file.
+
+        At least as many characters as are kept are read so that the buffer
+        at most doubles. A value which spans many chunks is then copied a
+        number of times which grows with the logarithm of its length rather
+        than once for every chunk.
+        """
+        if keep is None:
+
+            keep = self._position
+
+        chunk = self._handle.read(
+            max(self._chunk_size, len(self._buffer) - keep)
+        )
+        if not chunk:
+
+            return None
+
+        self._buffer = self._buffer[keep:] + chunk
+        self._position -= keep
+        return keep
+
+    def _require(self, keep=None):
+        """Read more text and raise if at the end of the file."""
+        shift = self._fill(keep)
+        if shift is None:
+
+            raise ValueError("Unexpected end of JSON document.")
+
+        return shift
+
+    def peek(self):
+        """Skip whitespace and get the next character.
+
+        Returns:
+            str: The next character or an empty string at the end of the file.
+        """
+        while True:
+
+            self._position = WHITESPACE.match(
+                self._buffer, self._position
+            ).end()
+            if self._position < len(self._buffer):
+
+                return self._buffer[self._position]
+
+            if self._fill() is None:
+
+                return ""
+
+    def expect(self, characters):
+        """Consume the next character if it is one of the given characters.
+
+        Args:
+            characters (str): The acceptable characters.
+
+        Returns:
+            str: The character consumed.
+
+        Raises:
+            ValueError: If the next character is not acceptable.
+        """
+        character = self.peek()
+        if not character or character not in characters:
+
+            raise ValueError(
+                "Expected one of {0} but found {1!r}.".format(
+                    tuple(characters), character
+                )
+            )
+
+        self._position += 1
+        return character
+
+    def _end(self, keep=True):
+        """Find the end of the value at the current position.
+
+        Args:
+            keep (bool): Whether or not the text of the value must stay in
+                the buffer. If not, text is discarded as it is scanned and
+                the current position is left undefined.
+
+        Returns:
+            int: The buffer position immediately after the value.
+        """
+        character = self.peek()
+        if character == '"':
+
+            position = self._position + 1
+            match = STRING_END.match(self._buffer, position)
+            while match is None:
+
+                position -= self._require(None if keep else position)
+                match = STRING_END.match(self._buffer, position)
+
+            return match.end()
+
+        if character not in ("[", "{"):
+
+            position = self._position
+            while True:
+
+                match = SCALAR_END.search(self._buffer, position)
+                if match is not None:
+
+                    return match.start()
+
+                position = len(self._buffer)
+                shift = self._fill(None if keep else position)
+                if shift is None:
+
+                    return len(self._buffer)
+
+                position -= shift
+
+        # Strings and other text between brackets are matched by FILLER so
+        # only brackets are counted one at a time. FILLER stops before a
+        # string which is not yet complete.
+        position = self._position
+        depth = 0
+        while True:
+
+            position = FILLER.match(self._buffer, position).end()
+            if position == len(self._buffer) or (
+                self._buffer[position] == '"'
+            ):
+
+                position -= self._require(None if keep else position)
+                continue
+
+            if self._buffer[position] in "[{":
+
+                depth += 1
+
+            else:
+
+                depth -= 1
+
+            position += 1
+            if depth == 0:
+
+                return position
+
+    def skip(self):
+        """Consume the next value without decoding or keeping it."""
+        self._position = self._end(keep=False)
+
+    def decode(self):
+        """Consume and decode the next value.
+
+        Returns:
+            object: The decoded value.
+
+        Raises:
+            ValueError: If the value is not valid JSON.
+        """
+        end = self._end()
+        text = self._buffer[self._position:end]
+        self._position = end
+        return json.loads(text)
+
+
+class JsonStreamFile(JsonFile):
+
+    """Configuration file parser which streams JSON files.
+
+    The file is read incrementally and each option value is decoded and
+    applied as it is found. Namespaces which are not registered are skipped
+    without being decoded. Memory use is bounded by the largest value which
+    is decoded rather than by the size of the file but loading takes longer
+    than with JsonFile, which decodes the file in C. Use this loader for
+    large files which mostly contain namespaces the process does not use
+    when memory matters more than load time. See benchmarks/bench_json.py.
+    For example:
+
+        parser.FILE_TYPES["json"] = json.JsonStreamFile
+
+    The 'parsed', 'namespaces', and 'items' members still decode the whole
+    file for compatibility with other consumers.
+    """
+
+    CHUNK_SIZE = 65536
+
+    def _open(self):
+        """Open the file for reading."""
+        return io.open(self.path, "r", encoding="utf8")
+
+    def events(self, wanted=None):
+        """Get an iterable of the values within the config.
+
+        Args:
+            wanted (callable): An optional filter which is called with each
+                namespace name. Namespaces for which it returns False are
+                skipped without being decoded.
+
+        Returns:
+            iterable: Three-tuples of namespace, option, and decoded value in
+                the order they appear in the file.
+
+        Raises:
+            ValueError: If the file is not valid JSON or a namespace is not an
+                object.
+        """
+        if self._parsed is not None:
+
+            for event in super(JsonStreamFile, self).events(wanted):
+
+                yield event
+
+            return
+
+        with self._open() as handle:
+
+            stream = JsonStream(handle, chunk_size=self.CHUNK_SIZE)
+            stream.expect("{")
+            if stream.peek() == "}":
+
+                return
+
+            while True:
+
+                namespace = stream.decode()
+                stream.expect(":")
+                if wanted is not None and not wanted(namespace):
+
+                    stream.skip()
+
+                else:
+
+                    for item, value in self._options(stream, namespace):
+
+                        yield namespace, item, value
+
+                if stream.expect(",}") == "}":
+
+                    return
+
+    @staticmethod
+    def _options(stream, namespace):
+        """Get an iterable of option names and values for a namespace."""
+        if stream.peek() != "{":
+
+            raise ValueError(
+                "The namespace {0} is not an object.".format(namespace)
+            )
+
+        stream.expect("{")
+        if stream.peek() == "}":
+
+            stream.expect("}")
+            return
+
+        while True:
+
+            item = stream.decode()
+            stream.expect(":")
+            yield item, stream.decode()
+            if stream.expect(",}") == "}":
+
+                return
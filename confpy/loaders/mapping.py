@@ -0,0 +1,44 @@
+"""Loader for values which are already in memory."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from . import base
+
+
+class MappingFile(base.ConfigurationFile):
+
+    """Configuration source for a dictionary of namespaces.
+
+    The values are a dictionary of namespace name to a dictionary of option
+    name and value. This is useful for sources which are not files such as
+    remote services. The path is only used to identify the source.
+    """
+
+    def __init__(self, values, path="<mapping>", strict=True, lazy=False):
+        """Initialize the source with its values.
+
+        Args:
+            values (dict): A mapping of namespace name to a mapping of option
+                name to raw value.
+            path (str): A name which identifies the source.
+            strict (bool): Whether or not unregistered values raise exceptions.
+            lazy (bool): Whether or not values are coerced when first read.
+        """
+        super(MappingFile, self).__init__(path=path, strict=strict, lazy=lazy)
+        self._parsed = values
+
+    def _parse(self):
+        """Get the values given at initialization."""
+        return self._parsed
+
+    @property
+    def namespaces(self):
+        """Get an iterable of str representing namespaces within the config."""
+        return self.parsed.keys()
+
+    def items(self, namespace):
+        """Get a dictionary of entries under a given namespace."""
+        return self.parsed.get(namespace, {})
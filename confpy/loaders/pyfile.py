@@ -5,6 +5,7 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+from .. import instrument
 from ..core import config
 from . import base
 
@@ -18,26 +19,26 @@ class PythonFile(base.ConfigurationFile):
     singleton.
     """
 
-    def __init__(self, *args, **kwargs):
-        super(PythonFile, self).__init__(*args, **kwargs)
-        self._parsed = None
+    # Code objects cannot be pickled.
+    transferable = False
 
-    @property
-    def parsed(self):
-        """Get the code object which represents the compiled Python file.
-
-        This property is cached and only parses the content once.
-        """
-        if not self._parsed:
-
-            self._parsed = compile(self.content, self.path, "exec")
-
-        return self._parsed
+    def _parse(self):
+        """Get the code object which represents the compiled Python file."""
+        return compile(self.content, self.path, "exec")
 
     @property
     def config(self):
         """Get a Configuration object from the file contents."""
-        exec(self.parsed, {}, None)
+        hook = instrument.ACTIVE
+        if hook is None:
+
+            exec(self.parsed, {}, None)
+            return config.Configuration()
+
+        code = self.parsed
+        start = instrument.clock()
+        exec(code, {}, None)
+        hook.file(self, "exec", instrument.clock() - start)
         return config.Configuration()
 
     @property
@@ -0,0 +1,322 @@
+"""A registry of loaders which are imported on first use."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import itertools
+import os
+
+from ..core import compat
+
+# The entry point group in which installed distributions advertise loaders.
+# The name of each entry point is the file extension it loads, for example:
+#
+#   entry_points={"confpy.loaders": ["yaml = confpy_yaml:YamlFile"]}
+ENTRY_POINT_GROUP = "confpy.loaders"
+
+# The number of bytes read from a file to detect its format.
+SNIFF_SIZE = 1024
+
+
+def resolve(reference):
+    """Import the object named by a 'module:attribute' reference.
+
+    Args:
+        reference (str): The absolute module path and attribute name separated
+            by a colon such as 'confpy.loaders.ini:IniFile'.
+
+    Returns:
+        object: The attribute of the imported module.
+
+    Raises:
+        ImportError: If the module or attribute does not exist.
+    """
+    module_name, _, attribute = reference.partition(":")
+    module = __import__(str(module_name), fromlist=[str(attribute)])
+    try:
+
+        return getattr(module, attribute)
+
+    except AttributeError:
+
+        raise ImportError(
+            "Cannot import {0} from {1}.".format(attribute, module_name)
+        )
+
+
+def entry_points(group):
+    """Get the entry points advertised by installed distributions.
+
+    Args:
+        group (str): The entry point group to read.
+
+    Returns:
+        list: Pairs of entry point name and 'module:attribute' reference.
+            The list is empty if neither importlib.metadata nor
+            pkg_resources is available.
+    """
+    try:
+
+        from importlib import metadata
+
+    except ImportError:
+
+        metadata = None
+
+    if metadata is not None:
+
+        found = metadata.entry_points()
+        if hasattr(found, "select"):
+
+            found = found.select(group=group)
+
+        else:
+
+            found = found.get(group, ())
+
+        return [(point.name, point.value) for point in found]
+
+    try:
+
+        import pkg_resources
+
+    except ImportError:
+
+        return []
+
+    return [
+        (
+            point.name,
+            "{0}:{1}".format(point.module_name, ".".join(point.attrs)),
+        )
+        for point in pkg_resources.iter_entry_points(group)
+    ]
+
+
+def head(path, size=SNIFF_SIZE):
+    """Get the first bytes of a file or nothing if it cannot be read."""
+    try:
+
+        with open(path, "rb") as file_handle:
+
+            return file_handle.read(size)
+
+    except (IOError, OSError):
+
+        return b""
+
+
+class LoaderRegistry(object):
+
+    """A mapping of file extension to ConfigurationFile subclass.
+
+    Loaders may be registered as classes or as 'module:attribute' references
+    and several may be registered for one extension. A reference is only
+    imported, along with any parsing library it uses, the first time its
+    extension is looked up. The loader used is the one with the highest
+    priority which can be imported so that an optional, faster parser is
+    picked when it is installed and the standard library parser otherwise.
+    The priority is the one given at registration or the 'priority' attribute
+    of the loader class.
+
+    When a group is given the loaders advertised as entry points in that
+    group are added the first time an extension without a registered loader
+    is looked up, the registry is listed, or 'discover' is called. Reading
+    entry points scans every installed distribution so looking up a
+    registered extension does not read them. Call 'discover' to also let
+    entry points compete with the loaders of registered extensions.
+    Assigning a loader to an extension with 'registry[extension] = loader'
+    replaces every candidate, including entry points, for that extension.
+    """
+
+    def __init__(self, loaders=None, group=None):
+        """Initialize the registry.
+
+        Args:
+            loaders (dict): An optional mapping of extension to a loader class
+                or reference.
+            group (str): An optional entry point group to discover loaders
+                from. Entry points are not read if not given.
+        """
+        self._candidates = {}
+        self._resolved = {}
+        self._pinned = set()
+        self._group = group
+        self._discovered = group is None
+        self._order = itertools.count()
+        for extension, loader in compat.iteritems(loaders or {}):
+
+            self.register(extension, loader)
+
+    def discover(self):
+        """Add the loaders advertised as entry points if not already added."""
+        if self._discovered:
+
+            return
+
+        self._discovered = True
+        for extension, reference in entry_points(self._group):
+
+            if extension not in self._pinned:
+
+                self.register(extension, reference)
+
+    def register(self, extension, loader, priority=None):
+        """Add a candidate loader for an extension.
+
+        Args:
+            extension (str): The file extension without a leading dot.
+            loader: A ConfigurationFile subclass or a 'module:attribute'
+                reference to one.
+            priority (int): An optional priority which overrides the
+                'priority' attribute of the loader class. Of two candidates
+                with the same priority the one registered last is preferred.
+        """
+        self._candidates.setdefault(extension, []).append(
+            (loader, priority, next(self._order))
+        )
+        self._resolved.pop(extension, None)
+
+    def candidates(self, extension):
+        """Get the loaders of an extension which can be imported.
+
+        Args:
+            extension (str): The file extension without a leading dot.
+
+        Returns:
+            list: The loader classes ordered from most to least preferred.
+        """
+        if extension not in self._candidates:
+
+            self.discover()
+
+        available = []
+        for loader, priority, order in self._candidates.get(extension, ()):
+
+            if isinstance(loader, compat.basestring):
+
+                try:
+
+                    loader = resolve(loader)
+
+                except ImportError:
+
+                    continue
+
+            if priority is None:
+
+                priority = getattr(loader, "priority", 0)
+
+            available.append((priority, order, loader))
+
+        available.sort(key=lambda candidate: candidate[:2], reverse=True)
+        return [loader for _, _, loader in available]
+
+    def sniff(self, content):
+        """Get the preferred loader which recognizes the start of a file.
+
+        Args:
+            content (bytes): The first bytes of a file.
+
+        Returns:
+            type or None: The loader class with the highest 'priority'
+                attribute which recognizes the content or None. Every
+                registered loader is imported.
+        """
+        best = None
+        for extension in self.keys():
+
+            for loader in self.candidates(extension):
+
+                if best is not None and loader.priority <= best.priority:
+
+                    continue
+
+                if loader.sniff(content):
+
+                    best = loader
+
+        return best
+
+    def loader_for(self, path):
+        """Get the loader for a file from its extension or its content.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            type or None: The loader registered for the extension of the path
+                or, if there is none, the loader which recognizes the first
+                bytes of the file. None if neither finds a loader.
+        """
+        extension = os.path.splitext(path)[1][1:]
+        loader = self.get(extension)
+        if loader is None:
+
+            loader = self.sniff(head(path))
+
+        return loader
+
+    def __getitem__(self, extension):
+        """Get the preferred loader of an extension, importing it if needed.
+
+        Raises:
+            KeyError: If no loader for the extension can be imported.
+        """
+        loader = self._resolved.get(extension)
+        if loader is None:
+
+            candidates = self.candidates(extension)
+            if not candidates:
+
+                raise KeyError(extension)
+
+            loader = self._resolved[extension] = candidates[0]
+
+        return loader
+
+    def get(self, extension, default=None):
+        """Get the preferred loader of an extension or a default."""
+        try:
+
+            return self[extension]
+
+        except KeyError:
+
+            return default
+
+    def __setitem__(self, extension, loader):
+        """Replace every candidate of an extension with a single loader."""
+        self._pinned.add(extension)
+        self._candidates.pop(extension, None)
+        self.register(extension, loader)
+
+    def __delitem__(self, extension):
+        """Remove every candidate of an extension."""
+        self.discover()
+        del self._candidates[extension]
+        self._resolved.pop(extension, None)
+
+    def __contains__(self, extension):
+        """Check if an extension has a loader without importing it."""
+        if extension not in self._candidates:
+
+            self.discover()
+
+        return extension in self._candidates
+
+    def __iter__(self):
+        """Iterate over the registered extensions."""
+        return iter(self.keys())
+
+    def __len__(self):
+        """Get the number of registered extensions."""
+        self.discover()
+        return len(self._candidates)
+
+    def keys(self):
+        """Get the registered extensions in sorted order."""
+        self.discover()
+        return sorted(self._candidates)
@@ -0,0 +1,42 @@
+"""Loader for TOML format files.
+
+The standard library tomllib is used when available and the tomli package
+otherwise. Importing this module raises ImportError if neither is installed.
+"""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+try:
+
+    import tomllib
+
+except ImportError:
+
+    import tomli as tomllib
+
+from . import base
+
+
+class TomlFile(base.ConfigurationFile):
+
+    """Configuration file parser for TOML files.
+
+    Each table is a namespace. TOML files are not detected from their content
+    because a file of tables also looks like an INI file.
+    """
+
+    def _parse(self):
+        """Get the dictionary of tables which represents the content."""
+        return tomllib.loads(self.content)
+
+    @property
+    def namespaces(self):
+        """Get an iterable of str representing namespaces within the config."""
+        return self.parsed.keys()
+
+    def items(self, namespace):
+        """Get a dictionary of entries under a given namespace."""
+        return self.parsed.get(namespace, {})
@@ -12,6 +12,8 @@ class BoolOption(option.Option):
 
     """An option which represents a boolean value."""
 
+    __slots__ = ()
+
     def coerce(self, value):
         """Convert text values into boolean values.
 
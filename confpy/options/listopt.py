@@ -5,8 +5,6 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
-import copy
-
 from ..core import compat
 
 # Renaming option to opt so option can be used as the initializer option below
@@ -18,6 +16,8 @@ class ListOption(opt.Option):
 
     """An option which represents a list of option value."""
 
+    __slots__ = ("_option", "_default_value")
+
     def __init__(self, option=None, default=None, *args, **kwargs):
         """Initialize the option with an option type.
 
@@ -36,19 +36,28 @@ class ListOption(opt.Option):
 
         self._option = option
         self._default = default if default is not None else ()
-        self._value = self.coerce(self._default)
+        self._default_value = self.coerce(self._default)
+        self._value = self._default_value
+
+    def reset(self):
+        """Return the option to its coerced default value."""
+        super(ListOption, self).reset()
+        self._value = self._default_value
 
     def coerce(self, values):
-        """Convert an iterable of literals to an iterable of options.
+        """Convert an iterable of literals to a tuple of values.
+
+        Each element is converted with the 'cached_coerce' method of the
+        option given at initialization. The option itself is shared by all
+        elements and is never copied or modified.
 
         Args:
-            values (iterable or string): An iterable of raw values to convert
-            into options. If the value is a string is is assumed to be a
-            comma separated list and will be split before processing.
+            values (iterable or string): An iterable of raw values to convert.
+            If the value is a string is is assumed to be a comma separated
+            list and will be split before processing.
 
         Returns:
-            iterable: An iterable of option values initialized with the raw
-                values from `values`.
+            tuple: The coerced values from `values`.
 
         Raises:
             TypeError: If `values` is not iterable or string.
@@ -57,36 +66,35 @@ class ListOption(opt.Option):
         """
         if isinstance(values, compat.basestring):
 
-            values = tuple(value.strip() for value in values.split(","))
+            values = [value.strip() for value in values.split(",")]
 
-        # Create a list of options to store each value.
-        opt_iter = tuple(copy.deepcopy(self._option) for value in values)
-        for opt_obj, val in compat.zip(opt_iter, values):
-
-            opt_obj.__set__(None, val)
-
-        return opt_iter
+        return tuple(map(self._option.cached_coerce, values))
 
     def __get__(self, obj=None, objtype=None):
         """Get the current value of the option.
 
         Returns:
-            iterable: The iterable of values in the option.
+            tuple: The values in the option.
 
             If the value is unset, a default option is defined, and the
             option is not required then the default value will be returned.
+            The default value is coerced once at initialization.
 
         Raises:
             AttributeError: If the value is unset and required.
             TypeError: If the value is not iterable.
+            ValueError: If a deferred value cannot be coerced.
         """
+        if self.pending:
+
+            self.materialize()
+
         if self.required and self._value is None:
 
             raise AttributeError("Attempted to access an unset option.")
 
-        value = self._value
-        if not self.required and self._value is None:
+        if self._value is None:
 
-            value = self.coerce(self._default)
+            return self._default_value
 
-        return (val.__get__(None, None) for val in value)
+        return self._value
@@ -13,6 +13,8 @@ class IntegerOption(option.Option):
 
     """An option which represents an integer value."""
 
+    __slots__ = ()
+
     def coerce(self, value):
         """Convert text values into integer values.
 
@@ -37,6 +39,8 @@ class FloatOption(option.Option):
 
     """An option which represents a floating point value."""
 
+    __slots__ = ()
+
     def coerce(self, value):
         """Convert text values into float values.
 
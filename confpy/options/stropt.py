@@ -16,6 +16,8 @@ class StringOption(option.Option):
 
     """An option which represents a string value."""
 
+    __slots__ = ()
+
     def coerce(self, value):
         """Convert any value into a string value.
 
@@ -36,6 +38,8 @@ class PatternOption(option.Option):
 
     """A string option which is validated against a regex pattern."""
 
+    __slots__ = ("_pattern", "_re")
+
     def __init__(self, pattern=None, *args, **kwargs):
         """Initialize the option with a regex pattern.
 
@@ -62,6 +66,10 @@ class PatternOption(option.Option):
         """Get the pattern being used."""
         return self._pattern
 
+    def coercion_key(self, value):
+        """Get the coercion cache key which includes the pattern."""
+        return (type(self), self._pattern, value)
+
     def coerce(self, value):
         """Convert a value into a pattern matched string value.
 
@@ -98,11 +106,19 @@ class PatternOption(option.Option):
         be deep copied normally.
         """
         new_instance = type(self)(pattern=self._pattern)
-        for key, value in self.__dict__.items():
+        for cls in type(self).__mro__:
+
+            for key in getattr(cls, "__slots__", ()):
+
+                if key == "_re" or not hasattr(self, key):
+
+                    continue
 
-            if key == "_re":
+                value = copy.deepcopy(getattr(self, key), memo)
+                setattr(new_instance, key, value)
 
-                continue
+        # Subclasses which do not define slots store values in a dictionary.
+        for key, value in getattr(self, "__dict__", {}).items():
 
             new_instance.__dict__[key] = copy.deepcopy(value, memo)
 
@@ -5,32 +5,43 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
-import argparse
 import os
-import sys
 
 from . import exc
-from .loaders import ini
-from .loaders import json
-from .loaders import pyfile
-
-
-FILE_TYPES = {
-    "ini": ini.IniFile,
-    "json": json.JsonFile,
-    "py": pyfile.PythonFile,
-}
-
-
-def configfile_from_path(path, strict=True):
+from . import instrument
+from . import resolver
+from .core import compat
+from .core import config as conf
+from .loaders import base
+from .loaders import registry
+
+
+# Loaders are imported, along with their parsing libraries, the first time a
+# file of their type is loaded. Optional faster parsers have a higher priority
+# and are used when they can be imported. Loaders advertised by installed
+# distributions in the 'confpy.loaders' entry point group are added on first
+# use. See loaders.registry.LoaderRegistry.
+FILE_TYPES = registry.LoaderRegistry(group=registry.ENTRY_POINT_GROUP)
+FILE_TYPES.register("cfgb", "confpy.loaders.binary:BinaryFile")
+FILE_TYPES.register("ini", "confpy.loaders.ini:IniFile")
+FILE_TYPES.register("json", "confpy.loaders.json:JsonFile")
+FILE_TYPES.register("json", "confpy.loaders.fastjson:OrjsonFile")
+FILE_TYPES.register("py", "confpy.loaders.pyfile:PythonFile")
+FILE_TYPES.register("toml", "confpy.loaders.toml:TomlFile")
+
+
+def configfile_from_path(path, strict=True, lazy=False):
     """Get a ConfigFile object based on a file path.
 
     This method will inspect the file extension and return the appropriate
-    ConfigFile subclass initialized with the given path.
+    ConfigFile subclass initialized with the given path. If the extension is
+    not recognized the first bytes of the file are used to detect its format.
+    Python files are only loaded by extension.
 
     Args:
         path (str): The file path which represents the configuration file.
         strict (bool): Whether or not to parse the file in strict mode.
+        lazy (bool): Whether or not values are coerced when first read.
 
     Returns:
         confpy.loaders.base.ConfigurationFile: The subclass which is
@@ -39,26 +50,86 @@ def configfile_from_path(path, strict=True):
     Raises:
         UnrecognizedFileExtension: If there is no loader for the path.
     """
-    extension = path.split(".")[-1]
-    conf_type = FILE_TYPES.get(extension)
+    conf_type = FILE_TYPES.loader_for(path)
     if not conf_type:
 
+        extension = os.path.splitext(path)[1][1:]
         raise exc.UnrecognizedFileExtension(
             "Cannot parse file of type {0}. Choices are {1}.".format(
                 extension, FILE_TYPES.keys()
             )
         )
 
-    return conf_type(path=path, strict=strict)
+    return conf_type(path=path, strict=strict, lazy=lazy)
+
+
+def _source(path, strict=True, lazy=False):
+    """Get a loader for a path or the given source if it is a loader."""
+    if isinstance(path, base.ConfigurationFile):
+
+        return path
+
+    return configfile_from_path(path, strict=strict, lazy=lazy)
+
+
+def expand_paths(paths):
+    """Expand directories and glob patterns into configuration file paths.
+
+    Args:
+        paths (iter of str): File paths, directories, and glob patterns.
+
+    Returns:
+        list: The file paths in order. A directory is replaced by every
+            file within it which has a recognized extension and does not start
+            with a dot. A glob pattern which is not an existing path is
+            replaced by every matching path.
+            Both are sorted lexically so fragments such as '10-base.ini' and
+            '20-local.ini' are applied in the order of their names. Source
+            objects such as remote.RemoteSource are kept as they are.
+    """
+    expanded = []
+    for path in paths:
+
+        if isinstance(path, base.ConfigurationFile):
+
+            expanded.append(path)
+
+        elif os.path.isdir(path):
+
+            expanded.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if not name.startswith(".")
+                and os.path.splitext(name)[1][1:] in FILE_TYPES
+                and os.path.isfile(os.path.join(path, name))
+            )
+
+        elif any(character in path for character in "*?[") and not (
+            os.path.exists(path)
+        ):
+
+            import glob
+
+            expanded.extend(sorted(glob.glob(path)))
+
+        else:
 
+            expanded.append(path)
 
-def configuration_from_paths(paths, strict=True):
+    return expanded
+
+
+def configuration_from_paths(paths, strict=True, executor=None, lazy=False):
     """Get a Configuration object based on multiple file paths.
 
     Args:
         paths (iter of str): An iterable of file paths which identify config
             files on the system.
         strict (bool): Whether or not to parse the files in strict mode.
+        executor (concurrent.futures.Executor): An optional executor used to
+            read and parse all files at the same time. Values are still
+            applied in the order of the paths. See base.preload.
+        lazy (bool): Whether or not values are coerced when first read.
 
     Returns:
         confpy.core.config.Configuration: The loaded configuration object.
@@ -70,14 +141,19 @@ def configuration_from_paths(paths, strict=True):
             but resides under a valid namespace.
         UnrecognizedFileExtension: If there is no loader for a path.
     """
-    for path in paths:
+    loaders = base.preload(
+        (_source(path, strict, lazy) for path in paths), executor
+    )
+    for loader in loaders:
 
-        cfg = configfile_from_path(path, strict=strict).config
+        cfg = loader.config
 
     return cfg
 
 
-def set_environment_var_options(config, env=None, prefix="CONFPY"):
+def set_environment_var_options(
+    config, env=None, prefix="CONFPY", strict=False
+):
     """Set any configuration options which have an environment var set.
 
     Args:
@@ -87,29 +163,33 @@ def set_environment_var_options(config, env=None, prefix="CONFPY"):
             The default is os.environ if no value is given.
         prefix (str): The string prefix prepended to all environment variables.
             This value will be set to upper case. The default is CONFPY.
+        strict (bool): Whether or not variables which start with the prefix
+            but do not match an option raise an exception.
 
     Returns:
         confpy.core.config.Configuration: A configuration object with
             environment variables set.
 
+    Raises:
+        OptionNotRegistered: If 'strict' is set and a variable with the prefix
+            does not match an option.
+
     The pattern to follow when setting environment variables is:
 
         <PREFIX>_<SECTION>_<OPTION>
 
-    Each value should be upper case and separated by underscores.
+    Each value should be upper case and separated by underscores. The
+    environment is scanned once and matched against an index of variable
+    names. Variables which name an option of an AutoNamespace create the
+    option. Use resolver.Resolver.env_values to get the list of unmatched
+    variables without raising.
     """
-    env = env or os.environ
-    for section_name, section in config:
-
-        for option_name, _ in section:
-
-            var_name = "{0}_{1}_{2}".format(
-                prefix.upper(), section_name.upper(), option_name.upper()
-            )
-            env_var = env.get(var_name)
-            if env_var:
+    values, _ = resolver.Resolver(config, prefix).env_values(
+        env or os.environ, strict
+    )
+    for (section_name, option_name), value in compat.iteritems(values):
 
-                setattr(section, option_name, env_var)
+        config.get(section_name).set(option_name, value)
 
     return config
 
@@ -131,32 +211,18 @@ def set_cli_options(config, arguments=None):
 
         <section>_<option>
 
-    Each value should be lower case and separated by underscores.
+    Each value should be lower case and separated by underscores. The flag
+    parser is cached between calls with the same options. See
+    resolver.CliParser.
     """
-    arguments = arguments or sys.argv[1:]
-    parser = argparse.ArgumentParser()
-    for section_name, section in config:
+    table = resolver.Resolver(config)
+    cli = table.cli_values(arguments)
+    for entry in table.entries:
 
-        for option_name, _ in section:
+        value = cli.get(entry.cli_name)
+        if value:
 
-            var_name = "{0}_{1}".format(
-                section_name.lower(), option_name.lower()
-            )
-            parser.add_argument("--{0}".format(var_name))
-
-    args, _ = parser.parse_known_args(arguments)
-    args = vars(args)
-    for section_name, section in config:
-
-        for option_name, _ in section:
-
-            var_name = "{0}_{1}".format(
-                section_name.lower(), option_name.lower()
-            )
-            value = args.get(var_name)
-            if value:
-
-                setattr(section, option_name, value)
+            entry.section.set(entry.option_name, value)
 
     return config
 
@@ -173,13 +239,18 @@ def check_for_missing_options(config):
             configuration object.
 
     Required options with default values are considered set and will not cause
-    this function to raise.
+    this function to raise. Deferred values are considered set and are not
+    coerced.
     """
     for section_name, section in config:
 
         for option_name, option in section:
 
-            if option.required and option.value is None:
+            if (
+                option.required
+                and not option.pending
+                and option.value is None
+            ):
 
                 raise exc.MissingRequiredOption(
                     "Option {0} in namespace {1} is required.".format(
@@ -190,16 +261,36 @@ def check_for_missing_options(config):
     return config
 
 
-def parse_options(files, env_prefix="CONFPY", strict=True):
+@instrument.timed("parse_options")
+def parse_options(
+    files,
+    env_prefix="CONFPY",
+    strict=True,
+    cache_dir=None,
+    executor=None,
+    strict_env=False,
+    lazy=False,
+):
     """Parse configuration options and return a configuration object.
 
     Args:
         files (iter of str): File paths which identify configuration files.
             These files are processed in order with values in later files
-            overwriting values in earlier files.
+            overwriting values in earlier files. Directories and glob
+            patterns are expanded with expand_paths. ConfigurationFile
+            objects, such as remote.RemoteSource, may be given as well.
         env_prefix (str): The static prefix prepended to all options when set
             as environment variables. The default is CONFPY.
         strict (bool): Whether or not to parse the files in strict mode.
+        cache_dir (str): An optional directory used to store a snapshot of
+            the values loaded from the files. See cache.SnapshotCache.
+        executor (concurrent.futures.Executor): An optional executor used to
+            read and parse all files at the same time. See base.preload.
+        strict_env (bool): Whether or not environment variables which start
+            with the prefix but do not match an option raise an exception.
+        lazy (bool): Whether or not values are coerced the first time each
+            option is read rather than while loading. Invalid values then
+            raise on first read. See Configuration.validate_all.
 
     Returns:
         confpy.core.config.Configuration: The loaded configuration object.
@@ -209,14 +300,53 @@ def parse_options(files, env_prefix="CONFPY", strict=True):
         NamespaceNotRegistered: If a file contains a namespace which is not
             defined.
         OptionNotRegistered: If a file contains an option which is not defined
-            but resides under a valid namespace.
+            but resides under a valid namespace or 'strict_env' is set and an
+            environment variable does not match an option.
         UnrecognizedFileExtension: If there is no loader for a path.
+
+    The registered options are compiled into a resolver.Resolver so that file,
+    environment, and CLI values are merged and validated in a single pass.
+
+    When a cache directory is given the files are only loaded if there is no
+    snapshot which matches the current files and schema. Environment and CLI
+    values are always applied on top of the file values. Snapshots store
+    coerced values so file values are coerced while loading even if 'lazy'
+    is set.
     """
-    return check_for_missing_options(
-        config=set_cli_options(
-            config=set_environment_var_options(
-                config=configuration_from_paths(paths=files, strict=strict),
-                prefix=env_prefix,
-            )
+    files = tuple(expand_paths(files))
+    config = conf.Configuration()
+    # Snapshots are keyed by file fingerprints so they cannot be used with
+    # source objects.
+    if cache_dir is None or not all(
+        isinstance(path, compat.basestring) for path in files
+    ):
+
+        sources = base.preload(
+            (_source(path, strict) for path in files), executor
+        )
+        return resolver.Resolver(config, env_prefix).resolve(
+            sources, strict_env=strict_env, lazy=lazy
+        )
+
+    from . import cache
+
+    # The resolver is compiled after a snapshot is restored so that any
+    # options generated by an AutoNamespace are included in the table.
+    snapshots = cache.SnapshotCache(cache_dir)
+    if snapshots.restore(config, files, strict):
+
+        return resolver.Resolver(config, env_prefix).resolve(
+            strict_env=strict_env, lazy=lazy
+        )
+
+    # The schema key is computed before loading, as it is by restore, since
+    # loading may generate options.
+    schema = cache.schema_key(config)
+    table = resolver.Resolver(config, env_prefix)
+    table.load(
+        base.preload(
+            (configfile_from_path(path, strict) for path in files), executor
         )
     )
+    snapshots.store(table.loaded(), files, strict, schema)
+    return table.resolve(strict_env=strict_env, lazy=lazy)
@@ -0,0 +1,621 @@
+"""Live reloading of configuration files."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from . import diff
+from . import exc
+from . import parser
+from . import resolver
+from .core import compat
+from .core import config as conf
+from .core import namespace as ns
+from .loaders import base
+from .loaders import pyfile
+
+
+class PollingWatcher(object):
+
+    """Detect file changes by comparing fingerprints at an interval."""
+
+    def __init__(self, paths, interval=1.0):
+        """Record the current fingerprint of each file.
+
+        Args:
+            paths (iter of str): The file paths to watch.
+            interval (float): The number of seconds between checks when
+                waiting for a change.
+        """
+        self._interval = interval
+        self._fingerprints = dict(
+            (os.path.abspath(path), base.fingerprint(path)) for path in paths
+        )
+
+    def _scan(self):
+        """Get the paths whose fingerprint changed since the last scan."""
+        changed = set()
+        for path, signature in compat.iteritems(self._fingerprints):
+
+            current = base.fingerprint(path)
+            if current != signature:
+
+                self._fingerprints[path] = current
+                changed.add(path)
+
+        return changed
+
+    def changes(self, timeout=None):
+        """Wait for one or more files to change.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait. Wait
+                indefinitely if None. Check once and return if zero.
+
+        Returns:
+            set of str: The absolute paths of the files which changed.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+
+            changed = self._scan()
+            if changed:
+
+                return changed
+
+            delay = self._interval
+            if deadline is not None:
+
+                delay = min(delay, deadline - time.time())
+                if delay <= 0:
+
+                    return changed
+
+            time.sleep(delay)
+
+    def close(self):
+        """Release any resources held by the watcher."""
+
+
+class InotifyWatcher(object):
+
+    """Detect file changes with the Linux inotify API.
+
+    The parent directory of each file is watched so that files replaced with
+    a rename, as many editors and deployment tools do, are also detected.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    MASK = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+    )
+    EVENT = struct.Struct(str("iIII"))
+
+    def __init__(self, paths):
+        """Create an inotify instance which watches the given files.
+
+        Args:
+            paths (iter of str): The file paths to watch.
+
+        Raises:
+            OSError: If inotify is not available on the platform.
+        """
+        libc = self._libc()
+        self._paths = set(os.path.abspath(path) for path in paths)
+        self._fd = libc.inotify_init()
+        if self._fd < 0:
+
+            raise OSError(ctypes.get_errno(), "Could not initialize inotify.")
+
+        self._watches = {}
+        for directory in set(os.path.dirname(path) for path in self._paths):
+
+            watch = libc.inotify_add_watch(
+                self._fd,
+                directory.encode(sys.getfilesystemencoding()),
+                self.MASK,
+            )
+            if watch < 0:
+
+                error = ctypes.get_errno()
+                os.close(self._fd)
+                raise OSError(error, "Could not watch {0}.".format(directory))
+
+            self._watches[watch] = directory
+
+    @staticmethod
+    def _libc():
+        """Get the C library if it exposes the inotify API."""
+        if not sys.platform.startswith("linux"):
+
+            raise OSError("The inotify API is only available on Linux.")
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init"):
+
+            raise OSError("The C library does not expose inotify.")
+
+        return libc
+
+    def changes(self, timeout=None):
+        """Wait for one or more files to change.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait. Wait
+                indefinitely if None. Check once and return if zero.
+
+        Returns:
+            set of str: The absolute paths of the files which changed.
+        """
+        changed = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        while readable:
+
+            data = os.read(self._fd, 65536)
+            offset = 0
+            while offset < len(data):
+
+                watch, _, _, length = self.EVENT.unpack_from(data, offset)
+                offset += self.EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                path = os.path.join(
+                    self._watches.get(watch, ""),
+                    name.decode(sys.getfilesystemencoding()),
+                )
+                if path in self._paths:
+
+                    changed.add(path)
+
+            # Drain any events queued while reading so that a burst of writes
+            # to a single file results in a single change.
+            readable, _, _ = select.select([self._fd], [], [], 0)
+
+        return changed
+
+    def close(self):
+        """Close the inotify file descriptor."""
+        os.close(self._fd)
+
+
+def watch(paths, interval=1.0):
+    """Get the best available file watcher for a set of paths.
+
+    Args:
+        paths (iter of str): The file paths to watch.
+        interval (float): The polling interval used if inotify is unavailable.
+
+    Returns:
+        InotifyWatcher or PollingWatcher: The file watcher.
+    """
+    paths = tuple(paths)
+    try:
+
+        return InotifyWatcher(paths)
+
+    except OSError:
+
+        return PollingWatcher(paths, interval=interval)
+
+
+class Reloader(object):
+
+    """Load configuration files into immutable snapshots and keep them fresh.
+
+    The files are loaded into a config.FrozenConfiguration which is available
+    from the 'current' property. When a file changes only that file is read
+    and parsed again. A new snapshot is then built from the raw values of all
+    files, the environment, and the CLI, and swapped in with a single
+    reference assignment. Readers holding a snapshot never see a partially
+    applied reload. The live Configuration objects are not modified.
+
+    Python files are executed once when the Reloader is created. Values which
+    are not set by any declarative file, environment variable, or CLI flag use
+    the value the option had once the Python files were executed, so a key
+    removed from a file returns to the value a Python file set rather than
+    to the declared default. Later changes to the live options and changes to
+    Python files are not reloaded.
+    """
+
+    def __init__(
+        self,
+        files,
+        env_prefix="CONFPY",
+        strict=True,
+        env=None,
+        arguments=None,
+        watcher=None,
+        interval=1.0,
+    ):
+        """Load the files and build the first snapshot.
+
+        Args:
+            files (iter of str): File paths which identify configuration files.
+                These files are processed in order with values in later files
+                overwriting values in earlier files.
+            env_prefix (str): The static prefix prepended to all options when
+                set as environment variables. The default is CONFPY.
+            strict (bool): Whether or not to parse the files in strict mode.
+            env (dict): Optional dictionary which contains environment
+                variables. The default is os.environ if no value is given.
+            arguments (iter of str): An iterable of strings which contains the
+                CLI arguments passed. If nothing is give then sys.argv is used.
+            watcher: An object with 'changes' and 'close' methods such as a
+                PollingWatcher. The default is the result of 'watch'.
+            interval (float): The number of seconds between change checks
+                when polling and when running in the background.
+
+        Raises:
+            MissingRequiredOption: If a required option is not defined.
+            NamespaceNotRegistered: If a file contains a namespace which is not
+                defined.
+            OptionNotRegistered: If a file contains an option which is not
+                defined but resides under a valid namespace.
+            UnrecognizedFileExtension: If there is no loader for a path.
+        """
+        self._strict = strict
+        self._env = env
+        self._arguments = arguments
+        self._interval = interval
+        self._config = conf.Configuration()
+        self._files = []
+        for path in files:
+
+            source = parser.configfile_from_path(path, strict)
+            if isinstance(source, pyfile.PythonFile):
+
+                source.config  # pylint: disable=pointless-statement
+                continue
+
+            self._files.append(os.path.abspath(path))
+
+        self._watcher = watcher
+        self._owns_watcher = watcher is None
+        if self._watcher is None:
+
+            self._watcher = watch(self._files, interval=interval)
+
+        self._table = resolver.Resolver(self._config, env_prefix)
+        self._baseline = dict(
+            (key, entry.option.__get__(entry.section))
+            for key, entry in compat.iteritems(self._table.table)
+        )
+        self._raw = {}
+        for path in self._files:
+
+            self._raw[path] = self._collect(path)
+
+        self._overrides = self._table.overrides(env, arguments)
+        self._entries = len(self._table.entries)
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._notifying = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._error = None
+        self._merged = self._merge(self._raw)
+        self._current = None
+        self._current = self._build(self._merged)
+
+    @property
+    def current(self):
+        """Get the most recent config.FrozenConfiguration."""
+        return self._current
+
+    @property
+    def error(self):
+        """Get the exception raised by the last failed background reload.
+
+        Errors raised by the watcher while waiting for changes are recorded
+        as well.
+        """
+        return self._error
+
+    def _collect(self, path):
+        """Read, parse, and collect the raw values of a file."""
+        return self._table.collect(
+            parser.configfile_from_path(path, self._strict)
+        )
+
+    def _merge(self, raw):
+        """Merge raw file values in order with the overrides."""
+        merged = {}
+        for path in self._files:
+
+            merged.update(raw[path])
+
+        merged.update(self._overrides)
+        return merged
+
+    def _value(self, entry, values):
+        """Get the value of an entry from coerced values or its baseline.
+
+        The baseline is the value of the option once the Python files were
+        executed. Options generated after that use their current value.
+        """
+        key = (entry.section_name, entry.option_name)
+        if key in values:
+
+            return values[key]
+
+        if key in self._baseline:
+
+            value = self._baseline[key]
+
+        else:
+
+            value = entry.option.__get__(entry.section)
+
+        if entry.option.required and value is None:
+
+            raise exc.MissingRequiredOption(
+                "Option {0} in namespace {1} is required.".format(
+                    entry.option_name, entry.section_name
+                )
+            )
+
+        return value
+
+    def _evolve(self, changes, merged):
+        """Apply a change set to the current snapshot.
+
+        Only the changed values are coerced and only the namespaces which
+        contain a change are copied.
+        """
+        if not changes.namespaces().issubset(
+            name for name, _ in self._current
+        ):
+
+            return self._build(merged)
+
+        values = diff.coerce(changes, self._table.table)
+        namespaces = {}
+        for change in changes:
+
+            entry = self._table.table[(change.namespace, change.option)]
+            namespaces.setdefault(change.namespace, {})[
+                change.option
+            ] = self._value(entry, values)
+
+        return self._current.evolve(namespaces)
+
+    def _build(self, merged):
+        """Build a frozen configuration from merged raw values."""
+        namespaces = dict((name, {}) for name, _ in self._config)
+        for entry in self._table.entries:
+
+            key = (entry.section_name, entry.option_name)
+            if key in merged:
+
+                value = entry.option.cached_coerce(merged[key])
+
+            else:
+
+                value = self._value(entry, {})
+
+            namespaces[entry.section_name][entry.option_name] = value
+
+        # Namespaces which did not change are shared with the previous
+        # snapshot so that readers can compare them by identity.
+        previous = self._current
+        frozen = {}
+        for name, values in compat.iteritems(namespaces):
+
+            section = ns.FrozenNamespace.from_values(
+                values, self._config.get(name).description
+            )
+            if previous is not None and previous.get(name) == section:
+
+                section = previous.get(name)
+
+            frozen[name] = section
+
+        return conf.FrozenConfiguration.from_namespaces(frozen)
+
+    def subscribe(self, callback, namespace=None, option=None):
+        """Register a callback which is called when values change.
+
+        Args:
+            callback (callable): Called with the namespace name, option name,
+                old value, and new value of each changed option.
+            namespace (str): Only call for changes within this namespace.
+            option (str): Only call for changes to this option. Requires the
+                namespace to be given.
+
+        Callbacks are called by the thread which reloads after the new
+        snapshot is published. Reloads deliver their callbacks one at a time
+        and in the order their snapshots were published, so a reload waits
+        for the callbacks of the previous reload to return.
+        """
+        if option is not None and namespace is None:
+
+            raise ValueError("An option subscription requires a namespace.")
+
+        self._subscribers.setdefault((namespace, option), []).append(callback)
+
+    def _notify(self, old, new, changes):
+        """Call the subscribers of each option which changed value."""
+        for change in changes:
+
+            section_name, option_name = change.namespace, change.option
+            old_section = old.get(section_name)
+            section = new.get(section_name)
+            if old_section is section:
+
+                continue
+
+            previous = None
+            if old_section is not None:
+
+                previous = old_section.get(option_name)
+
+            value = section.get(option_name)
+            if previous == value:
+
+                continue
+
+            for key in (
+                (section_name, option_name),
+                (section_name, None),
+                (None, None),
+            ):
+
+                for callback in self._subscribers.get(key, ()):
+
+                    callback(section_name, option_name, previous, value)
+
+    def reload(self, paths=None):
+        """Re-read changed files and publish a new snapshot.
+
+        Args:
+            paths (iter of str): The files which changed. All files are read
+                again if not given. Paths which are not declarative files
+                given at initialization are ignored.
+
+        Returns:
+            config.FrozenConfiguration: The new snapshot.
+
+        Raises:
+            MissingRequiredOption: If a required option is no longer defined.
+            NamespaceNotRegistered: If a file contains a namespace which is not
+                defined.
+            OptionNotRegistered: If a file contains an option which is not
+                defined but resides under a valid namespace.
+
+        The current snapshot is unchanged if an exception is raised.
+        """
+        with self._notifying:
+
+            with self._lock:
+
+                old, new, changes = self._swap(paths)
+
+            self._notify(old, new, changes)
+
+        return new
+
+    def _swap(self, paths):
+        """Publish a snapshot of the changed files. The lock must be held.
+
+        Returns:
+            tuple: The old snapshot, the new snapshot, and the ChangeSet.
+        """
+        paths = self._files if paths is None else paths
+        raw = dict(self._raw)
+        for path in set(os.path.abspath(path) for path in paths):
+
+            if path in raw:
+
+                raw[path] = self._collect(path)
+
+        # Files may generate new options within an AutoNamespace which
+        # need their environment and CLI values looked up.
+        if len(self._table.entries) != self._entries:
+
+            self._overrides = self._table.overrides(
+                self._env, self._arguments
+            )
+            self._entries = len(self._table.entries)
+
+        merged = self._merge(raw)
+        changes = diff.diff(self._merged, merged)
+        new = self._evolve(changes, merged)
+        old, self._current = self._current, new
+        self._raw, self._merged = raw, merged
+
+        return old, new, changes
+
+    def check(self):
+        """Reload if any file changed without waiting.
+
+        Returns:
+            bool: True if a file changed and a new snapshot was published.
+        """
+        if self._watcher is None:
+
+            self._watcher = watch(self._files, interval=self._interval)
+
+        changed = self._watcher.changes(timeout=0)
+        if changed:
+
+            self.reload(changed)
+
+        return bool(changed)
+
+    def _run(self):
+        """Wait for changes and reload until stopped."""
+        while not self._stopped.is_set():
+
+            try:
+
+                changed = self._watcher.changes(timeout=self._interval)
+                if not changed or self._stopped.is_set():
+
+                    continue
+
+                self.reload(changed)
+                self._error = None
+
+            except Exception as error:  # pylint: disable=broad-except
+
+                self._error = error
+                # A watcher which keeps failing is not polled in a busy loop.
+                self._stopped.wait(self._interval)
+
+    def start(self):
+        """Watch the files and reload in a background thread.
+
+        A watcher created by the Reloader is created again if 'stop' closed
+        it. A watcher given at initialization is reused.
+        """
+        if self._thread is not None:
+
+            return
+
+        if self._watcher is None:
+
+            self._watcher = watch(self._files, interval=self._interval)
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and release the file watcher.
+
+        Only a watcher created by the Reloader is closed. A watcher given at
+        initialization belongs to the caller which must close it.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+
+            self._thread.join()
+            self._thread = None
+
+        if self._owns_watcher and self._watcher is not None:
+
+            self._watcher.close()
+            self._watcher = None
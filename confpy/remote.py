@@ -0,0 +1,488 @@
+"""Configuration sources backed by remote key-value stores."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import socket
+import threading
+import time
+
+from . import exc
+from .core import compat
+from .core import config as conf
+from .loaders import base
+
+try:
+
+    import httplib as http_client
+    from urlparse import urlsplit
+
+except ImportError:
+
+    import http.client as http_client
+    from urllib.parse import urlsplit
+
+
+_ABSENT = object()
+_clock = getattr(time, "monotonic", time.time)
+
+
+class TTLCache(object):
+
+    """A cache of remote values which expire after a number of seconds.
+
+    Keys which the remote store does not contain are cached as well so that
+    missing keys do not cause a request on every load.
+    """
+
+    def __init__(self, ttl=30.0, clock=_clock):
+        """Initialize an empty cache.
+
+        Args:
+            ttl (float): The number of seconds an entry is valid for.
+            clock (callable): A function which returns the current time in
+                seconds.
+        """
+        self._ttl = ttl
+        self._clock = clock
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """Look up many keys at once.
+
+        Args:
+            keys (iter of str): The keys to look up.
+
+        Returns:
+            tuple: A dictionary of the cached values which exist remotely and
+                a list of the keys which are not cached or have expired.
+        """
+        now = self._clock()
+        found = {}
+        missing = []
+        for key in keys:
+
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+
+                missing.append(key)
+                continue
+
+            if entry[1] is not _ABSENT:
+
+                found[key] = entry[1]
+
+        return found, missing
+
+    def set_many(self, keys, values):
+        """Record the result of fetching keys.
+
+        Args:
+            keys (iter of str): Every key which was fetched.
+            values (dict): The values of the fetched keys which exist.
+        """
+        expires = self._clock() + self._ttl
+        with self._lock:
+
+            for key in keys:
+
+                self._entries[key] = (expires, values.get(key, _ABSENT))
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+
+            self._entries.clear()
+
+    def __len__(self):
+        """Get the number of cached entries including expired entries."""
+        return len(self._entries)
+
+
+class ConnectionPool(object):
+
+    """A pool of persistent HTTP connections to one host."""
+
+    def __init__(self, url, size=4, timeout=5.0):
+        """Initialize an empty pool.
+
+        Args:
+            url (str): A URL which identifies the scheme, host, and port.
+            size (int): The maximum number of idle connections kept open.
+            timeout (float): The socket timeout of new connections.
+        """
+        parts = urlsplit(url)
+        self._factory = (
+            http_client.HTTPSConnection
+            if parts.scheme == "https"
+            else http_client.HTTPConnection
+        )
+        self._host = parts.hostname
+        self._port = parts.port
+        self._size = size
+        self._timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        self._created = 0
+
+    @property
+    def created(self):
+        """Get the number of connections opened by the pool."""
+        return self._created
+
+    def acquire(self):
+        """Get an idle connection or open a new one."""
+        with self._lock:
+
+            if self._idle:
+
+                return self._idle.pop(), True
+
+            self._created += 1
+
+        return (
+            self._factory(self._host, self._port, timeout=self._timeout),
+            False,
+        )
+
+    def release(self, connection):
+        """Return a healthy connection to the pool."""
+        with self._lock:
+
+            if len(self._idle) < self._size:
+
+                self._idle.append(connection)
+                return
+
+        connection.close()
+
+    def request(self, method, path, body=None, headers=None):
+        """Send a request on a pooled connection.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The request path including any query string.
+            body (bytes): An optional request body.
+            headers (dict): Optional request headers.
+
+        Returns:
+            tuple: The response status and body.
+
+        A request which fails on an idle connection, which the server may have
+        closed, is retried on another connection.
+        """
+        while True:
+
+            connection, reused = self.acquire()
+            try:
+
+                connection.request(method, path, body, headers or {})
+                response = connection.getresponse()
+                content = response.read()
+
+            except (http_client.HTTPException, socket.error):
+
+                connection.close()
+                if reused:
+
+                    continue
+
+                raise
+
+            if response.getheader("connection", "").lower() == "close":
+
+                connection.close()
+
+            else:
+
+                self.release(connection)
+
+            return response.status, content
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+
+            idle, self._idle = self._idle, []
+
+        for connection in idle:
+
+            connection.close()
+
+
+class Backend(object):
+
+    """Base class for remote key-value stores."""
+
+    def fetch(self, keys):
+        """Fetch the values of many keys.
+
+        Args:
+            keys (list of str): The keys to fetch.
+
+        Returns:
+            dict: The raw values of the keys which exist.
+
+        Raises:
+            RemoteSourceError: If the store cannot be reached.
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class HttpBackend(Backend):
+
+    """A key-value store which accepts batches of keys over HTTP.
+
+    Every fetch is a single request on a pooled, persistent connection. By
+    default the keys are sent as a JSON object of the form {"keys": [...]} in
+    a POST to the URL and the response must be a JSON object of the form
+    {"values": {key: value}}. Override 'request' and 'decode' to adapt to
+    other APIs such as a prefix listing.
+    """
+
+    def __init__(self, url, timeout=5.0, pool_size=4, headers=None):
+        """Initialize the backend.
+
+        Args:
+            url (str): The URL of the batch endpoint.
+            timeout (float): The socket timeout in seconds.
+            pool_size (int): The maximum number of idle connections kept open.
+            headers (dict): Additional headers sent with every request.
+        """
+        parts = urlsplit(url)
+        self._path = parts.path or "/"
+        if parts.query:
+
+            self._path = "{0}?{1}".format(self._path, parts.query)
+
+        self._headers = dict(headers or {})
+        self._pool = ConnectionPool(url, size=pool_size, timeout=timeout)
+
+    @property
+    def pool(self):
+        """Get the connection pool."""
+        return self._pool
+
+    def request(self, keys):
+        """Build the request which fetches a batch of keys.
+
+        Args:
+            keys (list of str): The keys to fetch.
+
+        Returns:
+            tuple: The method, path, body, and headers of the request.
+        """
+        headers = {"Content-Type": "application/json"}
+        headers.update(self._headers)
+        body = json.dumps({"keys": keys}).encode("utf8")
+        return "POST", self._path, body, headers
+
+    def decode(self, content, keys):
+        """Get the values of a batch of keys from a response body.
+
+        Args:
+            content (bytes): The response body.
+            keys (list of str): The keys which were requested.
+
+        Returns:
+            dict: The raw values of the keys which exist.
+        """
+        values = json.loads(content.decode("utf8")).get("values") or {}
+        return dict((key, values[key]) for key in keys if key in values)
+
+    def fetch(self, keys):
+        """Fetch the values of many keys in one request."""
+        if not keys:
+
+            return {}
+
+        method, path, body, headers = self.request(keys)
+        try:
+
+            status, content = self._pool.request(method, path, body, headers)
+
+        except (http_client.HTTPException, socket.error) as error:
+
+            raise exc.RemoteSourceError(
+                "Failed to fetch configuration: {0}".format(error)
+            )
+
+        if status >= 400:
+
+            raise exc.RemoteSourceError(
+                "Failed to fetch configuration: HTTP {0}".format(status)
+            )
+
+        try:
+
+            return self.decode(content, keys)
+
+        except ValueError as error:
+
+            raise exc.RemoteSourceError(
+                "Invalid configuration response: {0}".format(error)
+            )
+
+    def close(self):
+        """Close all pooled connections."""
+        self._pool.close()
+
+
+class RemoteSource(base.ConfigurationFile):
+
+    """Configuration source for options stored in a remote backend.
+
+    Every registered option is mapped to a key such as 'namespace/option' and
+    all keys which are not cached are fetched from the backend in one batch.
+    Results, including keys which do not exist, are cached for 'ttl' seconds
+    so a source which is reused across loads only contacts the backend when
+    entries expire. Only registered options are requested so unregistered
+    values never reach the loader.
+
+    Instances may be passed to parser.parse_options with file paths.
+    """
+
+    # Connection pools and locks cannot be pickled.
+    transferable = False
+
+    def __init__(
+        self,
+        backend,
+        prefix="",
+        separator="/",
+        ttl=30.0,
+        strict=True,
+        cache=None,
+        name="<remote>",
+        lazy=False,
+    ):
+        """Initialize the source.
+
+        Args:
+            backend (Backend): The store which contains the values.
+            prefix (str): A string prepended to every key.
+            separator (str): The string placed between namespace and option.
+            ttl (float): The number of seconds fetched values are reused for.
+            strict (bool): Whether or not unregistered values raise exceptions.
+            cache (TTLCache): An optional cache to share between sources. A
+                new cache is created with 'ttl' if not given.
+            name (str): A name which identifies the source.
+            lazy (bool): Whether or not values are coerced when first read.
+        """
+        super(RemoteSource, self).__init__(
+            path=name, strict=strict, lazy=lazy
+        )
+        self._backend = backend
+        self._prefix = prefix
+        self._separator = separator
+        self._cache = cache if cache is not None else TTLCache(ttl)
+
+    @property
+    def backend(self):
+        """Get the backend which contains the values."""
+        return self._backend
+
+    @property
+    def cache(self):
+        """Get the cache of fetched values."""
+        return self._cache
+
+    def key(self, namespace, option):
+        """Get the remote key of an option."""
+        return "{0}{1}{2}{3}".format(
+            self._prefix, namespace, self._separator, option
+        )
+
+    def registered(self, conf):
+        """Get a filter which checks if a namespace is registered.
+
+        The filter also selects the configuration whose options 'values'
+        requests. See ConfigurationFile.registered.
+        """
+        wanted = super(RemoteSource, self).registered(conf)
+        wanted.config = conf
+        return wanted
+
+    def values(self, wanted=None):
+        """Get the values of registered options.
+
+        Args:
+            wanted (callable): An optional filter which is called with each
+                namespace name. The options of the configuration given to
+                'registered' are requested if the filter came from it and the
+                options of the global Configuration otherwise.
+
+        Returns:
+            dict: A mapping of namespace name to a mapping of option name to
+                raw value for every option which exists remotely.
+
+        Raises:
+            RemoteSourceError: If the backend cannot be reached.
+        """
+        configuration = getattr(wanted, "config", None)
+        if configuration is None:
+
+            configuration = conf.Configuration()
+
+        names = {}
+        for namespace, section in configuration:
+
+            if wanted is not None and not wanted(namespace):
+
+                continue
+
+            for option, _ in section:
+
+                names[self.key(namespace, option)] = (namespace, option)
+
+        found, missing = self._cache.get_many(names)
+        if missing:
+
+            fetched = self._backend.fetch(missing)
+            self._cache.set_many(missing, fetched)
+            found.update(fetched)
+
+        values = {}
+        for key, value in compat.iteritems(found):
+
+            namespace, option = names[key]
+            values.setdefault(namespace, {})[option] = value
+
+        return values
+
+    def events(self, wanted=None):
+        """Get an iterable of the values of registered options."""
+        for namespace, options in compat.iteritems(self.values(wanted)):
+
+            for option, value in compat.iteritems(options):
+
+                yield namespace, option, value
+
+    def _parse(self):
+        """Fetch the values of all registered options."""
+        return self.values()
+
+    @property
+    def parsed(self):
+        """Get the values of all registered options.
+
+        This is not cached on the instance so that expired values are fetched
+        again.
+        """
+        return self._parse()
+
+    @property
+    def namespaces(self):
+        """Get an iterable of str representing namespaces within the config."""
+        return self.parsed.keys()
+
+    def items(self, namespace):
+        """Get a dictionary of entries under a given namespace."""
+        return self.values(lambda name: name == namespace).get(namespace, {})
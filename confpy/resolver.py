@@ -0,0 +1,709 @@
+"""Single pass option resolution for configuration sources."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import bisect
+import collections
+import os
+import sys
+
+from . import exc
+from . import instrument
+from .core import compat
+from .core import namespace as ns
+from .loaders import pyfile
+
+
+Entry = collections.namedtuple(
+    "Entry",
+    (
+        "section_name",
+        "option_name",
+        "section",
+        "option",
+        "env_name",
+        "cli_name",
+    ),
+)
+
+
+class CliParser(object):
+
+    """A parser for '--<section>_<option>' flags with a fixed set of names.
+
+    Most argument lists only contain exact '--name value' and '--name=value'
+    flags. Those are read by a simple scan of the arguments. Anything the scan
+    cannot interpret exactly as argparse would, such as abbreviated flags,
+    values which start with a dash, flags without values, or help flags, is
+    handed to an argparse parser which is built once and reused.
+    """
+
+    def __init__(self, names):
+        """Initialize the parser.
+
+        Args:
+            names (iter of str): The flag names without the leading dashes.
+        """
+        self._names = frozenset(names)
+        self._prefixes = sorted(self._names.union(("help",)))
+        self._parser = None
+
+    @property
+    def parser(self):
+        """Get the argparse parser for the flags."""
+        if self._parser is None:
+
+            import argparse
+
+            parser = argparse.ArgumentParser()
+            for name in self._names:
+
+                parser.add_argument("--{0}".format(name))
+
+            self._parser = parser
+
+        return self._parser
+
+    def _abbreviates(self, name):
+        """Check if argparse may treat a name as an abbreviated flag."""
+        position = bisect.bisect_left(self._prefixes, name)
+        return position < len(self._prefixes) and self._prefixes[
+            position
+        ].startswith(name)
+
+    def scan(self, arguments):
+        """Read flags without argparse.
+
+        Args:
+            arguments (list of str): The CLI arguments.
+
+        Returns:
+            dict or None: A mapping of flag name to value for every flag which
+                is given or None if argparse is needed to read the arguments.
+        """
+        values = {}
+        position = 0
+        count = len(arguments)
+        while position < count:
+
+            argument = arguments[position]
+            position += 1
+            if argument == "--":
+
+                break
+
+            if not argument.startswith("-"):
+
+                continue
+
+            if not argument.startswith("--"):
+
+                if argument.startswith("-h"):
+
+                    return None
+
+                continue
+
+            name, equals, value = argument[2:].partition("=")
+            if name not in self._names:
+
+                if self._abbreviates(name):
+
+                    return None
+
+                continue
+
+            if not equals:
+
+                if position >= count or arguments[position].startswith("-"):
+
+                    return None
+
+                value = arguments[position]
+                position += 1
+
+            values[name] = value
+
+        return values
+
+    def parse(self, arguments):
+        """Read flags from arguments.
+
+        Args:
+            arguments (list of str): The CLI arguments.
+
+        Returns:
+            dict: A mapping of flag name to value. Flags which are not given
+                are either missing or None.
+        """
+        values = self.scan(arguments)
+        if values is None:
+
+            hook = instrument.ACTIVE
+            start = instrument.clock() if hook is not None else None
+            args, _ = self.parser.parse_known_args(arguments)
+            values = vars(args)
+            if hook is not None:
+
+                hook.stage("argparse", instrument.clock() - start)
+
+        return values
+
+
+_CLI_PARSER = (None, None)
+
+
+def cli_parser(key, names):
+    """Get a cached CliParser.
+
+    Args:
+        key: A hashable value which identifies the set of flag names such as
+            a schema version.
+        names (iter of str): The flag names without the leading dashes. It is
+            only consumed when the cached parser has a different key.
+
+    Returns:
+        CliParser: The most recently used parser if it has the same key or a
+            new parser otherwise.
+    """
+    global _CLI_PARSER  # pylint: disable=global-statement
+    cached_key, parser = _CLI_PARSER
+    if cached_key != key:
+
+        parser = CliParser(names)
+        _CLI_PARSER = (key, parser)
+
+    return parser
+
+
+# Compiled tables keyed by configuration type and prefix. Each holds the
+# schema version it was compiled at along with its entries and variable names.
+_TABLES = {}
+
+
+class Resolver(object):
+
+    """A flat lookup table compiled from a Configuration schema.
+
+    The table is built once from the registered namespaces and options. It
+    contains the environment variable and CLI flag name for every option so
+    that file, environment, and CLI values can be merged and applied with a
+    single walk over the schema.
+    """
+
+    def __init__(self, config, env_prefix="CONFPY"):
+        """Compile the lookup table for a configuration.
+
+        Args:
+            config (confpy.core.config.Configuration): A configuration object
+                which has been initialized with options.
+            env_prefix (str): The string prefix prepended to all environment
+                variables. This value will be set to upper case.
+        """
+        self._config = config
+        self._prefix = env_prefix.upper()
+        self._entries = {}
+        self._env_names = {}
+        self._version = None
+        self._loaded = set()
+        self._sync()
+
+    @property
+    def config(self):
+        """Get the configuration object the table was compiled from."""
+        return self._config
+
+    @property
+    def entries(self):
+        """Get an iterable of Entry objects for every compiled option."""
+        return self._entries.values()
+
+    @property
+    def table(self):
+        """Get a mapping of (namespace, option) to Entry for every option.
+
+        The mapping belongs to the resolver and must not be modified.
+        """
+        return self._entries
+
+    def _add(self, section_name, section, option_name, option):
+        """Add an option to the lookup table."""
+        entry = Entry(
+            section_name=section_name,
+            option_name=option_name,
+            section=section,
+            option=option,
+            env_name="{0}_{1}_{2}".format(
+                self._prefix, section_name.upper(), option_name.upper()
+            ),
+            cli_name="{0}_{1}".format(
+                section_name.lower(), option_name.lower()
+            ),
+        )
+        self._entries[(section_name, option_name)] = entry
+        # Names are ambiguous when section or option names contain an
+        # underscore so a variable may set several options. Tuples are used
+        # because the mapping is shallow copied between resolvers.
+        self._env_names[entry.env_name] = self._env_names.get(
+            entry.env_name, ()
+        ) + (entry,)
+        return entry
+
+    def _sync(self):
+        """Add any options registered since the table was last compiled.
+
+        Nothing is done if the schema version is unchanged. A table compiled
+        by another Resolver at the same version is copied rather than built
+        again.
+        """
+        version = self._config.schema_version
+        if version == self._version:
+
+            return
+
+        key = (type(self._config), self._prefix)
+        cached = _TABLES.get(key)
+        if cached is not None and cached[0] == version:
+
+            self._entries = cached[1].copy()
+            self._env_names = cached[2].copy()
+            self._version = version
+            return
+
+        for section_name, section in self._config:
+
+            for option_name, option in section:
+
+                if (section_name, option_name) not in self._entries:
+
+                    self._add(section_name, section, option_name, option)
+
+        self._version = version
+        _TABLES[key] = (version, self._entries.copy(), self._env_names.copy())
+
+    @staticmethod
+    def _option(section, name):
+        """Get a registered option or generate one in an AutoNamespace.
+
+        The options dictionary is checked directly because names such as
+        'options' or 'get' are attributes of every namespace.
+
+        Returns:
+            confpy.core.option.Option or None: The option or None if the name
+                is not registered and the section does not generate options.
+        """
+        # pylint: disable=protected-access
+        if name not in section._options:
+
+            if not isinstance(section, ns.AutoNamespace):
+
+                return None
+
+            section.register(name, section._generator())
+
+        return section._options[name]
+
+    def _collect(self, source, values, check=False):
+        """Gather the raw values of a declarative source into 'values'.
+
+        If 'check' is set a value which is replaced is coerced and discarded
+        so that invalid values raise even when a later source overrides them.
+
+        Raises:
+            TypeError: If 'check' is set and a replaced value is not a string
+                or appropriate native type.
+            ValueError: If 'check' is set and a replaced value cannot be
+                coerced.
+            NamespaceNotRegistered: If the source contains a namespace which is
+                not defined and the source is strict.
+            OptionNotRegistered: If the source contains an option which is not
+                defined and the source is strict.
+        """
+        for namespace, item, value in source.events(
+            source.registered(self._config)
+        ):
+
+            key = (namespace, item)
+            if key not in self._entries:
+
+                section = self._config.get(namespace)
+                option = self._option(section, item)
+                if option is None:
+
+                    if not source.strict:
+
+                        continue
+
+                    raise exc.OptionNotRegistered(
+                        "The option {0} is not registered.".format(item)
+                    )
+
+                self._add(namespace, section, item, option)
+
+            elif check and key in values:
+
+                self._entries[key].option.cached_coerce(values[key])
+
+            values[key] = value
+
+    def _values(self):
+        """Get a mapping of (namespace, option) to the current option value."""
+        return dict(
+            (key, entry.option.value)
+            for key, entry in compat.iteritems(self._entries)
+        )
+
+    @instrument.timed("files")
+    def _gather(self, sources, loaded=None, lazy=False):
+        """Get the raw values of all sources which have not been applied.
+
+        Python files are executed in order for their side-effects so any
+        values gathered from sources which precede them are applied first,
+        or deferred if 'lazy' is set, and coerced when a Python file reads
+        them. Unless 'lazy' is set a value which a later source replaces is
+        still coerced so that it raises if invalid. If a set is given as
+        'loaded' the keys of the applied values and of the options changed by
+        Python files are added to it.
+        """
+        values = {}
+        for source in sources:
+
+            if isinstance(source, pyfile.PythonFile):
+
+                self._apply(values, lazy)
+                before = None
+                if loaded is not None:
+
+                    loaded.update(values)
+                    before = self._values()
+
+                values = {}
+                source.config  # pylint: disable=pointless-statement
+                self._sync()
+                if before is not None:
+
+                    loaded.update(
+                        key
+                        for key, value in compat.iteritems(self._values())
+                        if key not in before or before[key] is not value
+                    )
+
+                continue
+
+            self._collect(source, values, not lazy)
+
+        return values
+
+    def collect(self, source):
+        """Get the raw values of a declarative source.
+
+        Args:
+            source (confpy.loaders.base.ConfigurationFile): The source to read.
+
+        Returns:
+            dict: A mapping of (namespace, option) to raw value.
+
+        Raises:
+            NamespaceNotRegistered: If the source contains a namespace which is
+                not defined and the source is strict.
+            OptionNotRegistered: If the source contains an option which is not
+                defined and the source is strict.
+        """
+        values = {}
+        self._collect(source, values)
+        return values
+
+    def _apply(self, values, lazy=False):
+        """Set, or defer if 'lazy' is set, raw values on their options."""
+        hook = instrument.ACTIVE
+        if hook is not None:
+
+            hook.count("options.set", len(values))
+
+        for key, value in compat.iteritems(values):
+
+            entry = self._entries[key]
+            if lazy:
+
+                entry.section.defer(entry.option_name, value)
+                continue
+
+            entry.section.set(entry.option_name, value)
+
+    def load(self, sources):
+        """Apply the values of configuration sources without env or CLI values.
+
+        Args:
+            sources (iter of confpy.loaders.base.ConfigurationFile): Sources
+                which are processed in order with values in later sources
+                overwriting values in earlier sources.
+
+        Returns:
+            confpy.core.config.Configuration: The loaded configuration object.
+
+        Raises:
+            NamespaceNotRegistered: If a source contains a namespace which is
+                not defined.
+            OptionNotRegistered: If a source contains an option which is not
+                defined but resides under a valid namespace.
+        """
+        self._loaded = set()
+        values = self._gather(sources, self._loaded)
+        self._apply(values)
+        self._loaded.update(values)
+        return self._config
+
+    def loaded(self):
+        """Get the values set by the sources of the last call to 'load'.
+
+        Returns:
+            dict: A mapping of (namespace, option) to the current value of
+                every option which was set by a declarative source or changed
+                by a Python file. Values set before the load, for example from
+                the environment, are not included unless a source set them.
+        """
+        return dict(
+            (key, self._entries[key].option.value)
+            for key in self._loaded
+            if key in self._entries
+        )
+
+    @instrument.timed("cli")
+    def cli_values(self, arguments=None):
+        """Parse CLI flags for every option in the table.
+
+        Args:
+            arguments (iter of str): An iterable of strings which contains the
+                CLI arguments passed. If nothing is give then sys.argv is used.
+
+        Returns:
+            dict: A mapping of flag name to the given value. Flags which are
+                not given are either missing or None.
+        """
+        arguments = list(arguments or sys.argv[1:])
+        self._sync()
+        return cli_parser(
+            (type(self._config), self._version),
+            (entry.cli_name for entry in self.entries),
+        ).parse(arguments)
+
+    def _generate(self, name, sections):
+        """Create an AutoNamespace option for an environment variable name.
+
+        Args:
+            name (str): The variable name without the prefix.
+            sections (list): Two-tuples of the upper case section name with a
+                trailing underscore and the section name for every
+                AutoNamespace, longest first.
+
+        Returns:
+            Entry or None: The entry of the new option or None if no
+                AutoNamespace matches.
+        """
+        for head, section_name in sections:
+
+            if name.startswith(head) and len(name) > len(head):
+
+                section = self._config.get(section_name)
+                option_name = name[len(head):].lower()
+                return self._add(
+                    section_name,
+                    section,
+                    option_name,
+                    self._option(section, option_name),
+                )
+
+        return None
+
+    @instrument.timed("env")
+    def env_values(self, env=None, strict=False):
+        """Scan the environment once for variables with the prefix.
+
+        Args:
+            env (dict): Optional dictionary which contains environment
+                variables. The default is os.environ if no value is given.
+            strict (bool): Whether or not prefixed variables which do not
+                match an option raise an exception.
+
+        Returns:
+            tuple: A mapping of (namespace, option) to raw value and a sorted
+                list of prefixed variable names which do not match any option.
+
+        Raises:
+            OptionNotRegistered: If 'strict' is set and any prefixed variable
+                does not match an option.
+
+        Variables are matched through an index of variable names so the cost
+        is proportional to the size of the environment rather than the
+        schema. A variable which names an option of an AutoNamespace that does
+        not exist yet creates the option. Empty values are treated as unset.
+        """
+        env = os.environ if env is None else env
+        head = "{0}_".format(self._prefix)
+        values = {}
+        unknown = []
+        sections = None
+        for name, value in compat.iteritems(env):
+
+            if not name.startswith(head):
+
+                continue
+
+            entries = self._env_names.get(name)
+            if entries is None:
+
+                if sections is None:
+
+                    sections = sorted(
+                        (
+                            ("{0}_".format(section_name.upper()), section_name)
+                            for section_name, section in self._config
+                            if isinstance(section, ns.AutoNamespace)
+                        ),
+                        key=lambda item: len(item[0]),
+                        reverse=True,
+                    )
+
+                entry = self._generate(name[len(head):], sections)
+                if entry is None:
+
+                    unknown.append(name)
+                    continue
+
+                entries = (entry,)
+
+            if value:
+
+                for entry in entries:
+
+                    values[(entry.section_name, entry.option_name)] = value
+
+        unknown.sort()
+        if strict and unknown:
+
+            raise exc.OptionNotRegistered(
+                "The environment variables {0} do not match any "
+                "option.".format(", ".join(unknown))
+            )
+
+        return values, unknown
+
+    def overrides(self, env=None, arguments=None, strict_env=False):
+        """Get the environment and CLI values for every option in the table.
+
+        Args:
+            env (dict): Optional dictionary which contains environment
+                variables. The default is os.environ if no value is given.
+            arguments (iter of str): An iterable of strings which contains the
+                CLI arguments passed. If nothing is give then sys.argv is used.
+            strict_env (bool): Whether or not prefixed environment variables
+                which do not match an option raise an exception.
+
+        Returns:
+            dict: A mapping of (namespace, option) to raw value. CLI values
+                take precedence over environment variables.
+
+        Raises:
+            OptionNotRegistered: If 'strict_env' is set and a prefixed
+                environment variable does not match an option.
+        """
+        values, _ = self.env_values(env, strict_env)
+        cli = self.cli_values(arguments)
+        for key, entry in compat.iteritems(self._entries):
+
+            value = cli.get(entry.cli_name)
+            if value:
+
+                values[key] = value
+
+        return values
+
+    @instrument.timed("resolve")
+    def resolve(
+        self,
+        sources=(),
+        env=None,
+        arguments=None,
+        strict_env=False,
+        lazy=False,
+    ):
+        """Merge all sources and apply the final values to the configuration.
+
+        Args:
+            sources (iter of confpy.loaders.base.ConfigurationFile): Sources
+                which are processed in order with values in later sources
+                overwriting values in earlier sources.
+            env (dict): Optional dictionary which contains environment
+                variables. The default is os.environ if no value is given.
+            arguments (iter of str): An iterable of strings which contains the
+                CLI arguments passed. If nothing is give then sys.argv is used.
+            strict_env (bool): Whether or not prefixed environment variables
+                which do not match an option raise an exception.
+            lazy (bool): Whether or not the final values are deferred and
+                coerced the first time each option is read.
+
+        Returns:
+            confpy.core.config.Configuration: The loaded configuration object.
+
+        Raises:
+            MissingRequiredOption: If a required option is not set by any
+                source.
+            NamespaceNotRegistered: If a source contains a namespace which is
+                not defined.
+            OptionNotRegistered: If a source contains an option which is not
+                defined but resides under a valid namespace or 'strict_env' is
+                set and an environment variable does not match an option.
+            ValueError: If a value cannot be coerced. File values which are
+                overridden by a later source are coerced too unless 'lazy' is
+                set.
+
+        Options are set once using the value with the highest precedence: CLI
+        flags, then environment variables, then files. Python files are
+        executed in order for their side-effects so any file values which
+        precede them are applied first. With 'lazy' those values are deferred
+        as well.
+        """
+        values = self._gather(sources, lazy=lazy)
+        overrides = self.overrides(env, arguments, strict_env)
+        if not lazy:
+
+            for key in overrides:
+
+                if key in values:
+
+                    self._entries[key].option.cached_coerce(values[key])
+
+        values.update(overrides)
+        hook = instrument.ACTIVE
+        if hook is not None:
+
+            hook.count("options.registered", len(self._entries))
+            hook.count("options.set", len(values))
+
+        for key, entry in compat.iteritems(self._entries):
+
+            if key in values:
+
+                if lazy:
+
+                    entry.section.defer(entry.option_name, values[key])
+                    continue
+
+                entry.section.set(entry.option_name, values[key])
+
+            if (
+                entry.option.required
+                and not entry.option.pending
+                and entry.option.value is None
+            ):
+
+                raise exc.MissingRequiredOption(
+                    "Option {0} in namespace {1} is required.".format(
+                        entry.option_name, entry.section_name
+                    )
+                )
+
+        return self._config
@@ -0,0 +1,323 @@
+"""Configuration snapshots shared between processes through mmap."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from . import exc
+from .core import config as conf
+from .core import namespace as ns
+from .core import packed
+
+
+# The segment starts with the sequence number followed by the payload length.
+CONTROL = struct.Struct(str("<QQ"))
+COUNTER = struct.Struct(str("<Q"))
+
+_clock = getattr(time, "monotonic", time.time)
+
+
+class SharedSnapshot(object):
+
+    """A frozen configuration stored in a memory mapped file.
+
+    A parent process creates the segment and publishes a snapshot before
+    forking workers. Workers either inherit the object or attach to the same
+    path. Every process maps the same pages so the encoded snapshot is
+    stored once per host and publishing does not require any messages
+    between processes. Values are not shared: each process which reads
+    'current' decodes a private copy of every namespace and keeps it until
+    the generation changes. Use 'namespace' to decode only the namespaces a
+    process needs.
+
+    Creating a segment at a path which already has one replaces the file
+    rather than truncating it. Processes which mapped the old segment keep
+    reading it, and never see later publishes, until they attach again.
+
+    The segment starts with a generation counter and the payload length
+    followed by the payload in the confpy.core.packed layout. The generation
+    is odd while a publish is in progress. Readers copy the payload, or only
+    the data of one namespace for 'namespace', compare the generation before
+    and after copying, and only decode the copy once they match so a publish
+    never produces a torn read. A reader waits, with
+    a growing delay, while a publish is in progress and raises
+    PublishStalled if it is still in progress after the timeout, such as
+    when a publishing process died. Reading 'generation' is a single 8 byte
+    read which lets workers notice updates cheaply.
+
+    Only one process should publish to a segment.
+    """
+
+    def __init__(self, path, size=None, timeout=1.0):
+        """Map a shared segment.
+
+        Args:
+            path (str): The file which backs the segment. Use a path on a
+                memory backed filesystem, such as /dev/shm, to avoid disk I/O.
+            size (int): The size of the segment in bytes. A new, empty segment
+                is created when given. An existing segment is attached when
+                omitted.
+            timeout (float): The number of seconds readers wait for a publish
+                in progress to complete.
+        """
+        self._path = path
+        self._timeout = timeout
+        if size is None:
+
+            handle = os.open(path, os.O_RDWR)
+
+        else:
+
+            # A new file is sized and renamed into place. Truncating a file
+            # which other processes have mapped makes their reads fault.
+            handle, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(path))
+            )
+
+        try:
+
+            if size is not None:
+
+                os.ftruncate(handle, size)
+                getattr(os, "replace", os.rename)(temp_path, path)
+
+            self._size = os.fstat(handle).st_size
+            self._map = mmap.mmap(handle, self._size)
+
+        except (IOError, OSError):
+
+            if size is not None and os.path.exists(temp_path):
+
+                os.remove(temp_path)
+
+            raise
+
+        finally:
+
+            os.close(handle)
+
+        self._lock = threading.Lock()
+        # The generation and the snapshot decoded from it are replaced
+        # together so that threads never pair one with the other's value.
+        self._cached = (None, None)
+
+    @classmethod
+    def create(cls, path, size=1 << 20):
+        """Create a new, empty segment.
+
+        Args:
+            path (str): The file which backs the segment.
+            size (int): The size of the segment in bytes.
+
+        Returns:
+            SharedSnapshot: The mapped segment.
+        """
+        return cls(path, size=size)
+
+    @classmethod
+    def attach(cls, path, timeout=1.0):
+        """Map an existing segment.
+
+        Args:
+            path (str): The file which backs the segment.
+            timeout (float): The number of seconds readers wait for a publish
+                in progress to complete.
+
+        Returns:
+            SharedSnapshot: The mapped segment.
+        """
+        return cls(path, timeout=timeout)
+
+    @property
+    def path(self):
+        """Get the file which backs the segment."""
+        return self._path
+
+    @property
+    def generation(self):
+        """Get the number of the most recent publish."""
+        return COUNTER.unpack_from(self._map, 0)[0] // 2
+
+    def publish(self, frozen):
+        """Write a frozen configuration to the segment.
+
+        Args:
+            frozen (confpy.core.config.FrozenConfiguration): The values to
+                publish. A Configuration is frozen first.
+
+        Returns:
+            int: The new generation.
+
+        Raises:
+            ValueError: If a value cannot be encoded with 'marshal' or the
+                encoded snapshot does not fit in the segment.
+        """
+        if isinstance(frozen, conf.Configuration):
+
+            frozen = frozen.freeze()
+
+        payload = packed.pack(
+            dict(
+                (name, (section.description, dict(section.options())))
+                for name, section in frozen
+            )
+        )
+        if CONTROL.size + len(payload) > self._size:
+
+            raise ValueError(
+                "A snapshot of {0} bytes does not fit in {1} bytes.".format(
+                    len(payload), self._size - CONTROL.size
+                )
+            )
+
+        # The sequence and the length are written separately so that the
+        # sequence is only even again once the length is in place.
+        with self._lock:
+
+            sequence = COUNTER.unpack_from(self._map, 0)[0]
+            COUNTER.pack_into(self._map, 0, sequence + 1)
+            self._map[CONTROL.size:CONTROL.size + len(payload)] = payload
+            COUNTER.pack_into(self._map, COUNTER.size, len(payload))
+            COUNTER.pack_into(self._map, 0, sequence + 2)
+
+        return (sequence + 2) // 2
+
+    def _read(self, copy):
+        """Copy data out of the segment from the most recent complete publish.
+
+        Args:
+            copy (callable): Called with the payload length to copy data out
+                of the segment. Errors it raises because a publish overlapped
+                it are retried.
+
+        Returns:
+            tuple: The sequence number and the value returned by 'copy'.
+
+        Raises:
+            PublishStalled: If a publish is in progress, or publishes keep
+                overlapping the copy, for longer than the timeout.
+        """
+        deadline = None
+        delay = 0.0
+        while True:
+
+            sequence = COUNTER.unpack_from(self._map, 0)[0]
+            if not sequence % 2:
+
+                length = COUNTER.unpack_from(self._map, COUNTER.size)[0]
+                try:
+
+                    data = copy(min(length, self._size))
+
+                except (struct.error, ValueError):
+
+                    if COUNTER.unpack_from(self._map, 0)[0] == sequence:
+
+                        raise
+
+                else:
+
+                    if COUNTER.unpack_from(self._map, 0)[0] == sequence:
+
+                        return sequence, data
+
+            now = _clock()
+            if deadline is None:
+
+                deadline = now + self._timeout
+
+            elif now >= deadline:
+
+                raise exc.PublishStalled(
+                    "A publish to {0} did not complete within {1} "
+                    "seconds.".format(self._path, self._timeout)
+                )
+
+            time.sleep(delay)
+            delay = min(max(delay * 2, 0.0001), 0.01)
+
+    def _payload(self):
+        """Copy the payload of the most recent complete publish.
+
+        Returns:
+            tuple: The sequence number and a copy of the payload which is
+                empty if nothing has been published.
+
+        Raises:
+            PublishStalled: If a publish is in progress for longer than the
+                timeout.
+        """
+        return self._read(
+            lambda length: self._map[CONTROL.size:CONTROL.size + length]
+        )
+
+    @property
+    def current(self):
+        """Get the most recently published snapshot.
+
+        Returns:
+            confpy.core.config.FrozenConfiguration or None: The snapshot or
+                None if nothing has been published.
+
+        The decoded snapshot is cached until the generation changes.
+        """
+        sequence = COUNTER.unpack_from(self._map, 0)[0]
+        generation, frozen = self._cached
+        if sequence == generation:
+
+            return frozen
+
+        sequence, payload = self._payload()
+        if not payload:
+
+            return None
+
+        frozen = conf.FrozenConfiguration.from_namespaces(
+            dict(
+                (name, ns.FrozenNamespace.from_values(values, description))
+                for name, (description, values) in packed.PackedNamespaces(
+                    payload
+                ).items()
+            )
+        )
+        self._cached = (sequence, frozen)
+        return frozen
+
+    def namespace(self, name):
+        """Decode a single namespace without decoding the rest.
+
+        Args:
+            name (str): The name of the namespace.
+
+        Returns:
+            confpy.core.namespace.FrozenNamespace or None: The namespace or
+                None if it is not in the snapshot.
+        """
+        # The table is read in place and only the namespace is copied. Both
+        # are discarded if a publish overlapped them.
+        def copy(length):
+            if not length:
+
+                return None
+
+            return packed.PackedNamespaces(self._map, CONTROL.size).raw(name)
+
+        _, data = self._read(copy)
+        if data is None:
+
+            return None
+
+        description, values = packed.decode(data)
+        return ns.FrozenNamespace.from_values(values, description)
+
+    def close(self):
+        """Unmap the segment."""
+        self._map.close()
@@ -21,7 +21,10 @@ setup(
     install_requires=[],
     extras_require={"generator": ["Jinja2"]},
     entry_points={
-        "console_scripts": ["confpy-generate = confpy.cmd:generate_example"]
+        "console_scripts": [
+            "confpy-generate = confpy.cmd:generate_example",
+            "confpy-convert = confpy.cmd:convert",
+        ]
     },
     include_package_data=True,
 )
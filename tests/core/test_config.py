@@ -7,8 +7,10 @@ from __future__ import unicode_literals
 
 import pytest
 
+from confpy import exc
 from confpy.core import config
 from confpy.core import namespace
+from confpy.options import boolopt
 
 
 def test_config_instance_namespace_setting():
@@ -34,3 +36,66 @@ def test_config_subclasses_are_not_affected_by_parent():
     with pytest.raises(AttributeError):
 
         child.modified
+
+
+def test_config_freeze():
+    """Test that frozen configurations hold frozen namespaces."""
+    ns = namespace.Namespace(value=boolopt.BoolOption(default=True))
+    conf = config.Configuration(test_config_freeze=ns)
+    frozen = conf.freeze()
+
+    assert frozen.test_config_freeze.value is True
+    assert frozen.get("test_config_freeze") is frozen.test_config_freeze
+    with pytest.raises(AttributeError):
+
+        frozen.test_config_freeze = ns
+
+
+def test_config_versions_and_fingerprint():
+    """Test that registering and setting advance the config generations."""
+
+    class TestConfiguration(config.Configuration):
+        _NAMESPACES = {}
+
+    cfg = TestConfiguration()
+    assert cfg.schema_version == 0
+    empty = cfg.fingerprint()
+
+    ns = namespace.Namespace(value=boolopt.BoolOption())
+    cfg.register("first", ns)
+    schema, values = cfg.schema_version, cfg.value_version
+    assert cfg.fingerprint() != empty
+
+    cfg.first.value = True
+    assert cfg.value_version > values
+    assert cfg.schema_version == schema
+
+    cfg.register("second", namespace.Namespace())
+    assert cfg.schema_version > schema
+
+
+def test_config_validate_all():
+    """Test that validation coerces deferred values and checks required."""
+
+    class TestConfiguration(config.Configuration):
+        _NAMESPACES = {}
+
+    ns = namespace.Namespace(
+        value=boolopt.BoolOption(), needed=boolopt.BoolOption(required=True)
+    )
+    cfg = TestConfiguration(section=ns)
+    ns.defer("value", "maybe")
+    with pytest.raises(ValueError):
+
+        cfg.validate_all()
+
+    ns.defer("value", "yes")
+    with pytest.raises(exc.MissingRequiredOption):
+
+        cfg.validate_all()
+
+    assert not dict(ns.options())["value"].pending
+    ns.defer("needed", "no")
+    assert cfg.validate_all() is cfg
+    assert ns.value is True
+    assert ns.needed is False
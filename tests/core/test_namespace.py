@@ -5,8 +5,11 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import pytest
+
 from confpy.core import namespace
 from confpy.options import boolopt
+from confpy.options import listopt
 
 
 def test_namespace_descriptor_binding():
@@ -31,3 +34,94 @@ def test_namespace_auto_generate():
     assert ns.test_2 is False
     assert "test_2" in ns._options
     assert hasattr(ns._options["test_2"], "__get__")
+
+
+def test_namespace_freeze():
+    """Test that frozen namespaces hold resolved values as attributes."""
+    ns = namespace.Namespace(
+        description="frozen",
+        test=boolopt.BoolOption(),
+        items=listopt.ListOption(option=boolopt.BoolOption(), default="yes"),
+    )
+    ns.test = "yes"
+    frozen = ns.freeze()
+
+    assert frozen.description == "frozen"
+    assert frozen.test is True
+    assert frozen.__dict__["test"] is True
+    assert frozen.items == (True,)
+    assert frozen.get("missing", 1) == 1
+    assert dict(frozen) == {"test": True, "items": (True,)}
+
+    ns.test = "no"
+    assert frozen.test is True
+
+
+def test_namespace_freeze_reserved_names():
+    """Test that options named like methods do not shadow them."""
+    ns = namespace.Namespace(
+        get=boolopt.BoolOption(default=True),
+        options=boolopt.BoolOption(default=False),
+        evolve=boolopt.BoolOption(default=True),
+        test=boolopt.BoolOption(default=False),
+    )
+    frozen = ns.freeze()
+    expected = {"get": True, "options": False, "evolve": True, "test": False}
+
+    assert dict(frozen) == expected
+    assert frozen.get("get") is True
+    assert frozen.test is False
+    assert dict(frozen.evolve({"options": True})).get("options") is True
+    assert frozen == namespace.FrozenNamespace.from_values(expected)
+    assert hash(frozen) == hash(frozen.evolve({"get": True}))
+
+
+def test_namespace_freeze_is_immutable():
+    """Test that frozen namespaces reject modification."""
+    frozen = namespace.Namespace(test=boolopt.BoolOption()).freeze()
+
+    with pytest.raises(AttributeError):
+
+        frozen.test = True
+
+    with pytest.raises(AttributeError):
+
+        del frozen.test
+
+    with pytest.raises(AttributeError):
+
+        frozen.missing
+
+
+def test_namespace_versions():
+    """Test that schema and value changes advance the generations."""
+    ns = namespace.Namespace(value=boolopt.BoolOption())
+    schema, values = ns.schema_version, ns.value_version
+
+    ns.value = "yes"
+    assert ns.value_version > values
+    assert ns.schema_version == schema
+
+    fingerprint = ns.fingerprint()
+    ns.register("other", boolopt.BoolOption())
+    assert ns.schema_version > schema
+    assert ns.fingerprint() != fingerprint
+
+    auto = namespace.AutoNamespace(type=boolopt.BoolOption)
+    schema = auto.schema_version
+    auto.dynamic  # pylint: disable=pointless-statement
+    assert auto.schema_version > schema
+
+
+def test_namespace_fingerprint_is_structural():
+    """Test that equal schemas have equal fingerprints."""
+    first = namespace.Namespace(
+        a=boolopt.BoolOption(), b=listopt.ListOption(boolopt.BoolOption())
+    )
+    second = namespace.Namespace(
+        b=listopt.ListOption(boolopt.BoolOption()), a=boolopt.BoolOption()
+    )
+    second.a = "yes"
+
+    assert first.fingerprint() == second.fingerprint()
+    assert first.fingerprint() != namespace.Namespace().fingerprint()
@@ -0,0 +1,134 @@
+"""Tests for the base option objects."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy.core import option
+
+from confpy.options import boolopt
+from confpy.options import listopt
+from confpy.options import numopt
+from confpy.options import stropt
+
+
+@pytest.mark.parametrize(
+    "option",
+    (
+        boolopt.BoolOption(description="test"),
+        numopt.IntegerOption(description="test"),
+        numopt.FloatOption(description="test"),
+        stropt.StringOption(description="test"),
+        stropt.PatternOption(pattern="[a-z]", description="test"),
+        listopt.ListOption(option=boolopt.BoolOption(), description="test"),
+    ),
+)
+def test_option_slots(option):
+    """Test that the built in options do not carry an instance dictionary."""
+    assert not hasattr(option, "__dict__")
+    assert option.description == "test"
+
+
+def test_coercion_cache_counters():
+    """Test that the coercion cache counts hits and misses."""
+    cache = option.CoercionCache(maxsize=2)
+    calls = []
+
+    def coerce(value):
+        calls.append(value)
+        return int(value)
+
+    assert cache.coerce("a", coerce, "1") == 1
+    assert cache.coerce("a", coerce, "1") == 1
+    assert cache.misses == 1
+    assert cache.hits == 1
+    assert calls == ["1"]
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+    assert cache.misses == 0
+
+
+def test_coercion_cache_evicts_least_recent():
+    """Test that the coercion cache is bounded."""
+    cache = option.CoercionCache(maxsize=2)
+    cache.coerce("a", int, "1")
+    cache.coerce("b", int, "2")
+    cache.coerce("a", int, "1")
+    cache.coerce("c", int, "3")
+
+    assert len(cache) == 2
+    cache.coerce("a", int, "1")
+    assert cache.hits == 2
+    cache.coerce("b", int, "2")
+    assert cache.misses == 4
+
+
+def test_coercion_cache_keys_include_pattern(monkeypatch):
+    """Test that pattern options with different patterns do not collide."""
+    cache = option.CoercionCache()
+    monkeypatch.setattr(stropt.PatternOption, "coercion_cache", cache)
+    letters = stropt.PatternOption(pattern="[a-z]+$")
+    digits = stropt.PatternOption(pattern="[0-9]+$")
+
+    letters.__set__(None, "abc")
+    with pytest.raises(ValueError):
+
+        digits.__set__(None, "abc")
+
+    letters.__set__(None, "abc")
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_coercion_cache_keys_include_instance():
+    """Test that options with instance state do not share cached values."""
+
+    class ScaledOption(numopt.IntegerOption):
+
+        __slots__ = ("_scale",)
+        coercion_cache = option.CoercionCache()
+
+        def __init__(self, scale):
+            super(ScaledOption, self).__init__()
+            self._scale = scale
+
+        def coerce(self, value):
+            return int(value) * self._scale
+
+    assert ScaledOption(1).cached_coerce("2") == 2
+    assert ScaledOption(10).cached_coerce("2") == 20
+    assert numopt.IntegerOption.coercion_cache is None
+
+
+def test_option_defer():
+    """Test that deferred values are coerced once when first read."""
+    opt = numopt.IntegerOption(default=1)
+    opt.defer("5")
+
+    assert opt.pending
+    assert opt.value == 5
+    assert not opt.pending
+
+    opt.defer("many")
+    with pytest.raises(ValueError):
+
+        opt.materialize()
+
+    assert opt.pending
+    opt.value = "6"
+    assert not opt.pending
+    assert opt.value == 6
+
+    opt.defer("7")
+    opt.reset()
+    assert not opt.pending
+    assert opt.value == 1
+
+    items = listopt.ListOption(option=numopt.IntegerOption())
+    items.defer("1, 2")
+    assert items.__get__() == (1, 2)
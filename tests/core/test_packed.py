@@ -0,0 +1,42 @@
+"""Tests for the packed namespace layout."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy.core import packed
+
+
+def test_pack_round_trip():
+    """Test that packed namespaces decode to the original data."""
+    data = {
+        "first": {"number": 1, "items": (1, 2)},
+        "second": {"flag": True, "text": "value"},
+        "empty": {},
+    }
+    view = packed.PackedNamespaces(packed.pack(data))
+
+    assert len(view) == 3
+    assert sorted(view.names()) == ["empty", "first", "second"]
+    assert "first" in view
+    assert view.get("second") == data["second"]
+    assert view.get("missing", 1) == 1
+    assert dict(view.items()) == data
+
+
+def test_pack_offset():
+    """Test that packed data can be read from within a larger buffer."""
+    buffer = b"prefix" + packed.pack({"first": {"number": 1}})
+    view = packed.PackedNamespaces(memoryview(buffer), offset=6)
+
+    assert view.get("first") == {"number": 1}
+
+
+def test_pack_invalid_buffer():
+    """Test that buffers without packed data are rejected."""
+    with pytest.raises(ValueError):
+
+        packed.PackedNamespaces(b"\0" * 16)
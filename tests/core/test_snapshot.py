@@ -0,0 +1,91 @@
+"""Tests for versioned configuration snapshots."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy import exc
+from confpy.core import config
+from confpy.core import namespace
+from confpy.core import snapshot
+from confpy.options import boolopt
+from confpy.options import numopt
+
+
+class SnapshotConfiguration(config.Configuration):
+    _NAMESPACES = {}
+
+
+@pytest.fixture
+def cfg():
+    """Get a private configuration for snapshot tests."""
+    SnapshotConfiguration._NAMESPACES = {}
+    return SnapshotConfiguration(
+        first=namespace.Namespace(value=numopt.IntegerOption(default=1)),
+        second=namespace.Namespace(value=boolopt.BoolOption(default=True)),
+    )
+
+
+def test_frozen_configuration_is_hashable(cfg):
+    """Test that equal snapshots hash and compare equal."""
+    one = cfg.freeze()
+    two = cfg.freeze()
+
+    assert one == two
+    assert hash(one) == hash(two)
+    assert len(set((one, two))) == 1
+
+
+def test_frozen_configuration_evolve(cfg):
+    """Test that evolve copies only changed namespaces."""
+    original = cfg.freeze()
+    evolved = original.evolve({"first": {"value": 2}})
+
+    assert evolved.first.value == 2
+    assert original.first.value == 1
+    assert evolved.second is original.second
+    assert evolved != original
+    assert original.evolve({"first": {"value": 1}}).first is original.first
+    with pytest.raises(exc.NamespaceNotRegistered):
+
+        original.evolve({"missing": {}})
+
+
+def test_publisher_publishes_versions(cfg):
+    """Test that publishing coerces values and bumps the version."""
+    publisher = snapshot.Publisher(cfg)
+    original = publisher.current
+
+    current = publisher.publish({"first": {"value": "10"}})
+    assert current is publisher.current
+    assert current.first.value == 10
+    assert current.second is original.second
+    assert original.first.value == 1
+    assert publisher.version == 1
+    assert cfg.first.value == 1
+
+    publisher.publish({"first": {"value": 10}})
+    assert publisher.version == 1
+
+
+def test_publisher_rejects_invalid_changes(cfg):
+    """Test that invalid changes leave the current snapshot in place."""
+    publisher = snapshot.Publisher(cfg)
+    original = publisher.current
+
+    with pytest.raises(ValueError):
+
+        publisher.publish({"first": {"value": "one"}})
+
+    with pytest.raises(exc.OptionNotRegistered):
+
+        publisher.publish({"first": {"missing": 1}})
+
+    with pytest.raises(exc.NamespaceNotRegistered):
+
+        publisher.publish({"missing": {"value": 1}})
+
+    assert publisher.current is original
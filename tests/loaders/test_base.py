@@ -0,0 +1,135 @@
+"""Tests for the base configuration file loader."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy.loaders import base
+from confpy.loaders import ini
+from confpy.loaders import json
+
+
+@pytest.fixture
+def CountingJsonFile():
+    """Return a JsonFile class which counts calls to '_parse'."""
+
+    class CountingFile(json.JsonFile):
+        parses = []
+
+        def _parse(self):
+            self.parses.append(self.path)
+            return super(CountingFile, self)._parse()
+
+    return CountingFile
+
+
+def test_parsed_files_are_shared(tmpdir, CountingJsonFile):
+    """Test that unchanged files are only parsed once per process."""
+    path = tmpdir.join("conf.json")
+    path.write('{"section": {"option": 1}}')
+
+    first = CountingJsonFile(path=str(path))
+    second = CountingJsonFile(path=str(path))
+
+    assert first.parsed == {"section": {"option": 1}}
+    assert second.parsed is first.parsed
+    assert len(CountingJsonFile.parses) == 1
+
+
+def test_parsed_files_are_invalidated(tmpdir, CountingJsonFile):
+    """Test that modified files are parsed again."""
+    path = tmpdir.join("conf.json")
+    path.write('{"section": {"option": 1}}')
+    assert CountingJsonFile(path=str(path)).parsed["section"]["option"] == 1
+
+    path.write('{"section": {"option": 10}}')
+    assert CountingJsonFile(path=str(path)).parsed["section"]["option"] == 10
+    assert len(CountingJsonFile.parses) == 2
+
+    base.PARSED_FILES.discard(str(path))
+    assert CountingJsonFile(path=str(path)).parsed["section"]["option"] == 10
+    assert len(CountingJsonFile.parses) == 3
+
+
+def test_parsed_files_are_bounded(tmpdir, CountingJsonFile):
+    """Test that the least recently used and large files are evicted."""
+    cache = base.ParsedFileCache(max_entries=2, max_bytes=100)
+    paths = []
+    for number in range(3):
+
+        path = tmpdir.join("conf{0}.json".format(number))
+        path.write('{{"section": {{"option": {0}}}}}'.format(number))
+        paths.append(str(path))
+
+    for path in paths[:2] + paths[:1] + paths[2:]:
+
+        cache.parse(CountingJsonFile(path=path))
+
+    assert len(cache) == 2
+    cache.parse(CountingJsonFile(path=paths[0]))
+    assert len(CountingJsonFile.parses) == 3
+
+    cache.parse(CountingJsonFile(path=paths[1]))
+    assert len(CountingJsonFile.parses) == 4
+
+    large = tmpdir.join("large.json")
+    large.write('{"section": {"option": "' + "x" * 100 + '"}}')
+    cache.parse(CountingJsonFile(path=str(large)))
+    assert len(cache) == 2
+
+    cache.resize(max_bytes=0)
+    assert len(cache) == 0
+
+
+def test_empty_files_are_parsed_once(tmpdir):
+    """Test that an empty parse result is still cached on the instance."""
+    path = tmpdir.join("conf.ini")
+    path.write("")
+    loader = ini.IniFile(path=str(path))
+
+    assert loader.parsed is loader.parsed
+    assert list(loader.namespaces) == []
+
+
+def test_fingerprint_missing_file(tmpdir):
+    """Test that missing files have no fingerprint."""
+    assert base.fingerprint(str(tmpdir.join("missing"))) is None
+    assert base.fingerprint(str(tmpdir)) is not None
+
+
+def test_preload_parses_with_an_executor(tmpdir):
+    """Test that files are parsed by an executor and keep their order."""
+    futures = pytest.importorskip("concurrent.futures")
+    paths = []
+    for number in range(5):
+
+        path = tmpdir.join("conf{0}.json".format(number))
+        path.write('{{"section": {{"option": {0}}}}}'.format(number))
+        paths.append(str(path))
+
+    loaders = [json.JsonFile(path=path) for path in paths]
+    assert base.preload(loaders) == loaders
+    assert all(loader._parsed is None for loader in loaders)
+
+    for executor_type in (
+        futures.ThreadPoolExecutor,
+        futures.ProcessPoolExecutor,
+    ):
+
+        base.PARSED_FILES.clear()
+        loaders = [json.JsonFile(path=path) for path in paths]
+        with executor_type(max_workers=2) as executor:
+
+            assert base.preload(loaders, executor) == loaders
+
+        assert [loader._parsed["section"]["option"] for loader in loaders] == [
+            0,
+            1,
+            2,
+            3,
+            4,
+        ]
+        assert len(base.PARSED_FILES) == 5
@@ -0,0 +1,91 @@
+"""Tests for binary configuration files."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy import parser
+from confpy.core import config
+from confpy.core import namespace
+from confpy.core import packed
+from confpy.loaders import binary
+from confpy.options import boolopt
+from confpy.options import numopt
+from confpy.options import stropt
+
+
+def test_binary_file_creates_config_objects(tmpdir):
+    """Test that written files load options."""
+    config.Configuration(
+        test_binary_loader=namespace.Namespace(
+            test=boolopt.BoolOption(),
+            many=numopt.IntegerOption(),
+            letter=stropt.StringOption(),
+        )
+    )
+    path = str(tmpdir.join("conf.cfgb"))
+    binary.write(
+        path,
+        {"test_binary_loader": {"test": True, "many": "10", "letter": "a"}},
+    )
+    loader = parser.configfile_from_path(path)
+
+    assert isinstance(loader, binary.BinaryFile)
+    assert loader.config.test_binary_loader.test is True
+    assert loader.config.test_binary_loader.many == 10
+    assert loader.config.test_binary_loader.letter == "a"
+
+
+def test_binary_file_skips_unregistered(tmpdir):
+    """Test that unregistered namespaces are never decoded."""
+    config.Configuration(
+        test_binary_skip=namespace.Namespace(many=numopt.IntegerOption())
+    )
+    content = bytearray(
+        packed.pack(
+            {"test_binary_skip": {"many": 10}, "unregistered": {"x": 1}}
+        )
+    )
+    table = packed.PackedNamespaces(bytes(content))
+    start = table._spans["unregistered"][0]  # pylint: disable=protected-access
+    content[start] = 0
+    path = tmpdir.join("conf.cfgb")
+    path.write_binary(bytes(content))
+    loader = binary.BinaryFile(path=str(path), strict=False)
+
+    assert loader.config.test_binary_skip.many == 10
+    with pytest.raises(ValueError):
+
+        loader.items("unregistered")
+
+
+def test_binary_file_rejects_other_content(tmpdir):
+    """Test that files without the packed header raise ValueError."""
+    path = tmpdir.join("conf.cfgb")
+    path.write_binary(b"CP")
+    with pytest.raises(ValueError):
+
+        binary.BinaryFile(path=str(path)).parsed
+
+
+def test_convert_text_files(tmpdir):
+    """Test that INI and JSON files convert to equivalent binary files."""
+    ini = tmpdir.join("conf.ini")
+    ini.write("[DEFAULT]\nshared = s\n[section]\noption = 1\n")
+    json = tmpdir.join("conf.json")
+    json.write('{"section": {"option": 1, "items": [1, "a"]}}')
+    destination = str(tmpdir.join("other.bin"))
+
+    converted = binary.convert(str(ini))
+    assert converted == str(tmpdir.join("conf.cfgb"))
+    assert binary.read(binary.BinaryFile(path=converted)) == {
+        "section": {"option": "1", "shared": "s"}
+    }
+
+    assert binary.convert(str(json), destination) == destination
+    loader = parser.configfile_from_path(destination)
+    assert isinstance(loader, binary.BinaryFile)
+    assert binary.read(loader) == {"section": {"option": 1, "items": [1, "a"]}}
@@ -0,0 +1,32 @@
+"""Tests for orjson backed json configuration files."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy import parser
+from confpy.core import config
+from confpy.core import namespace
+from confpy.options import boolopt
+from confpy.options import numopt
+
+fastjson = pytest.importorskip("confpy.loaders.fastjson")
+
+
+def test_orjson_file_creates_config_objects(tmpdir):
+    """Test that the orjson loader is preferred and loads options."""
+    config.Configuration(
+        test_fastjson_loader=namespace.Namespace(
+            test=boolopt.BoolOption(), many=numopt.IntegerOption()
+        )
+    )
+    path = tmpdir.join("conf.json")
+    path.write('{"test_fastjson_loader": {"test": true, "many": 10}}')
+    loader = parser.configfile_from_path(str(path))
+
+    assert isinstance(loader, fastjson.OrjsonFile)
+    assert loader.config.test_fastjson_loader.test is True
+    assert loader.config.test_fastjson_loader.many == 10
@@ -5,9 +5,15 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import io
+import sys
+
 import pytest
 
+from confpy import exc
+from confpy.core import compat
 from confpy.core import config
+from confpy.core import iniparser
 from confpy.core import namespace
 from confpy.loaders import ini
 from confpy.options import boolopt
@@ -88,3 +94,76 @@ def test_ini_file_creates_config_objects_non_strict(IniFileNonStrict):
 
     assert generated_conf.test_ini_loader_non_strict.test is True
     assert generated_conf.test_ini_loader_non_strict.many == 10
+
+
+def test_index_finds_section_spans():
+    """Test that sections are indexed by byte range."""
+    content = b"; comment\n[one]\na = 1\n[two]\nb = [x]\n [no]\n[one]\nc = 3"
+    sections = ini.index(content)
+
+    assert list(sections) == ["one", "two"]
+    assert [content[s:e] for s, e in sections["one"]] == [
+        b"[one]\na = 1\n",
+        b"[one]\nc = 3",
+    ]
+    assert [content[s:e] for s, e in sections["two"]] == [
+        b"[two]\nb = [x]\n [no]\n",
+    ]
+
+
+def test_index_matches_config_parser_sections():
+    """Test that headers are recognized as ConfigParser recognizes them."""
+    content = (
+        "[plain]\na = 1\n"
+        "[comment] ; note\nb = 2\n"
+        "[hash]\t# note\nc = 3\n"
+        "[nested] ; x]\nd = 4\n"
+        "[trailing]text\ne = 5\n"
+        "[crlf]\r\nf = 6\r\n"
+    )
+    parsed = iniparser.ConfigParser()
+    parsed.read_file(io.StringIO(content))
+
+    assert list(ini.index(content.encode("utf8"))) == parsed.sections()
+
+
+def test_ini_map_file_parses_only_wanted_sections(tmpdir):
+    """Test that unregistered sections are never parsed."""
+    config.Configuration(
+        test_ini_map=namespace.Namespace(
+            test=boolopt.BoolOption(),
+            many=numopt.IntegerOption(),
+            letter=stropt.StringOption(),
+        )
+    )
+    path = tmpdir.join("conf.ini")
+    path.write(
+        "[DEFAULT]\nletter = z\n"
+        "[unregistered]\nthis line is not valid\n"
+        "[test_ini_map]\ntest = yes\nmany = 10\n"
+    )
+    generated_conf = ini.IniMapFile(path=str(path), strict=False).config
+
+    assert generated_conf.test_ini_map.test is True
+    assert generated_conf.test_ini_map.many == 10
+    assert generated_conf.test_ini_map.letter == "z"
+
+    with pytest.raises(exc.NamespaceNotRegistered):
+
+        ini.IniMapFile(path=str(path)).config
+
+
+def test_ini_map_file_handles_empty_files(tmpdir):
+    """Test that empty files produce no values."""
+    path = tmpdir.join("conf.ini")
+    path.write("")
+
+    assert list(ini.IniMapFile(path=str(path)).events()) == []
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="Module __getattr__ is not supported."
+)
+def test_compat_config_parser_alias():
+    """Test that the ConfigParser shim is still available from compat."""
+    assert compat.ConfigParser is iniparser.ConfigParser
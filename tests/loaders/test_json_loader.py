@@ -7,6 +7,7 @@ from __future__ import unicode_literals
 
 import pytest
 
+from confpy import exc
 from confpy.core import config
 from confpy.core import namespace
 from confpy.loaders import json
@@ -94,3 +95,69 @@ def test_json_file_creates_config_objects_non_strict(JsonFileNonScript):
 
     assert generated_conf.test_json_loader_non_strict.test is True
     assert generated_conf.test_json_loader_non_strict.many == 10
+
+
+@pytest.fixture
+def JsonStreamFile():
+    """Return a JsonStreamFile class which reads in very small chunks."""
+
+    class JsonTestFile(json.JsonStreamFile):
+        CHUNK_SIZE = 3
+
+    return JsonTestFile
+
+
+def test_json_stream_file_creates_config_objects(tmpdir, JsonStreamFile):
+    """Test that streaming JSON files loads options."""
+    config.Configuration(
+        test_json_stream=namespace.Namespace(
+            test=boolopt.BoolOption(),
+            many=numopt.IntegerOption(),
+            letter=stropt.StringOption(),
+        )
+    )
+    path = tmpdir.join("conf.json")
+    path.write(
+        '{"test_json_stream": {"test": true, "many": 10, '
+        '"letter": "a \\" } ]", "many": 11}}'
+    )
+    generated_conf = JsonStreamFile(path=str(path)).config
+
+    assert generated_conf.test_json_stream.test is True
+    assert generated_conf.test_json_stream.many == 11
+    assert generated_conf.test_json_stream.letter == 'a " } ]'
+
+
+def test_json_stream_file_skips_unregistered(tmpdir, JsonStreamFile):
+    """Test that unregistered namespaces are never decoded."""
+    config.Configuration(
+        test_json_stream_skip=namespace.Namespace(many=numopt.IntegerOption())
+    )
+    path = tmpdir.join("conf.json")
+    path.write(
+        '{"unregistered": {"nested": [{"a": "}"}, 1e999x, tru]}, '
+        '"test_json_stream_skip": {"many": 10}}'
+    )
+    events = list(
+        JsonStreamFile(path=str(path), strict=False).events(
+            lambda name: name != "unregistered"
+        )
+    )
+    assert events == [("test_json_stream_skip", "many", 10)]
+    generated_conf = JsonStreamFile(path=str(path), strict=False).config
+    assert generated_conf.test_json_stream_skip.many == 10
+
+    with pytest.raises(exc.NamespaceNotRegistered):
+
+        JsonStreamFile(path=str(path)).config
+
+
+def test_json_stream_file_rejects_invalid_documents(tmpdir, JsonStreamFile):
+    """Test that malformed documents raise ValueError."""
+    path = tmpdir.join("conf.json")
+    for body in ('{"section": 1}', '{"section": {"a": 1}', "[]"):
+
+        path.write(body)
+        with pytest.raises(ValueError):
+
+            list(JsonStreamFile(path=str(path)).events())
@@ -0,0 +1,135 @@
+"""Tests for the registry of lazily imported loaders."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from confpy.loaders import ini
+from confpy.loaders import json
+from confpy.loaders import registry
+
+
+def test_registry_resolves_references():
+    """Test that references are imported on lookup and then cached."""
+    loaders = registry.LoaderRegistry(
+        {"json": "confpy.loaders.json:JsonFile"}
+    )
+
+    assert "json" in loaders
+    assert "ini" not in loaders
+    assert loaders.get("ini") is None
+    assert loaders["json"] is json.JsonFile
+    assert loaders.get("json") is json.JsonFile
+
+    loaders["ini"] = json.JsonStreamFile
+    assert loaders.keys() == ["ini", "json"]
+    assert len(loaders) == 2
+
+    del loaders["ini"]
+    assert list(loaders) == ["json"]
+
+
+def test_resolve_missing_reference():
+    """Test that a reference to a missing attribute raises ImportError."""
+    with pytest.raises(ImportError):
+
+        registry.resolve("confpy.loaders.json:Missing")
+
+
+def test_registry_prefers_importable_priority():
+    """Test that the highest priority loader which imports is used."""
+    loaders = registry.LoaderRegistry()
+    loaders.register("json", "confpy.loaders.json:JsonFile")
+    loaders.register("json", "confpy_missing_module:JsonFile", priority=20)
+
+    assert loaders["json"] is json.JsonFile
+
+    loaders.register("json", json.JsonStreamFile, priority=5)
+    assert loaders["json"] is json.JsonStreamFile
+    assert loaders.candidates("json") == [json.JsonStreamFile, json.JsonFile]
+
+    loaders.register("yaml", "confpy_missing_module:YamlFile")
+    assert "yaml" in loaders
+    assert loaders.get("yaml") is None
+    with pytest.raises(KeyError):
+
+        loaders["yaml"]  # pylint: disable=pointless-statement
+
+
+def test_registry_entry_points(monkeypatch):
+    """Test that entry points are read once when needed and keep pins."""
+    calls = []
+
+    def entry_points(group):
+        calls.append(group)
+        return [
+            ("conf", "confpy.loaders.json:JsonFile"),
+            ("ini", "confpy.loaders.json:JsonFile"),
+        ]
+
+    monkeypatch.setattr(registry, "entry_points", entry_points)
+    loaders = registry.LoaderRegistry(group="confpy.test")
+    loaders["ini"] = ini.IniFile
+
+    assert loaders["ini"] is ini.IniFile
+    assert "ini" in loaders
+    assert not calls
+    assert loaders["conf"] is json.JsonFile
+    assert loaders["ini"] is ini.IniFile
+    assert loaders.keys() == ["conf", "ini"]
+    assert calls == ["confpy.test"]
+
+    loaders = registry.LoaderRegistry(group="confpy.test")
+    loaders.register("conf", ini.IniFile, priority=-1)
+    assert loaders["conf"] is ini.IniFile
+    loaders.discover()
+    assert loaders["conf"] is json.JsonFile
+    assert calls == ["confpy.test", "confpy.test"]
+
+
+def test_registry_sniffs_content(tmpdir):
+    """Test that unknown extensions are detected from their content."""
+    loaders = registry.LoaderRegistry(
+        {
+            "ini": "confpy.loaders.ini:IniFile",
+            "json": "confpy.loaders.json:JsonFile",
+            "py": "confpy.loaders.pyfile:PythonFile",
+        }
+    )
+    as_json = tmpdir.join("settings")
+    as_json.write('  \n{"section": {"option": 1}}')
+    as_ini = tmpdir.join("settings.conf")
+    as_ini.write("# comment\n\n[section]\noption = 1\n")
+    unknown = tmpdir.join("settings.txt")
+    unknown.write("option = 1\n")
+
+    assert loaders.loader_for(str(as_json)) is json.JsonFile
+    assert loaders.loader_for(str(as_ini)) is ini.IniFile
+    assert loaders.loader_for(str(unknown)) is None
+    assert loaders.loader_for(str(tmpdir.join("missing"))) is None
+    assert loaders.loader_for("missing.ini") is ini.IniFile
+
+
+def test_api_import_is_lazy():
+    """Test that importing the API does not import parsing libraries."""
+    heavy = ("argparse", "configparser", "ConfigParser", "jinja2", "json")
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            "import sys, confpy.api; "
+            "print(','.join(m for m in {0!r} if m in sys.modules))".format(
+                heavy
+            ),
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    )
+
+    assert output.strip() == b""
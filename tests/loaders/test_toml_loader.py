@@ -0,0 +1,38 @@
+"""Tests for toml configuration files."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy import parser
+from confpy.core import config
+from confpy.core import namespace
+from confpy.options import boolopt
+from confpy.options import listopt
+from confpy.options import numopt
+
+toml = pytest.importorskip("confpy.loaders.toml")
+
+
+def test_toml_file_creates_config_objects(tmpdir):
+    """Test that parsing TOML files loads native values."""
+    config.Configuration(
+        test_toml_loader=namespace.Namespace(
+            test=boolopt.BoolOption(),
+            many=numopt.IntegerOption(),
+            numbers=listopt.ListOption(option=numopt.IntegerOption()),
+        )
+    )
+    path = tmpdir.join("conf.toml")
+    path.write(
+        "[test_toml_loader]\ntest = true\nmany = 10\nnumbers = [1, 2]\n"
+    )
+    loader = parser.configfile_from_path(str(path))
+
+    assert isinstance(loader, toml.TomlFile)
+    assert loader.config.test_toml_loader.test is True
+    assert loader.config.test_toml_loader.many == 10
+    assert tuple(loader.config.test_toml_loader.numbers) == (1, 2)
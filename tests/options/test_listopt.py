@@ -5,12 +5,15 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import pytest
+
 from confpy.options import boolopt
 from confpy.options import listopt
+from confpy.options import stropt
 
 
 def test_list_coerce():
-    """Test if list values are converted to lists of options."""
+    """Test if list values are converted to lists of values."""
     opt = listopt.ListOption(option=boolopt.BoolOption())
 
     opt.__set__(None, (True, False, "yes", "no"))
@@ -22,7 +25,7 @@ def test_list_coerce():
 
 
 def test_list_string_coerce():
-    """Test if string values are converted to lists of options."""
+    """Test if string values are converted to lists of values."""
     opt = listopt.ListOption(option=boolopt.BoolOption())
 
     opt.__set__(None, "TRUE,FALSE   ,yes,no")
@@ -53,3 +56,23 @@ def test_list_default_none():
     result = tuple(opt.__get__())
     assert result is not None
     assert iter(result)
+
+
+def test_list_values_are_tuples():
+    """Test if list values are stored as plain tuples of values."""
+    opt = listopt.ListOption(option=stropt.PatternOption(pattern="[a-z]+"))
+
+    opt.__set__(None, "abc, def")
+    assert opt.__get__() == ("abc", "def")
+    with pytest.raises(ValueError):
+
+        opt.__set__(None, "abc,123")
+
+
+def test_list_default_cached():
+    """Test if the coerced default is reused on every access."""
+    opt = listopt.ListOption(option=boolopt.BoolOption(), default="yes,no")
+    opt._value = None
+
+    assert opt.__get__() == (True, False)
+    assert opt.__get__() is opt.__get__()
@@ -51,3 +51,15 @@ def test_pattern_deepcopy():
     new_opt = copy.deepcopy(opt)
 
     assert new_opt is not opt
+
+
+def test_pattern_deepcopy_state():
+    """Test if PatternOption deep copies keep the option state."""
+    opt = stropt.PatternOption(pattern="[a-z]", default="a", required=True)
+    opt.__set__(None, "b")
+    new_opt = copy.deepcopy(opt)
+
+    assert new_opt.pattern == "[a-z]"
+    assert new_opt.default == "a"
+    assert new_opt.required is True
+    assert new_opt.__get__() == "b"
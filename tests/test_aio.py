@@ -0,0 +1,121 @@
+"""Tests for the asyncio configuration loading API."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import threading
+
+import pytest
+
+from confpy import exc
+from confpy import parser
+from confpy import resolver
+from confpy.core import config
+from confpy.core import namespace
+from confpy.options import numopt
+from confpy.options import stropt
+
+asyncio = pytest.importorskip("asyncio")
+aio = pytest.importorskip("confpy.aio")
+
+
+@pytest.fixture
+def loop():
+    """Get a new event loop which is closed after the test."""
+    event_loop = asyncio.new_event_loop()
+    yield event_loop
+    event_loop.close()
+
+
+class DelayedSource(aio.MappingSource):
+
+    """A source whose values arrive after the loop runs other callbacks."""
+
+    def fetch(self, loop):
+        future = asyncio.Future(loop=loop)
+        loop.call_soon(future.set_result, self._values)
+        return future
+
+
+def test_parse_options_applies_sources_in_order(tmpdir, loop):
+    """Test that files and custom sources are merged in order."""
+    config.Configuration(
+        test_aio_parse=namespace.Namespace(
+            many=numopt.IntegerOption(),
+            letter=stropt.StringOption(),
+            other=stropt.StringOption(),
+        )
+    )
+    directory = tmpdir.mkdir("conf.d")
+    directory.join("10-base.ini").write(
+        "[test_aio_parse]\nmany = 10\nletter = a\nother = x\n"
+    )
+    directory.join("20-local.json").write(
+        '{"test_aio_parse": {"letter": "b"}}'
+    )
+    remote = DelayedSource({"test_aio_parse": {"many": "20", "letter": "c"}})
+    last = aio.MappingSource({"test_aio_parse": {"letter": "d"}})
+
+    cfg = loop.run_until_complete(
+        aio.parse_options([str(directory), remote, last], loop=loop)
+    )
+
+    assert cfg.test_aio_parse.many == 20
+    assert cfg.test_aio_parse.letter == "d"
+    assert cfg.test_aio_parse.other == "x"
+
+
+def test_file_source_caches_parsed_content(tmpdir, loop):
+    """Test that files read in an executor keep their parsed content."""
+    path = tmpdir.join("conf.json")
+    path.write('{"section": {"option": 1}}')
+
+    loader = loop.run_until_complete(aio.FileSource(str(path)).load(loop))
+
+    assert loader._parsed == {"section": {"option": 1}}
+
+
+def test_errors_are_raised_from_the_future(tmpdir, loop):
+    """Test that loader errors are delivered through the future."""
+    path = tmpdir.join("conf.json")
+    path.write('{"test_aio_unregistered": {"option": 1}}')
+
+    with pytest.raises(exc.NamespaceNotRegistered):
+
+        loop.run_until_complete(aio.parse_options([str(path)], loop=loop))
+
+    assert loop.run_until_complete(aio.load([], loop=loop)) == []
+
+
+def test_blocking_work_runs_in_the_executor(tmpdir, loop, monkeypatch):
+    """Test that paths are expanded and values applied off the loop."""
+    config.Configuration(
+        test_aio_threads=namespace.Namespace(many=numopt.IntegerOption())
+    )
+    tmpdir.join("conf.json").write('{"test_aio_threads": {"many": 1}}')
+    threads = []
+
+    def record(func):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(parser, "expand_paths", record(parser.expand_paths))
+    monkeypatch.setattr(
+        parser, "configfile_from_path", record(parser.configfile_from_path)
+    )
+    monkeypatch.setattr(
+        resolver.Resolver, "resolve", record(resolver.Resolver.resolve)
+    )
+
+    cfg = loop.run_until_complete(
+        aio.parse_options([str(tmpdir.join("*.json"))], loop=loop)
+    )
+
+    assert cfg.test_aio_threads.many == 1
+    assert len(threads) == 3
+    assert threading.current_thread() not in threads
@@ -0,0 +1,187 @@
+"""Test suite for on-disk snapshots of loaded configuration values."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy import cache
+from confpy import parser
+from confpy.core import config
+from confpy.core import namespace
+from confpy.options import listopt
+from confpy.options import numopt
+
+
+@pytest.fixture
+def cfg():
+    """Get a configuration with options used by the snapshot tests."""
+    cfg = config.Configuration()
+    if cfg.get("test_cache") is None:
+
+        cfg.register(
+            "test_cache",
+            namespace.Namespace(
+                number=numopt.IntegerOption(),
+                numbers=listopt.ListOption(option=numopt.IntegerOption()),
+            ),
+        )
+
+    return cfg
+
+
+def test_snapshot_round_trip(tmpdir, cfg, monkeypatch):
+    """Test that snapshots are applied instead of loading files."""
+    path = tmpdir.join("conf.json")
+    path.write('{"test_cache": {"number": 1, "numbers": "1,2"}}')
+    cache_dir = str(tmpdir.join("cache"))
+
+    parser.parse_options(files=(str(path),), cache_dir=cache_dir)
+    assert tmpdir.join("cache").listdir()
+
+    cfg.test_cache.number = 5
+    cfg.test_cache.numbers = ()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Files should not be loaded.")
+
+    monkeypatch.setattr(parser, "configfile_from_path", fail)
+    parser.parse_options(files=(str(path),), cache_dir=cache_dir)
+    assert cfg.test_cache.number == 1
+    assert cfg.test_cache.numbers == (1, 2)
+
+
+def test_snapshot_invalidated_by_file_change(tmpdir, cfg):
+    """Test that modified files are loaded again."""
+    path = tmpdir.join("conf.json")
+    path.write('{"test_cache": {"number": 1}}')
+    cache_dir = str(tmpdir.join("cache"))
+    snapshots = cache.SnapshotCache(cache_dir)
+
+    parser.parse_options(files=(str(path),), cache_dir=cache_dir)
+    assert snapshots.restore(cfg, (str(path),)) is True
+
+    path.write('{"test_cache": {"number": 10}}')
+    assert snapshots.restore(cfg, (str(path),)) is False
+    parser.parse_options(files=(str(path),), cache_dir=cache_dir)
+    assert cfg.test_cache.number == 10
+
+
+def test_snapshot_invalidated_by_schema_change(tmpdir, cfg):
+    """Test that snapshots are not applied when options are registered."""
+    path = tmpdir.join("conf.json")
+    path.write('{"test_cache": {"number": 1}}')
+    snapshots = cache.SnapshotCache(str(tmpdir))
+
+    values = {("test_cache", "number"): 1}
+    assert snapshots.store(values, (str(path),), schema=cfg.fingerprint())
+    assert snapshots.restore(cfg, (str(path),)) is True
+    assert snapshots.restore(cfg, (str(path),), strict=False) is False
+
+    cfg.register(
+        "test_cache_schema",
+        namespace.Namespace(number=numopt.IntegerOption()),
+    )
+    assert snapshots.restore(cfg, (str(path),)) is False
+
+
+def test_snapshot_missing_file(tmpdir, cfg):
+    """Test that snapshots are not written for missing files."""
+    snapshots = cache.SnapshotCache(str(tmpdir))
+
+    paths = (str(tmpdir.join("missing.json")),)
+
+    assert snapshots.store({}, paths, schema=cfg.fingerprint()) is False
+
+
+def _fresh_registry(monkeypatch):
+    """Replace the registry as if the test ran in a new process."""
+    monkeypatch.setattr(config.Configuration, "_NAMESPACES", {})
+    return config.Configuration(
+        test_cache_auto=namespace.AutoNamespace(type=numopt.IntegerOption),
+        test_cache_set=namespace.Namespace(
+            number=numopt.IntegerOption(default=1),
+        ),
+    )
+
+
+def test_snapshot_applied_with_generated_options(tmpdir, monkeypatch):
+    """Test that options generated while loading do not change the key."""
+    path = tmpdir.join("conf.json")
+    path.write('{"test_cache_auto": {"dynamic": 3}}')
+    cache_dir = str(tmpdir.join("cache"))
+
+    _fresh_registry(monkeypatch)
+    parser.parse_options(files=(str(path),), cache_dir=cache_dir)
+
+    cfg = _fresh_registry(monkeypatch)
+    assert cache.SnapshotCache(cache_dir).restore(cfg, (str(path),))
+    assert cfg.test_cache_auto.dynamic == 3
+
+
+def test_snapshot_excludes_values_not_from_files(tmpdir, monkeypatch):
+    """Test that values set before loading or from the env are not stored."""
+    path = tmpdir.join("conf.json")
+    path.write('{"test_cache_auto": {"dynamic": 3}}')
+    cache_dir = str(tmpdir.join("cache"))
+
+    cfg = _fresh_registry(monkeypatch)
+    cfg.test_cache_set.number = 99
+    monkeypatch.setenv("CONFPY_TEST_CACHE_AUTO_DYNAMIC", "5")
+    parser.parse_options(files=(str(path),), cache_dir=cache_dir)
+    assert cfg.test_cache_auto.dynamic == 5
+
+    monkeypatch.delenv("CONFPY_TEST_CACHE_AUTO_DYNAMIC")
+    cfg = _fresh_registry(monkeypatch)
+    assert cache.SnapshotCache(cache_dir).restore(cfg, (str(path),))
+    assert cfg.test_cache_set.number == 1
+    assert cfg.test_cache_auto.dynamic == 3
+
+
+def test_snapshot_errors_fall_back(tmpdir, monkeypatch):
+    """Test that unwritable directories and corrupt snapshots are ignored."""
+    path = tmpdir.join("conf.json")
+    path.write('{"test_cache_set": {"number": 2}}')
+    blocker = tmpdir.join("blocker")
+    blocker.write("")
+    cfg = _fresh_registry(monkeypatch)
+
+    parser.parse_options(files=(str(path),), cache_dir=str(blocker))
+    assert cfg.test_cache_set.number == 2
+
+    snapshots = cache.SnapshotCache(str(tmpdir.join("cache")))
+    snapshots.store(
+        {("test_cache_set", "number"): 2},
+        (str(path),),
+        schema=cfg.fingerprint(),
+    )
+    with open(snapshots.path((str(path),)), "wb") as snapshot_file:
+
+        snapshot_file.write(cache.MAGIC + b"corrupt")
+
+    assert snapshots.restore(cfg, (str(path),)) is False
+
+
+def test_snapshot_with_options_registered_by_python(tmpdir, monkeypatch):
+    """Test that options registered by a Python file load on warm starts."""
+    script = tmpdir.join("conf.py")
+    script.write(
+        "from confpy.core import config\n"
+        "from confpy.options import numopt\n"
+        "section = config.Configuration().test_cache_set\n"
+        "section.register('extra', numopt.IntegerOption())\n"
+        "section.extra = 4\n"
+    )
+    cache_dir = str(tmpdir.join("cache"))
+
+    _fresh_registry(monkeypatch)
+    parser.parse_options(files=(str(script),), cache_dir=cache_dir)
+
+    cfg = _fresh_registry(monkeypatch)
+    assert cache.SnapshotCache(cache_dir).restore(cfg, (str(script),)) is False
+    assert cfg.test_cache_set.number == 1
+
+    parser.parse_options(files=(str(script),), cache_dir=cache_dir)
+    assert cfg.test_cache_set.extra == 4
@@ -0,0 +1,123 @@
+"""Test suite for differences between loads of raw values."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy import diff
+from confpy import exc
+from confpy import resolver
+from confpy.core import config
+from confpy.core import namespace
+from confpy.options import numopt
+from confpy.options import stropt
+
+
+class DiffConfiguration(config.Configuration):
+
+    """A configuration with a registry separate from other tests."""
+
+    _NAMESPACES = {}
+
+
+@pytest.fixture
+def entries():
+    """Get the resolver entries of a fresh namespace."""
+    DiffConfiguration._NAMESPACES.clear()
+    cfg = DiffConfiguration(
+        section=namespace.Namespace(
+            number=numopt.IntegerOption(default=1),
+            letter=stropt.StringOption(),
+            needed=stropt.StringOption(required=True),
+        )
+    )
+    return resolver.Resolver(cfg).table
+
+
+def test_diff_classifies_changes():
+    """Test that changes are split into added, removed, and modified."""
+    changes = diff.diff(
+        {("a", "x"): "1", ("a", "y"): "2", ("b", "z"): "3"},
+        {("a", "x"): "1", ("a", "y"): "4", ("b", "w"): "5"},
+    )
+
+    assert len(changes) == 3
+    assert changes.keys() == [("a", "y"), ("b", "w"), ("b", "z")]
+    assert changes.added == (diff.Change("b", "w", diff.MISSING, "5"),)
+    assert changes.removed == (diff.Change("b", "z", "3", diff.MISSING),)
+    assert changes.modified == (diff.Change("a", "y", "2", "4"),)
+    assert changes.namespaces() == set(("a", "b"))
+    assert len(changes.for_namespace("b")) == 2
+    assert not diff.diff({("a", "x"): "1"}, {("a", "x"): "1"})
+    assert diff.diff({}, {}) == diff.ChangeSet()
+
+
+def test_apply_sets_and_resets(entries):
+    """Test that only changed options are set and removals are reset."""
+    section = entries[("section", "number")].section
+    section.set("needed", "yes")
+    diff.apply(
+        diff.diff(
+            {}, {("section", "number"): "5", ("section", "letter"): "a"}
+        ),
+        entries,
+    )
+
+    assert section.number == 5
+    assert section.letter == "a"
+
+    diff.apply(
+        diff.diff(
+            {("section", "number"): "5", ("section", "letter"): "a"},
+            {("section", "letter"): "b"},
+        ),
+        entries,
+    )
+
+    assert section.number == 1
+    assert section.letter == "b"
+    assert section.needed == "yes"
+
+
+def test_apply_restores_removed_values(entries):
+    """Test that removals return to a given value instead of the default."""
+    section = entries[("section", "number")].section
+    section.set("needed", "yes")
+    diff.apply(diff.diff({}, {("section", "number"): "5"}), entries)
+    diff.apply(
+        diff.diff({("section", "number"): "5"}, {}),
+        entries,
+        {("section", "number"): 3},
+    )
+
+    assert section.number == 3
+
+    changes = diff.diff({("section", "needed"): "no"}, {})
+    diff.apply(changes, entries, {("section", "needed"): "yes"})
+
+    assert section.needed == "yes"
+
+
+def test_apply_is_atomic(entries):
+    """Test that no option changes if any value fails."""
+    section = entries[("section", "number")].section
+    changes = diff.diff(
+        {}, {("section", "letter"): "c", ("section", "number"): "many"}
+    )
+    with pytest.raises(ValueError):
+
+        diff.apply(changes, entries)
+
+    assert section.letter is None
+
+    changes = diff.diff(
+        {("section", "needed"): "yes"}, {("section", "letter"): "c"}
+    )
+    with pytest.raises(exc.MissingRequiredOption):
+
+        diff.apply(changes, entries)
+
+    assert section.letter is None
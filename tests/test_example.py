@@ -7,13 +7,14 @@ from __future__ import unicode_literals
 
 import pytest
 
+from confpy import example
 from confpy.core import config
 from confpy.core import namespace
 from confpy.options import boolopt
 from confpy.options import numopt
 from confpy.options import stropt
 
-example = pytest.importorskip("confpy.example")
+pytest.importorskip("jinja2")
 
 
 @pytest.fixture(scope="module")
@@ -0,0 +1,209 @@
+"""Tests for incremental loading of configuration fragments."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+
+import pytest
+
+from confpy import diff
+from confpy import exc
+from confpy import incremental
+from confpy.core import config
+from confpy.core import namespace
+from confpy.options import numopt
+from confpy.options import stropt
+
+
+class CountingLoader(incremental.IncrementalLoader):
+
+    """An IncrementalLoader which records the fragments it reads."""
+
+    def __init__(self, *args, **kwargs):
+        super(CountingLoader, self).__init__(*args, **kwargs)
+        self.collected = []
+
+    def _collect(self, path):
+        self.collected.append(os.path.basename(path))
+        return super(CountingLoader, self)._collect(path)
+
+
+@pytest.fixture
+def fragments(request, tmpdir):
+    """Get a conf.d directory of fragments for a namespace unique to a test.
+
+    The namespace is available from the name of the directory.
+    """
+    name = request.node.name
+    config.Configuration(
+        **{
+            name: namespace.Namespace(
+                many=numopt.IntegerOption(default=1),
+                letter=stropt.StringOption(),
+                other=stropt.StringOption(),
+            )
+        }
+    )
+    directory = tmpdir.mkdir(name)
+    directory.join("10-base.ini").write(
+        "[{0}]\nmany = 10\nletter = a\n".format(name)
+    )
+    directory.join("20-local.json").write(
+        '{{"{0}": {{"letter": "b"}}}}'.format(name)
+    )
+    directory.join("30-other.json").write(
+        '{{"{0}": {{"other": "x"}}}}'.format(name)
+    )
+    directory.join("README.txt").write("ignored")
+    directory.join(".99-hidden.json").write("not json")
+    return directory
+
+
+def test_loads_fragments_in_lexical_order(fragments):
+    """Test that directories are expanded and applied in name order."""
+    loader = CountingLoader([str(fragments)], arguments=["--"], env={})
+    section = loader.config.get(fragments.basename)
+    changed = loader.load()
+
+    assert loader.collected == [
+        "10-base.ini",
+        "20-local.json",
+        "30-other.json",
+    ]
+    assert changed.keys() == [
+        (fragments.basename, "letter"),
+        (fragments.basename, "many"),
+        (fragments.basename, "other"),
+    ]
+    assert section.many == 10
+    assert section.letter == "b"
+    assert not loader.load()
+
+
+def test_reloads_only_changed_fragments(fragments):
+    """Test that unchanged fragments are not read again."""
+    loader = CountingLoader([str(fragments)], arguments=["--"], env={})
+    section = loader.config.get(fragments.basename)
+    loader.load()
+    del loader.collected[:]
+
+    fragments.join("20-local.json").write(
+        '{{"{0}": {{"letter": "cc", "many": 20}}}}'.format(fragments.basename)
+    )
+    fragments.join("30-other.json").remove()
+    changed = loader.load()
+
+    assert loader.collected == ["20-local.json"]
+    assert changed.keys() == [
+        (fragments.basename, "letter"),
+        (fragments.basename, "many"),
+        (fragments.basename, "other"),
+    ]
+    assert changed.removed == (
+        diff.Change(fragments.basename, "other", "x", diff.MISSING),
+    )
+    assert section.letter == "cc"
+    assert section.many == 20
+    assert section.other is None
+
+    fragments.join("20-local.json").remove()
+    loader.load()
+    assert section.letter == "a"
+    assert section.many == 10
+
+    fragments.join("10-base.ini").remove()
+    loader.load()
+    assert section.many == 1
+    assert loader.paths == []
+
+
+def test_changed_python_fragments_are_executed_again(fragments):
+    """Test that Python fragments run again when their fingerprint changes."""
+    script = (
+        "from confpy.core import config\n"
+        "config.Configuration().{0}.other = {1!r}\n"
+    )
+    fragments.join("30-other.json").remove()
+    python = fragments.join("40-script.py")
+    python.write(script.format(fragments.basename, "py"))
+    loader = CountingLoader([str(fragments)], arguments=["--"], env={})
+    section = loader.config.get(fragments.basename)
+    loader.load()
+    assert section.other == "py"
+
+    del loader.collected[:]
+    loader.load()
+    assert loader.collected == []
+
+    python.write(script.format(fragments.basename, "changed"))
+    loader.load()
+    assert loader.collected == ["40-script.py"]
+    assert section.other == "changed"
+
+
+def test_removed_values_fall_back_to_python_values(fragments):
+    """Test that removed keys return to the value a Python fragment set."""
+    fragments.join("05-script.py").write(
+        "from confpy.core import config\n"
+        "config.Configuration().{0}.other = 'from-python'\n".format(
+            fragments.basename
+        )
+    )
+    loader = incremental.IncrementalLoader(
+        [str(fragments)], arguments=["--"], env={}
+    )
+    section = loader.config.get(fragments.basename)
+    loader.load()
+    assert section.other == "x"
+
+    fragments.join("30-other.json").remove()
+    fragments.join("10-base.ini").write("[{0}]\n".format(fragments.basename))
+    changes = loader.load()
+
+    assert section.other == "from-python"
+    assert section.many == 1
+    assert section.letter == "b"
+    assert len(changes.removed) == 2
+
+
+def test_failed_loads_leave_values_unchanged(fragments):
+    """Test that invalid values do not partially apply."""
+    loader = incremental.IncrementalLoader(
+        [str(fragments.join("*.json"))], arguments=["--"], env={}
+    )
+    section = loader.config.get(fragments.basename)
+    loader.load()
+    fragments.join("20-local.json").write(
+        '{{"{0}": {{"letter": "z", "many": "x"}}}}'.format(fragments.basename)
+    )
+
+    with pytest.raises(ValueError):
+
+        loader.load()
+
+    assert section.letter == "b"
+
+
+def test_required_options_are_checked(tmpdir):
+    """Test that removing the only value of a required option raises."""
+    config.Configuration(
+        test_incremental_required=namespace.Namespace(
+            letter=stropt.StringOption(required=True)
+        )
+    )
+    path = tmpdir.join("conf.json")
+    path.write('{"test_incremental_required": {"letter": "a"}}')
+    loader = incremental.IncrementalLoader(
+        [str(tmpdir.join("*.json"))], arguments=["--"], env={}
+    )
+    loader.load()
+    path.remove()
+
+    with pytest.raises(exc.MissingRequiredOption):
+
+        loader.load()
+
+    assert loader.config.test_incremental_required.letter == "a"
@@ -0,0 +1,98 @@
+"""Test suite for load instrumentation."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+
+from confpy import instrument
+from confpy import parser
+from confpy.core import config
+from confpy.core import namespace
+from confpy.options import numopt
+from confpy.options import stropt
+
+
+def test_profiler_reports_a_load(tmpdir):
+    """Test that a profiled load records stages, files, and coercions."""
+    config.Configuration(
+        test_instrument=namespace.Namespace(
+            many=numopt.IntegerOption(), letter=stropt.StringOption()
+        )
+    )
+    ini_file = tmpdir.join("conf.ini")
+    ini_file.write("[test_instrument]\nmany = 10\n")
+    json_file = tmpdir.join("conf.json")
+    json_file.write('{"test_instrument": {"letter": "a"}}')
+    py_file = tmpdir.join("conf.py")
+    py_file.write("VALUE = 1\n")
+    files = (str(ini_file), str(json_file), str(py_file))
+
+    with instrument.Profiler() as profiler:
+
+        assert instrument.ACTIVE is profiler
+        parser.parse_options(files=files)
+
+    assert instrument.ACTIVE is None
+    report = profiler.report()
+    for stage in ("parse_options", "files", "read", "parse", "exec", "env"):
+
+        assert report["stages"][stage]["calls"] >= 1
+
+    assert report["files"][str(ini_file)]["loader"] == "IniFile"
+    assert report["files"][str(ini_file)]["size"] == len(ini_file.read())
+    assert report["files"][str(py_file)]["exec"] >= 0
+    assert report["counts"]["options.set"] >= 2
+    assert report["coercions"]["count"] >= 2
+    names = set(item["name"] for item in report["coercions"]["slowest"])
+    assert "test_instrument.many" in names
+    assert json.loads(json.dumps(report)) == report
+
+
+def test_hooks_nest_and_keep_slowest():
+    """Test that profilers restore the previous hook and bound coercions."""
+    outer = instrument.Profiler()
+    inner = instrument.Profiler(slowest=2)
+    with outer:
+
+        with inner:
+
+            option = numopt.IntegerOption()
+            for value in ("1", "2", "3", "4"):
+
+                option.value = value
+
+        assert instrument.ACTIVE is outer
+
+    assert instrument.ACTIVE is None
+    report = inner.report()
+    assert report["coercions"]["count"] == 4
+    assert len(report["coercions"]["slowest"]) == 2
+    assert outer.report()["coercions"]["count"] == 0
+
+
+def test_timed_records_stages():
+    """Test that decorated functions only record while a hook is active."""
+    recorded = []
+
+    class Recorder(instrument.Hook):
+        def stage(self, name, seconds):
+            recorded.append(name)
+
+    @instrument.timed("work")
+    def work(value):
+        return value + 1
+
+    assert work(1) == 2
+    previous = instrument.install(Recorder())
+    try:
+
+        assert work(2) == 3
+
+    finally:
+
+        instrument.install(previous)
+
+    assert recorded == ["work"]
@@ -9,9 +9,11 @@ import os
 
 import pytest
 
+from confpy import exc
 from confpy import parser
 from confpy.core import config
 from confpy.core import namespace
+from confpy.loaders import json
 from confpy.options import boolopt
 
 
@@ -80,3 +82,148 @@ def test_parse_cli():
     cfg = parser.set_cli_options(cfg, arguments=arguments)
 
     assert cfg.test_cli_parse.cli_loaded is True
+
+
+def test_parse_files_with_an_executor(tmpdir):
+    """Test that files parsed concurrently are applied in order."""
+    futures = pytest.importorskip("concurrent.futures")
+    config.Configuration(
+        test_executor_parse=namespace.Namespace(
+            ini_loaded=boolopt.BoolOption(),
+            json_loaded=boolopt.BoolOption(),
+        )
+    )
+    ini_file = tmpdir.join("conf.ini")
+    ini_file.write("[test_executor_parse]\nini_loaded = yes\n")
+    json_file = tmpdir.join("conf.json")
+    json_file.write('{"test_executor_parse": {"json_loaded": true}}')
+    override = tmpdir.join("override.json")
+    override.write('{"test_executor_parse": {"json_loaded": false}}')
+    files = (str(ini_file), str(json_file), str(override))
+
+    with futures.ThreadPoolExecutor(max_workers=4) as executor:
+
+        cfg = parser.parse_options(files=files, executor=executor)
+        assert cfg.test_executor_parse.ini_loaded is True
+        assert cfg.test_executor_parse.json_loaded is False
+
+        cfg = parser.configuration_from_paths(
+            (str(override), str(json_file)), executor=executor
+        )
+        assert cfg.test_executor_parse.json_loaded is True
+
+
+def test_parse_options_lazy(tmpdir):
+    """Test that lazily loaded values are only coerced when read."""
+    config.Configuration(
+        test_lazy_parse=namespace.Namespace(
+            good=boolopt.BoolOption(),
+            bad=boolopt.BoolOption(required=True),
+        )
+    )
+    path = tmpdir.join("conf.json")
+    path.write('{"test_lazy_parse": {"good": "yes", "bad": "maybe"}}')
+
+    cfg = parser.parse_options(files=(str(path),), lazy=True)
+    section = cfg.test_lazy_parse
+    options = dict(section.options())
+    parser.check_for_missing_options(cfg)
+
+    assert options["bad"].pending
+    assert section.good is True
+    with pytest.raises(ValueError):
+
+        section.bad  # pylint: disable=pointless-statement
+
+    with pytest.raises(ValueError):
+
+        cfg.validate_all()
+
+    # The registry is shared with other tests which read every option.
+    section.bad = "no"
+
+
+def test_parse_options_lazy_before_python_file(tmpdir):
+    """Test that values applied before a Python file are deferred too."""
+    config.Configuration(
+        test_lazy_python=namespace.Namespace(
+            bad=boolopt.BoolOption(required=True),
+            read=boolopt.BoolOption(),
+            copy=boolopt.BoolOption(),
+        )
+    )
+    values = tmpdir.join("values.json")
+    values.write('{"test_lazy_python": {"bad": "maybe", "read": "yes"}}')
+    script = tmpdir.join("script.py")
+    script.write(
+        "from confpy.core import config\n"
+        "section = config.Configuration().test_lazy_python\n"
+        "section.copy = section.read\n"
+    )
+
+    cfg = parser.parse_options(files=(str(values), str(script)), lazy=True)
+    section = cfg.test_lazy_python
+
+    assert dict(section.options())["bad"].pending
+    assert section.copy is True
+    with pytest.raises(ValueError):
+
+        section.bad  # pylint: disable=pointless-statement
+
+    # The registry is shared with other tests which read every option.
+    section.bad = "no"
+
+
+def test_configuration_from_paths_lazy(tmpdir):
+    """Test that lazy loaders defer values without reading earlier ones."""
+    config.Configuration(
+        test_lazy_paths=namespace.Namespace(value=boolopt.BoolOption())
+    )
+    first = tmpdir.join("first.json")
+    first.write('{"test_lazy_paths": {"value": "maybe"}}')
+    second = tmpdir.join("second.json")
+    second.write('{"test_lazy_paths": {"value": "yes", "missing": "yes"}}')
+
+    cfg = parser.configuration_from_paths(
+        (str(first), str(second)), strict=False, lazy=True
+    )
+
+    assert cfg.test_lazy_paths.value is True
+    with pytest.raises(exc.OptionNotRegistered):
+
+        parser.configuration_from_paths((str(second),), lazy=True)
+
+
+def test_expand_paths(tmpdir):
+    """Test that directories and globs expand to ordered file paths."""
+    for name in ("b.json", "a.ini", "c.txt", ".d.json"):
+
+        tmpdir.join(name).write("")
+
+    tmpdir.mkdir("e.json")
+
+    assert parser.expand_paths([str(tmpdir), "other.py"]) == [
+        str(tmpdir.join("a.ini")),
+        str(tmpdir.join("b.json")),
+        "other.py",
+    ]
+    assert parser.expand_paths([str(tmpdir.join("*.json"))]) == [
+        str(tmpdir.join("b.json")),
+        str(tmpdir.join("e.json")),
+    ]
+    assert parser.expand_paths([str(tmpdir.join("[ab].???"))]) == [
+        str(tmpdir.join("a.ini")),
+    ]
+    literal = tmpdir.mkdir("literal").join("conf[prod].json")
+    literal.write("")
+    assert parser.expand_paths([str(literal)]) == [str(literal)]
+
+
+def test_configfile_from_path_uses_the_last_extension():
+    """Test that dotted directory names do not affect the loader."""
+    loader = parser.configfile_from_path(os.path.join("conf.d", "file.json"))
+    assert isinstance(loader, json.JsonFile)
+
+    with pytest.raises(exc.UnrecognizedFileExtension):
+
+        parser.configfile_from_path(os.path.join("conf.json", "file"))
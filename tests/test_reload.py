@@ -0,0 +1,260 @@
+"""Test suite for live reloading of configuration files."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy import exc
+from confpy import reload
+from confpy.core import config
+from confpy.core import namespace
+from confpy.options import numopt
+
+
+@pytest.fixture
+def cfg():
+    """Get a configuration with options used by the reload tests."""
+    cfg = config.Configuration()
+    if cfg.get("test_reload") is None:
+
+        cfg.register(
+            "test_reload",
+            namespace.Namespace(
+                first=numopt.IntegerOption(default=0),
+                second=numopt.IntegerOption(default=0),
+            ),
+        )
+
+    return cfg
+
+
+@pytest.fixture
+def files(tmpdir):
+    """Get two layered JSON files."""
+    first = tmpdir.join("first.json")
+    first.write('{"test_reload": {"first": 1, "second": 1}}')
+    second = tmpdir.join("second.json")
+    second.write('{"test_reload": {"second": 2}}')
+    return first, second
+
+
+def _reloader(files):
+    """Get a Reloader which polls the given files."""
+    paths = tuple(str(path) for path in files)
+    return reload.Reloader(
+        paths,
+        env={},
+        arguments=["--"],
+        watcher=reload.PollingWatcher(paths),
+    )
+
+
+def test_reloader_snapshot(cfg, files):
+    """Test that files are loaded into a frozen snapshot."""
+    reloader = _reloader(files)
+
+    assert reloader.current.test_reload.first == 1
+    assert reloader.current.test_reload.second == 2
+    assert cfg.test_reload.first == 0
+    assert reloader.check() is False
+
+
+def test_reloader_swaps_changed_files(cfg, files):
+    """Test that changed files publish a new snapshot and notify."""
+    reloader = _reloader(files)
+    original = reloader.current
+    changes = []
+    reloader.subscribe(
+        lambda *args: changes.append(args), "test_reload", "first"
+    )
+    reloader.subscribe(lambda *args: changes.append(args), "other_namespace")
+
+    files[0].write('{"test_reload": {"first": 10, "second": 10}}')
+    assert reloader.check() is True
+
+    assert reloader.current is not original
+    assert reloader.current.test_reload.first == 10
+    assert reloader.current.test_reload.second == 2
+    assert original.test_reload.first == 1
+    assert changes == [("test_reload", "first", 1, 10)]
+
+
+def test_reloader_keeps_snapshot_on_error(cfg, files):
+    """Test that a failed reload does not replace the snapshot."""
+    reloader = _reloader(files)
+    original = reloader.current
+
+    files[1].write('{"test_reload": {"second": "not a number"}}')
+    with pytest.raises(ValueError):
+
+        reloader.check()
+
+    assert reloader.current is original
+
+    files[1].write('{"test_reload_missing": {}}')
+    with pytest.raises(exc.NamespaceNotRegistered):
+
+        reloader.reload()
+
+    assert reloader.current is original
+
+
+def test_reloader_removed_keys_use_python_values(tmpdir):
+    """Test that removed keys return to the values set by Python files."""
+    cfg = config.Configuration()
+    if cfg.get("test_reload_python") is None:
+
+        cfg.register(
+            "test_reload_python",
+            namespace.Namespace(number=numopt.IntegerOption(default=0)),
+        )
+
+    script = tmpdir.join("startup.py")
+    script.write(
+        "from confpy.core import config\n"
+        "config.Configuration().test_reload_python.number = 5\n"
+    )
+    values = tmpdir.join("values.json")
+    values.write('{"test_reload_python": {"number": 7}}')
+    reloader = _reloader((script, values))
+    assert reloader.current.test_reload_python.number == 7
+
+    cfg.test_reload_python.number = 9
+    values.write('{"test_reload_python": {}}')
+    reloader.reload()
+    assert reloader.current.test_reload_python.number == 5
+
+
+def test_reloader_background_thread(cfg, files):
+    """Test that the background thread reloads changed files."""
+    paths = tuple(str(path) for path in files)
+    reloader = reload.Reloader(
+        paths,
+        env={},
+        arguments=["--"],
+        watcher=reload.PollingWatcher(paths, interval=0.01),
+        interval=0.01,
+    )
+    seen = []
+    reloader.subscribe(lambda *args: seen.append(args), "test_reload")
+    reloader.start()
+    try:
+
+        files[1].write('{"test_reload": {"second": 20}}')
+        for _ in range(500):
+
+            if seen:
+
+                break
+
+            reload.time.sleep(0.01)
+
+    finally:
+
+        reloader.stop()
+
+    assert reloader.current.test_reload.second == 20
+
+
+def test_reloader_restarts_with_a_new_watcher(cfg, files):
+    """Test that start after stop watches the files again."""
+    paths = tuple(str(path) for path in files)
+    reloader = reload.Reloader(
+        paths, env={}, arguments=["--"], interval=0.01
+    )
+    reloader.start()
+    reloader.stop()
+    reloader.start()
+    try:
+
+        files[1].write('{"test_reload": {"second": 30}}')
+        for _ in range(500):
+
+            if reloader.current.test_reload.second == 30:
+
+                break
+
+            reload.time.sleep(0.01)
+
+    finally:
+
+        reloader.stop()
+
+    assert reloader.current.test_reload.second == 30
+    assert reloader.error is None
+
+
+def test_reloader_keeps_given_watchers_open(cfg, files):
+    """Test that stop leaves a given watcher open and errors are recorded."""
+
+    class Watcher(object):
+        closed = False
+
+        def changes(self, timeout=None):
+            if self.closed:
+
+                raise OSError("closed")
+
+            reload.time.sleep(timeout or 0)
+            raise OSError("failed")
+
+        def close(self):
+            self.closed = True
+
+    watcher = Watcher()
+    reloader = reload.Reloader(
+        tuple(str(path) for path in files),
+        env={},
+        arguments=["--"],
+        watcher=watcher,
+        interval=0.01,
+    )
+    reloader.start()
+    reloader.stop()
+
+    assert not watcher.closed
+
+    reloader.start()
+    try:
+
+        for _ in range(500):
+
+            if reloader.error is not None:
+
+                break
+
+            reload.time.sleep(0.01)
+
+    finally:
+
+        reloader.stop()
+
+    assert str(reloader.error) == "failed"
+    assert not watcher.closed
+
+
+def test_inotify_watcher(tmpdir):
+    """Test that inotify reports changes to watched files."""
+    path = tmpdir.join("conf.json")
+    path.write("{}")
+    try:
+
+        watcher = reload.InotifyWatcher((str(path),))
+
+    except OSError:
+
+        pytest.skip("inotify is not available.")
+
+    try:
+
+        assert watcher.changes(timeout=0) == set()
+        tmpdir.join("other.json").write("{}")
+        path.write('{"a": {}}')
+        assert watcher.changes(timeout=5) == set((str(path),))
+
+    finally:
+
+        watcher.close()
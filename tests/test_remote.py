@@ -0,0 +1,200 @@
+"""Tests for remote key-value configuration sources."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import threading
+
+import pytest
+
+from confpy import exc
+from confpy import parser
+from confpy import remote
+from confpy import resolver
+from confpy.core import config
+from confpy.core import namespace
+from confpy.options import numopt
+from confpy.options import stropt
+
+try:
+
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from BaseHTTPServer import HTTPServer
+    from SocketServer import ThreadingMixIn
+
+except ImportError:
+
+    from http.server import BaseHTTPRequestHandler
+    from http.server import HTTPServer
+    from socketserver import ThreadingMixIn
+
+
+class KeyValueServer(ThreadingMixIn, HTTPServer):
+
+    """An in-process stand-in for a batch key-value HTTP API."""
+
+    daemon_threads = True
+
+    def __init__(self, values):
+        HTTPServer.__init__(self, ("127.0.0.1", 0), KeyValueHandler)
+        self.values = values
+        self.requests = []
+        self.status = 200
+
+    @property
+    def url(self):
+        """Get the URL of the batch endpoint."""
+        return "http://127.0.0.1:{0}/v1/batch".format(self.server_address[1])
+
+
+class KeyValueHandler(BaseHTTPRequestHandler):
+
+    """Answer batch requests from the server values."""
+
+    protocol_version = str("HTTP/1.1")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        length = int(self.headers.get("Content-Length"))
+        keys = json.loads(self.rfile.read(length).decode("utf8"))["keys"]
+        self.server.requests.append((self.client_address[1], sorted(keys)))
+        body = json.dumps(
+            {
+                "values": dict(
+                    (key, self.server.values[key])
+                    for key in keys
+                    if key in self.server.values
+                )
+            }
+        ).encode("utf8")
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Silence request logging."""
+
+
+@pytest.fixture
+def server():
+    """Get a running key-value server."""
+    kv_server = KeyValueServer(
+        {
+            "app/test_remote/many": "10",
+            "app/test_remote/letter": "a",
+            "app/unregistered/option": "x",
+        }
+    )
+    thread = threading.Thread(target=kv_server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield kv_server
+    kv_server.shutdown()
+    kv_server.server_close()
+
+
+@pytest.fixture(scope="module")
+def schema():
+    """Register the namespace stored remotely."""
+    return config.Configuration(
+        test_remote=namespace.Namespace(
+            many=numopt.IntegerOption(),
+            letter=stropt.StringOption(),
+            other=stropt.StringOption(default="z"),
+        )
+    )
+
+
+class FakeClock(object):
+
+    """A clock which only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_remote_source_batches_and_caches(server, schema):
+    """Test that keys are fetched in one request and cached."""
+    clock = FakeClock()
+    backend = remote.HttpBackend(server.url)
+    source = remote.RemoteSource(
+        backend, prefix="app/", cache=remote.TTLCache(10, clock=clock)
+    )
+
+    cfg = source.config
+    assert cfg.test_remote.many == 10
+    assert cfg.test_remote.letter == "a"
+    assert cfg.test_remote.other == "z"
+    assert len(server.requests) == 1
+    assert "app/test_remote/many" in server.requests[0][1]
+    assert "app/unregistered/option" not in server.requests[0][1]
+
+    assert source.values()["test_remote"] == {"many": "10", "letter": "a"}
+    assert len(server.requests) == 1
+
+    server.values["app/test_remote/other"] = "y"
+    clock.now = 11
+    assert source.values()["test_remote"]["other"] == "y"
+    assert len(server.requests) == 2
+    assert server.requests[0][0] == server.requests[1][0]
+    assert backend.pool.created == 1
+    backend.close()
+
+
+def test_remote_source_with_parse_options(tmpdir, server, schema):
+    """Test that remote sources are applied in order with files."""
+    path = tmpdir.join("conf.json")
+    path.write('{"test_remote": {"letter": "b", "other": "w"}}')
+    backend = remote.HttpBackend(server.url)
+
+    cfg = parser.parse_options(
+        [str(path), remote.RemoteSource(backend, prefix="app/")],
+        cache_dir=str(tmpdir.join("cache")),
+    )
+
+    assert cfg.test_remote.letter == "a"
+    assert cfg.test_remote.other == "w"
+    assert not tmpdir.join("cache").check()
+    backend.close()
+
+
+def test_remote_source_with_a_private_configuration(server, schema):
+    """Test that only the options of the resolved configuration are used."""
+
+    class RemoteConfiguration(config.Configuration):
+        _NAMESPACES = {}
+
+    cfg = RemoteConfiguration(
+        test_remote=namespace.Namespace(letter=stropt.StringOption())
+    )
+    backend = remote.HttpBackend(server.url)
+
+    resolver.Resolver(cfg).resolve(
+        (remote.RemoteSource(backend, prefix="app/"),),
+        env={},
+        arguments=["--"],
+    )
+
+    assert cfg.test_remote.letter == "a"
+    assert "app/test_remote/many" not in server.requests[0][1]
+    backend.close()
+
+
+def test_remote_errors(server, schema):
+    """Test that failed requests raise RemoteSourceError."""
+    server.status = 500
+    backend = remote.HttpBackend(server.url)
+    source = remote.RemoteSource(backend)
+
+    with pytest.raises(exc.RemoteSourceError):
+
+        source.values()
+
+    backend.close()
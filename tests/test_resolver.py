@@ -0,0 +1,313 @@
+"""Test suite for the compiled option resolver."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy import exc
+from confpy import resolver
+from confpy.core import config
+from confpy.core import namespace
+from confpy.loaders import json
+from confpy.loaders import pyfile
+from confpy.options import boolopt
+from confpy.options import numopt
+
+
+def _source(cls, body, strict=True):
+    """Get a loader instance which returns a static body."""
+
+    class StaticSource(cls):
+        @property
+        def content(self):
+            return body
+
+    return StaticSource(path="test", strict=strict)
+
+
+def test_resolver_compiles_names():
+    """Test that env and CLI names are compiled for every option."""
+    cfg = config.Configuration(
+        test_resolver_names=namespace.Namespace(value=boolopt.BoolOption())
+    )
+    entries = dict(
+        ((entry.section_name, entry.option_name), entry)
+        for entry in resolver.Resolver(cfg, "prefix").entries
+    )
+    entry = entries[("test_resolver_names", "value")]
+
+    assert entry.env_name == "PREFIX_TEST_RESOLVER_NAMES_VALUE"
+    assert entry.cli_name == "test_resolver_names_value"
+
+
+def test_resolver_precedence():
+    """Test that CLI values beat env values which beat file values."""
+    cfg = config.Configuration(
+        test_resolver_order=namespace.Namespace(
+            file=numopt.IntegerOption(),
+            env=numopt.IntegerOption(),
+            cli=numopt.IntegerOption(),
+        )
+    )
+    source = _source(
+        json.JsonFile,
+        '{"test_resolver_order": {"file": 1, "env": 1, "cli": 1}}',
+    )
+    env = {
+        "CONFPY_TEST_RESOLVER_ORDER_ENV": "2",
+        "CONFPY_TEST_RESOLVER_ORDER_CLI": "2",
+    }
+    arguments = ["--test_resolver_order_cli", "3"]
+    resolver.Resolver(cfg).resolve((source,), env=env, arguments=arguments)
+
+    assert cfg.test_resolver_order.file == 1
+    assert cfg.test_resolver_order.env == 2
+    assert cfg.test_resolver_order.cli == 3
+
+
+def test_resolver_python_files_apply_in_order():
+    """Test that Python files overwrite values from earlier files."""
+    cfg = config.Configuration(
+        test_resolver_python=namespace.Namespace(
+            value=numopt.IntegerOption()
+        )
+    )
+    sources = (
+        _source(json.JsonFile, '{"test_resolver_python": {"value": 1}}'),
+        _source(
+            pyfile.PythonFile,
+            "from confpy.core import config\n"
+            "config.Configuration().test_resolver_python.value = 2\n",
+        ),
+    )
+    resolver.Resolver(cfg).resolve(sources, env={}, arguments=["--"])
+
+    assert cfg.test_resolver_python.value == 2
+
+
+def test_resolver_overridden_values_are_coerced():
+    """Test that invalid file values raise even when they are overridden."""
+    cfg = config.Configuration(
+        test_resolver_invalid=namespace.Namespace(
+            value=numopt.IntegerOption()
+        )
+    )
+    invalid = _source(
+        json.JsonFile, '{"test_resolver_invalid": {"value": "many"}}'
+    )
+    valid = _source(json.JsonFile, '{"test_resolver_invalid": {"value": 1}}')
+    table = resolver.Resolver(cfg)
+    with pytest.raises(ValueError):
+
+        table.resolve((invalid, valid), env={}, arguments=["--"])
+
+    with pytest.raises(ValueError):
+
+        table.resolve(
+            (invalid,),
+            env={"CONFPY_TEST_RESOLVER_INVALID_VALUE": "2"},
+            arguments=["--"],
+        )
+
+    table.resolve((invalid, valid), env={}, arguments=["--"], lazy=True)
+
+    assert cfg.test_resolver_invalid.value == 1
+
+
+def test_resolver_auto_namespace_options():
+    """Test that file values generate options in an AutoNamespace."""
+    cfg = config.Configuration(
+        test_resolver_auto=namespace.AutoNamespace(type=numopt.IntegerOption)
+    )
+    source = _source(json.JsonFile, '{"test_resolver_auto": {"dynamic": 1}}')
+    env = {"CONFPY_TEST_RESOLVER_AUTO_DYNAMIC": "5"}
+    resolver.Resolver(cfg).resolve((source,), env=env, arguments=["--"])
+
+    assert cfg.test_resolver_auto.dynamic == 5
+
+
+def test_resolver_auto_namespace_attribute_names():
+    """Test that file keys named like namespace attributes are options."""
+    cfg = config.Configuration(
+        test_resolver_names_auto=namespace.AutoNamespace(
+            type=numopt.IntegerOption
+        ),
+        test_resolver_names_plain=namespace.Namespace(
+            value=numopt.IntegerOption()
+        ),
+    )
+    source = _source(
+        json.JsonFile, '{"test_resolver_names_auto": {"options": 1, "get": 2}}'
+    )
+    resolver.Resolver(cfg).resolve((source,), env={}, arguments=["--"])
+    options = dict(cfg.test_resolver_names_auto.options())
+
+    assert options["options"].value == 1
+    assert options["get"].value == 2
+
+    plain = '{"test_resolver_names_plain": {"register": 1}}'
+    with pytest.raises(exc.OptionNotRegistered):
+
+        resolver.Resolver(cfg).resolve(
+            (_source(json.JsonFile, plain),), env={}, arguments=["--"]
+        )
+
+    resolver.Resolver(cfg).resolve(
+        (_source(json.JsonFile, plain, strict=False),),
+        env={},
+        arguments=["--"],
+    )
+
+
+def test_resolver_strict_namespace():
+    """Test that unregistered namespaces raise in strict mode."""
+    source = _source(json.JsonFile, '{"test_resolver_missing": {"a": 1}}')
+    with pytest.raises(exc.NamespaceNotRegistered):
+
+        resolver.Resolver(config.Configuration()).resolve(
+            (source,), env={}, arguments=["--"]
+        )
+
+
+def test_resolver_missing_required():
+    """Test that unset required options raise after resolution."""
+    cfg = config.Configuration(
+        test_resolver_required=namespace.Namespace(
+            value=boolopt.BoolOption(required=True)
+        )
+    )
+    with pytest.raises(exc.MissingRequiredOption):
+
+        resolver.Resolver(cfg).resolve(env={}, arguments=["--"])
+
+    resolver.Resolver(cfg).resolve(
+        env={"CONFPY_TEST_RESOLVER_REQUIRED_VALUE": "yes"}, arguments=["--"]
+    )
+    assert cfg.test_resolver_required.value is True
+
+
+def test_resolver_env_values():
+    """Test that the environment is matched through the name index."""
+    cfg = config.Configuration(
+        test_resolver_env=namespace.Namespace(value=numopt.IntegerOption()),
+        test_resolver_env_auto=namespace.AutoNamespace(
+            type=numopt.IntegerOption
+        ),
+    )
+    env = {
+        "PREFIX_TEST_RESOLVER_ENV_VALUE": "1",
+        "PREFIX_TEST_RESOLVER_ENV_AUTO_NEW_OPTION": "2",
+        "PREFIX_TEST_RESOLVER_ENV_VALEU": "3",
+        "PREFIX_TEST_RESOLVER_ENV_AUTO_EMPTY": "",
+        "OTHER_TEST_RESOLVER_ENV_VALUE": "4",
+    }
+    table = resolver.Resolver(cfg, "prefix")
+    values, unknown = table.env_values(env)
+
+    assert values == {
+        ("test_resolver_env", "value"): "1",
+        ("test_resolver_env_auto", "new_option"): "2",
+    }
+    assert unknown == ["PREFIX_TEST_RESOLVER_ENV_VALEU"]
+    assert "new_option" in dict(cfg.test_resolver_env_auto.options())
+
+    with pytest.raises(exc.OptionNotRegistered):
+
+        table.resolve(env=env, arguments=["--"], strict_env=True)
+
+    del env["PREFIX_TEST_RESOLVER_ENV_VALEU"]
+    table.resolve(env=env, arguments=["--"], strict_env=True)
+    assert cfg.test_resolver_env.value == 1
+    assert cfg.test_resolver_env_auto.new_option == 2
+
+
+def test_resolver_env_values_edge_names():
+    """Test ambiguous variables and AutoNamespace attribute names."""
+    cfg = config.Configuration(
+        test_resolver_amb_a=namespace.Namespace(b_c=numopt.IntegerOption()),
+        test_resolver_amb_a_b=namespace.Namespace(c=numopt.IntegerOption()),
+        test_resolver_amb_auto=namespace.AutoNamespace(
+            type=numopt.IntegerOption
+        ),
+    )
+    env = {
+        "CONFPY_TEST_RESOLVER_AMB_A_B_C": "1",
+        "CONFPY_TEST_RESOLVER_AMB_AUTO_DESCRIPTION": "2",
+    }
+    resolver.Resolver(cfg).resolve(env=env, arguments=["--"])
+    options = dict(cfg.test_resolver_amb_auto.options())
+
+    assert cfg.test_resolver_amb_a.b_c == 1
+    assert cfg.test_resolver_amb_a_b.c == 1
+    assert options["description"].value == 2
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    (
+        ["--alpha_one", "1", "--beta_two=2", "pos", "--gamma", "x"],
+        ["--alpha_one", "1", "--alpha_one", "3"],
+        ["--alpha_one=", "--beta_two", "2"],
+        ["--alpha_o", "1", "--beta=2"],
+        ["--alpha_one", "-1"],
+        ["pos", "--", "--alpha_one", "1"],
+        ["-x", "--beta_two", "2"],
+        [],
+    ),
+)
+def test_cli_parser_matches_argparse(arguments):
+    """Test that the fast scan agrees with argparse."""
+    names = ("alpha_one", "beta_two", "alpha_three")
+    cli = resolver.CliParser(names)
+    expected = vars(cli.parser.parse_known_args(arguments)[0])
+    actual = cli.parse(arguments)
+
+    assert dict(
+        (name, value) for name, value in actual.items() if value is not None
+    ) == dict(
+        (name, value) for name, value in expected.items() if value is not None
+    )
+
+
+def test_cli_parser_falls_back_to_argparse():
+    """Test that arguments the scan cannot read exactly use argparse."""
+    cli = resolver.CliParser(("alpha_one", "beta_two"))
+
+    assert cli.scan(["--alpha_one", "1", "--beta_two=2"]) == {
+        "alpha_one": "1",
+        "beta_two": "2",
+    }
+    assert cli.scan(["--alph", "1"]) is None
+    assert cli.scan(["--alpha_one", "-1"]) is None
+    assert cli.scan(["--alpha_one"]) is None
+    assert cli.scan(["-h"]) is None
+    assert cli.scan(["--", "--alph"]) == {}
+    assert resolver.cli_parser(1, ("a",)) is resolver.cli_parser(1, ("b",))
+    assert resolver.cli_parser(1, ("a",)) is not resolver.cli_parser(2, ("a",))
+
+
+def test_resolver_tables_are_reused():
+    """Test that tables compiled at the same schema version are copied."""
+
+    class TestConfiguration(config.Configuration):
+        _NAMESPACES = {}
+
+    cfg = TestConfiguration(
+        test_resolver_reuse=namespace.Namespace(value=boolopt.BoolOption())
+    )
+    first = resolver.Resolver(cfg)
+    second = resolver.Resolver(cfg)
+    assert [e.cli_name for e in second.entries] == [
+        "test_resolver_reuse_value"
+    ]
+    assert list(first.entries)[0] is list(second.entries)[0]
+
+    cfg.test_resolver_reuse.register("other", boolopt.BoolOption())
+    third = resolver.Resolver(cfg)
+    assert len(third.entries) == 2
+    assert len(first.entries) == 1
+    second.resolve(env={}, arguments=["--test_resolver_reuse_other", "yes"])
+    assert cfg.test_resolver_reuse.other is True
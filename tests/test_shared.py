@@ -0,0 +1,147 @@
+"""Test suite for configuration snapshots shared through mmap."""
+
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from confpy import exc
+from confpy import shared
+from confpy.core import config
+from confpy.core import namespace
+from confpy.options import listopt
+from confpy.options import numopt
+
+
+class SharedConfiguration(config.Configuration):
+    _NAMESPACES = {}
+
+
+@pytest.fixture
+def cfg():
+    """Get a private configuration for shared snapshot tests."""
+    SharedConfiguration._NAMESPACES = {}
+    return SharedConfiguration(
+        first=namespace.Namespace(
+            description="first",
+            number=numopt.IntegerOption(default=1),
+            numbers=listopt.ListOption(
+                option=numopt.IntegerOption(), default="1,2"
+            ),
+        ),
+        second=namespace.Namespace(number=numopt.IntegerOption(default=2)),
+    )
+
+
+def test_shared_snapshot_publish(tmpdir, cfg):
+    """Test that published snapshots are visible to attached readers."""
+    path = str(tmpdir.join("segment"))
+    writer = shared.SharedSnapshot.create(path, size=4096)
+    reader = shared.SharedSnapshot.attach(path)
+
+    assert reader.generation == 0
+    assert reader.current is None
+    assert writer.publish(cfg) == 1
+    assert reader.generation == 1
+
+    current = reader.current
+    assert current == cfg.freeze()
+    assert current.first.description == "first"
+    assert current.first.numbers == (1, 2)
+    assert reader.current is current
+    assert reader.namespace("second").number == 2
+    assert reader.namespace("missing") is None
+
+    writer.publish(cfg.freeze().evolve({"second": {"number": 3}}))
+    assert reader.generation == 2
+    assert reader.current is not current
+    assert reader.current.second.number == 3
+
+    reader.close()
+    writer.close()
+
+
+def test_shared_snapshot_size_limit(tmpdir, cfg):
+    """Test that snapshots larger than the segment are rejected."""
+    writer = shared.SharedSnapshot.create(str(tmpdir.join("segment")), 32)
+
+    with pytest.raises(ValueError):
+
+        writer.publish(cfg)
+
+    assert writer.generation == 0
+    writer.close()
+
+
+def test_shared_snapshot_create_replaces_file(tmpdir, cfg):
+    """Test that creating a segment again leaves mapped readers intact."""
+    path = str(tmpdir.join("segment"))
+    writer = shared.SharedSnapshot.create(path, size=4096)
+    writer.publish(cfg)
+    reader = shared.SharedSnapshot.attach(path)
+
+    replacement = shared.SharedSnapshot.create(path, size=64)
+    assert reader.current == cfg.freeze()
+    attached = shared.SharedSnapshot.attach(path)
+    assert attached.current is None
+    assert len(tmpdir.listdir()) == 1
+
+    attached.close()
+    replacement.close()
+    reader.close()
+    writer.close()
+
+
+def test_shared_snapshot_stalled_publish(tmpdir, cfg):
+    """Test that readers give up on a publish which never completes."""
+    path = str(tmpdir.join("segment"))
+    writer = shared.SharedSnapshot.create(path, size=4096)
+    writer.publish(cfg)
+    reader = shared.SharedSnapshot.attach(path, timeout=0.05)
+
+    # A writer which died during a publish leaves an odd sequence behind.
+    with open(path, "r+b") as segment:
+
+        segment.write(shared.COUNTER.pack(3))
+
+    with pytest.raises(exc.PublishStalled):
+
+        reader.current  # pylint: disable=pointless-statement
+
+    with pytest.raises(exc.PublishStalled):
+
+        reader.namespace("first")
+
+    reader.close()
+    writer.close()
+
+
+def test_shared_snapshot_namespace_reads_in_place(tmpdir, cfg, monkeypatch):
+    """Test that a namespace is read without copying the whole payload."""
+    path = str(tmpdir.join("segment"))
+    writer = shared.SharedSnapshot.create(path, size=4096)
+    writer.publish(cfg)
+    reader = shared.SharedSnapshot.attach(path)
+    monkeypatch.setattr(reader, "_payload", None)
+    table = shared.packed.PackedNamespaces
+    calls = []
+
+    def overlapped(buffer, offset=0):
+        calls.append(offset)
+        if len(calls) == 1:
+
+            # A publish which completes during the read tears the table.
+            writer.publish(cfg)
+            raise ValueError("torn")
+
+        return table(buffer, offset)
+
+    monkeypatch.setattr(shared.packed, "PackedNamespaces", overlapped)
+
+    assert reader.namespace("first").numbers == (1, 2)
+    assert len(calls) == 2
+
+    reader.close()
+    writer.close()